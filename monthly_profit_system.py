@@ -5,13 +5,11 @@ Professional swing trading system with enhanced profit targeting
 """
 
 import pandas as pd
-import yfinance as yf
 import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import warnings
-warnings.filterwarnings('ignore')
 
 @dataclass
 class MonthlyProfitConfig:
@@ -35,6 +33,7 @@ class MonthlyProfitConfig:
     
     # Enhanced Signal Quality
     volume_threshold: float = 2.5        # 2.5x volume requirement
+    volume_prefilter: float = 0.0        # Opt-in: skip symbols below this fraction of the volume requirement (changes results)
     rsi_oversold: int = 15               # Extreme oversold (15)
     rsi_overbought: int = 85             # Extreme overbought (85)
     momentum_threshold: float = 0.05     # 5% minimum momentum required
@@ -55,6 +54,36 @@ class MonthlyProfitConfig:
 class MonthlyProfitAnalyzer:
     """Advanced analyzer for monthly profit optimization"""
     
+    # Profit categories, ordered so that a later (stronger) category wins
+    CATEGORY_STANDARD, CATEGORY_MOMENTUM, CATEGORY_BREAKOUT = 0, 1, 2
+    CATEGORY_NAMES = ('STANDARD', 'MOMENTUM', 'BREAKOUT')
+    
+    # Signal labels, one bit per signal in the uint32 scoring bitmask (in display order)
+    SIGNAL_TEMPLATES = (
+        "EXTREME OVERSOLD",
+        "EXTREME OVERBOUGHT",
+        "STRONG BULLISH ZONE",
+        "STRONG BEARISH ZONE",
+        "MACD POWER BULL CROSS",
+        "MACD BULL CROSS",
+        "MACD MOMENTUM+",
+        "PERFECT TREND STACK",
+        "STRONG UPTREND",
+        "PERFECT DOWNTREND",
+        "VOLUME EXPLOSION ({volume_ratio:.1f}x)",
+        "HIGH VOLUME SURGE ({volume_ratio:.1f}x)",
+        "VOLUME INCREASE ({volume_ratio:.1f}x)",
+        "LOW VOLUME",
+        "BREAKOUT MOMENTUM ({momentum_5:.1f}%)",
+        "STRONG MOMENTUM ({momentum_5:.1f}%)",
+        "ACCELERATING MOMENTUM",
+        "BB EXTREME OVERSOLD",
+        "BB EXTREME OVERBOUGHT",
+        "BB SQUEEZE BREAKOUT",
+        "RESISTANCE BREAKOUT",
+        "SUPPORT BOUNCE SETUP",
+    )
+    
     def __init__(self, config: MonthlyProfitConfig = None):
         self.config = config or MonthlyProfitConfig()
         self.liquid_stocks = self._get_premium_stocks()
@@ -102,6 +131,14 @@ class MonthlyProfitAnalyzer:
         
         return list(set(premium_stocks))
     
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """Trailing rolling mean over a 1-D array, NaN-padded like pandas rolling()"""
+        result = np.full(len(values), np.nan)
+        if len(values) >= window:
+            result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+        return result
+    
     def calculate_advanced_indicators(self, data: pd.DataFrame) -> Dict:
         """Calculate advanced technical indicators for monthly profit optimization"""
         if len(data) < 50:
@@ -110,30 +147,31 @@ class MonthlyProfitAnalyzer:
         indicators = {}
         
         try:
-            # Enhanced RSI with multiple timeframes
-            delta = data['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            indicators['rsi_14'] = 100 - (100 / (1 + rs))
-            
-            # Faster RSI for quicker signals
-            gain_9 = (delta.where(delta > 0, 0)).rolling(window=9).mean()
-            loss_9 = (-delta.where(delta < 0, 0)).rolling(window=9).mean()
-            rs_9 = gain_9 / loss_9
-            indicators['rsi_9'] = 100 - (100 / (1 + rs_9))
+            # Enhanced RSI with multiple timeframes (signed deltas on the raw ndarray)
+            close = data['Close'].to_numpy(dtype=float)
+            delta = np.diff(close, prepend=close[0])
+            up_moves = np.maximum(delta, 0)
+            down_moves = np.maximum(-delta, 0)
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = self._rolling_mean(up_moves, 14) / self._rolling_mean(down_moves, 14)
+                indicators['rsi_14'] = pd.Series(100 - (100 / (1 + rs)), index=data.index)
+                
+                # Faster RSI for quicker signals
+                rs_9 = self._rolling_mean(up_moves, 9) / self._rolling_mean(down_moves, 9)
+                indicators['rsi_9'] = pd.Series(100 - (100 / (1 + rs_9)), index=data.index)
             
             # Multiple Moving Averages for trend confirmation
-            indicators['ema_8'] = data['Close'].ewm(span=8).mean()
-            indicators['ema_21'] = data['Close'].ewm(span=21).mean()
-            indicators['ema_50'] = data['Close'].ewm(span=50).mean()
+            indicators['ema_8'] = data['Close'].ewm(span=8, adjust=False).mean()
+            indicators['ema_21'] = data['Close'].ewm(span=21, adjust=False).mean()
+            indicators['ema_50'] = data['Close'].ewm(span=50, adjust=False).mean()
             indicators['sma_20'] = data['Close'].rolling(20).mean()
             
             # Advanced MACD with signal optimization
-            ema_12 = data['Close'].ewm(span=12).mean()
-            ema_26 = data['Close'].ewm(span=26).mean()
+            ema_12 = data['Close'].ewm(span=12, adjust=False).mean()
+            ema_26 = data['Close'].ewm(span=26, adjust=False).mean()
             indicators['macd'] = ema_12 - ema_26
-            indicators['macd_signal'] = indicators['macd'].ewm(span=9).mean()
+            indicators['macd_signal'] = indicators['macd'].ewm(span=9, adjust=False).mean()
             indicators['macd_histogram'] = indicators['macd'] - indicators['macd_signal']
             
             # Bollinger Bands with squeeze detection
@@ -168,234 +206,230 @@ class MonthlyProfitAnalyzer:
         
         return indicators
     
+    def _extract_features(self, data: pd.DataFrame, indicators: Dict) -> Dict[str, float]:
+        """Extract the last-bar scalar features used by the scoring pass"""
+        # Pull each series' tail once as numpy instead of repeated .iloc lookups
+        arrays = {key: series.to_numpy() for key, series in indicators.items()}
+        last = {key: (arr[-1] if len(arr) > 0 else np.nan) for key, arr in arrays.items()}
+        prev = {key: (arr[-2] if len(arr) > 1 else np.nan) for key, arr in arrays.items()}
+        close = data['Close'].to_numpy()
+        
+        features = {'current_price': close[-1]}
+        for key in ['rsi_14', 'rsi_9', 'macd', 'macd_signal', 'macd_histogram',
+                    'ema_8', 'ema_21', 'ema_50', 'volume_ratio',
+                    'momentum_5', 'momentum_10', 'momentum_20',
+                    'bb_upper', 'bb_lower', 'bb_squeeze', 'resistance', 'support']:
+            features[key] = last.get(key, np.nan)
+        
+        for key in ['macd', 'macd_signal', 'macd_histogram']:
+            features[f'{key}_prev'] = prev.get(key, np.nan)
+        
+        # Price changes
+        current_price = close[-1]
+        features['price_change_1d'] = ((current_price / close[-2]) - 1) * 100 if len(close) >= 2 else 0
+        features['price_change_5d'] = ((current_price / close[-6]) - 1) * 100 if len(close) >= 6 else 0
+        features['price_change_20d'] = ((current_price / close[-21]) - 1) * 100 if len(close) >= 21 else 0
+        
+        return features
+    
+    def _score_features(self, features: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Score N symbols at once using boolean masks over their last-bar features"""
+        cfg = self.config
+        n = len(features['current_price'])
+        score = np.zeros(n, dtype=np.int8)
+        category = np.zeros(n, dtype=np.int8)
+        signal_bits = np.zeros(n, dtype=np.uint32)
+        
+        def add(bit: int, mask: np.ndarray, points: int, new_category: int = 0):
+            signal_bits[mask] |= np.uint32(1 << bit)
+            score[mask] += points
+            if new_category:
+                category[mask] = np.maximum(category[mask], new_category)
+        
+        price = features['current_price']
+        
+        # Enhanced RSI Analysis (Multiple timeframes)
+        rsi_14 = np.where(np.isnan(features['rsi_14']), 50, features['rsi_14'])
+        rsi_9 = np.where(np.isnan(features['rsi_9']), 50, features['rsi_9'])
+        oversold = (rsi_14 <= cfg.rsi_oversold) | (rsi_9 <= cfg.rsi_oversold)
+        overbought = ~oversold & ((rsi_14 >= cfg.rsi_overbought) | (rsi_9 >= cfg.rsi_overbought))
+        bull_zone = ~oversold & ~overbought & (rsi_14 > 15) & (rsi_14 <= 25)
+        bear_zone = ~oversold & ~overbought & ~bull_zone & (rsi_14 >= 75) & (rsi_14 < 85)
+        add(0, oversold, 4, self.CATEGORY_BREAKOUT)
+        add(1, overbought, -4)
+        add(2, bull_zone, 3, self.CATEGORY_MOMENTUM)
+        add(3, bear_zone, -3)
+        
+        # Advanced MACD Analysis
+        macd = features['macd']
+        fresh_cross = (macd > features['macd_signal']) & (features['macd_prev'] <= features['macd_signal_prev'])
+        add(4, fresh_cross & (macd > 0), 4, self.CATEGORY_BREAKOUT)
+        add(5, fresh_cross & ~(macd > 0), 3)
+        macd_hist = features['macd_histogram']
+        add(6, (macd_hist > 0) & (macd_hist > features['macd_histogram_prev']), 2)
+        
+        # Multi-timeframe Moving Average Analysis
+        ema_8, ema_21, ema_50 = features['ema_8'], features['ema_21'], features['ema_50']
+        perfect_stack = (price > ema_8) & (ema_8 > ema_21) & (ema_21 > ema_50)
+        uptrend = ~perfect_stack & (price > ema_8) & (ema_8 > ema_21)
+        downtrend = ~perfect_stack & ~uptrend & (price < ema_8) & (ema_8 < ema_21) & (ema_21 < ema_50)
+        add(7, perfect_stack, 4, self.CATEGORY_BREAKOUT)
+        add(8, uptrend, 3)
+        add(9, downtrend, -4)
+        
+        # Volume Explosion Analysis
+        vol_ratio = features['volume_ratio']
+        volume_high = vol_ratio >= cfg.volume_threshold
+        add(10, volume_high & (vol_ratio >= 5.0), 4, self.CATEGORY_BREAKOUT)
+        add(11, volume_high & (vol_ratio < 5.0) & (vol_ratio >= 3.0), 3)
+        add(12, volume_high & (vol_ratio < 3.0), 2)
+        add(13, ~volume_high & (vol_ratio < 0.5), -2)
+        
+        # Momentum Analysis
+        mom_5, mom_10, mom_20 = features['momentum_5'], features['momentum_10'], features['momentum_20']
+        breakout_momentum = mom_5 >= cfg.breakout_threshold * 100  # 8%+ in 5 days
+        strong_momentum = ~breakout_momentum & (mom_5 >= cfg.momentum_threshold * 100)  # 5%+ in 5 days
+        add(14, breakout_momentum, 4, self.CATEGORY_BREAKOUT)
+        add(15, strong_momentum, 3, self.CATEGORY_MOMENTUM)
+        add(16, (mom_5 > mom_10) & (mom_10 > mom_20) & (mom_20 > 0), 2)
+        
+        # Bollinger Band Analysis
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_position = (price - features['bb_lower']) / (features['bb_upper'] - features['bb_lower'])
+        bb_oversold = bb_position <= 0.05
+        bb_overbought = ~bb_oversold & (bb_position >= 0.95)
+        bb_breakout = ~bb_oversold & ~bb_overbought & (bb_position >= 0.8) & (features['bb_squeeze'] < 0.1)
+        add(17, bb_oversold, 3)
+        add(18, bb_overbought, -3)
+        add(19, bb_breakout, 3, self.CATEGORY_BREAKOUT)
+        
+        # Support/Resistance Breakout
+        resistance_breakout = price > features['resistance'] * 1.02  # 2% above resistance
+        add(20, resistance_breakout, 3, self.CATEGORY_BREAKOUT)
+        add(21, ~resistance_breakout & (price < features['support'] * 1.02), 2)  # Near support
+        
+        # Calculate signal strength
+        strength = np.clip(np.trunc((score + 6) / 12 * 100), 0, 100).astype(int)
+        
+        return {'score': score, 'strength': strength, 'category': category, 'signal_bits': signal_bits}
+    
+    def _decode_signals(self, signal_bits: int, features: Dict[str, float]) -> List[str]:
+        """Expand a signal bitmask into display labels"""
+        return [template.format(**features) for bit, template in enumerate(self.SIGNAL_TEMPLATES)
+                if signal_bits >> bit & 1]
+    
+    def _build_result(self, symbol: str, features: Dict[str, float], score: int,
+                      strength: int, category: int, signal_bits: int) -> Optional[Dict]:
+        """Build the result dict for a single scored symbol"""
+        # Determine direction and profit target
+        if score >= 6:
+            direction = "SUPER BUY"
+            target_profit = self.config.take_profit_breakout
+        elif score >= 4:
+            direction = "STRONG BUY"
+            target_profit = self.config.take_profit_momentum
+        elif score >= 2:
+            direction = "BUY"
+            target_profit = self.config.take_profit_fast
+        elif score <= -6:
+            direction = "SUPER SELL"
+            target_profit = 0
+        elif score <= -4:
+            direction = "STRONG SELL"
+            target_profit = 0
+        elif score <= -2:
+            direction = "SELL"
+            target_profit = 0
+        else:
+            return None  # Not strong enough signal
+        
+        current_price = features['current_price']
+        profit_category = self.CATEGORY_NAMES[category]
+        signals = self._decode_signals(signal_bits, features)
+        
+        # Calculate trading levels
+        if direction in ["SUPER BUY", "STRONG BUY", "BUY"]:
+            entry_price = current_price
+            stop_loss = entry_price * (1 - self.config.stop_loss_tight)
+            take_profit = entry_price * (1 + target_profit)
+            trailing_stop = entry_price * (1 - self.config.trailing_stop_aggressive)
+            
+            # Risk-reward ratio
+            risk = (entry_price - stop_loss) / entry_price
+            reward = (take_profit - entry_price) / entry_price
+            risk_reward_ratio = reward / risk if risk > 0 else 0
+        else:
+            entry_price = stop_loss = take_profit = trailing_stop = risk_reward_ratio = 0
+        
+        volume_ratio = features['volume_ratio']
+        
+        return {
+            'symbol': symbol,
+            'name': symbol.replace('.NS', ''),
+            'direction': direction,
+            'strength': strength,
+            'profit_category': profit_category,
+            'signals': signals,
+            'rsi_14': 50 if np.isnan(features['rsi_14']) else features['rsi_14'],
+            'rsi_9': 50 if np.isnan(features['rsi_9']) else features['rsi_9'],
+            'current_price': current_price,
+            'price_change_1d': features['price_change_1d'],
+            'price_change_5d': features['price_change_5d'],
+            'price_change_20d': features['price_change_20d'],
+            'volume_ratio': volume_ratio,
+            'score': score,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'trailing_stop': trailing_stop,
+            'target_profit_pct': target_profit * 100,
+            'risk_reward_ratio': risk_reward_ratio,
+            'monthly_profit_potential': self._estimate_monthly_potential(score, strength, profit_category)
+        }
+    
+    def _fetch_features(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Download history for a symbol and reduce it to last-bar features"""
+        import yfinance as yf  # Deferred so grading/display code imports without yfinance
+        
+        ticker = yf.Ticker(symbol)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            data = ticker.history(period="6mo", interval="1d")
+        
+        if data.empty or len(data) < 50:
+            return None
+        
+        # Optional volume prefilter before the full indicator pass. Not conservative: volume is only
+        # one of several scored signals, so symbols it skips could still reach min_signal_strength
+        if self.config.volume_prefilter > 0:
+            volume = data['Volume'].to_numpy()
+            volume_mean = volume[-20:].mean()
+            if volume_mean > 0 and volume[-1] < self.config.volume_prefilter * self.config.volume_threshold * volume_mean:
+                return None
+        
+        indicators = self.calculate_advanced_indicators(data)
+        if not indicators:
+            return None
+        
+        return self._extract_features(data, indicators)
+    
     def analyze_monthly_profit_potential(self, symbol: str) -> Optional[Dict]:
         """Analyze stock for monthly profit potential"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="6mo", interval="1d")
-            
-            if data.empty or len(data) < 50:
-                return None
-            
-            indicators = self.calculate_advanced_indicators(data)
-            if not indicators:
+            features = self._fetch_features(symbol)
+            if features is None:
                 return None
             
-            current_price = data['Close'].iloc[-1]
-            current_volume = data['Volume'].iloc[-1]
-            
-            # Monthly profit scoring system
-            signals = []
-            score = 0
-            profit_category = "STANDARD"
-            
-            # Enhanced RSI Analysis (Multiple timeframes)
-            rsi_14 = indicators['rsi_14'].iloc[-1] if 'rsi_14' in indicators else 50
-            rsi_9 = indicators['rsi_9'].iloc[-1] if 'rsi_9' in indicators else 50
-            
-            if rsi_14 <= self.config.rsi_oversold or rsi_9 <= self.config.rsi_oversold:
-                signals.append("EXTREME OVERSOLD")
-                score += 4
-                profit_category = "BREAKOUT"
-            elif rsi_14 >= self.config.rsi_overbought or rsi_9 >= self.config.rsi_overbought:
-                signals.append("EXTREME OVERBOUGHT")
-                score -= 4
-            elif 15 < rsi_14 <= 25:
-                signals.append("STRONG BULLISH ZONE")
-                score += 3
-                profit_category = "MOMENTUM"
-            elif 75 <= rsi_14 < 85:
-                signals.append("STRONG BEARISH ZONE")
-                score -= 3
-            
-            # Advanced MACD Analysis
-            if 'macd' in indicators and 'macd_signal' in indicators:
-                macd = indicators['macd'].iloc[-1]
-                macd_signal = indicators['macd_signal'].iloc[-1]
-                macd_hist = indicators['macd_histogram'].iloc[-1]
-                
-                if len(indicators['macd']) > 1:
-                    macd_prev = indicators['macd'].iloc[-2]
-                    macd_signal_prev = indicators['macd_signal'].iloc[-2]
-                    
-                    # Fresh bullish crossover
-                    if macd > macd_signal and macd_prev <= macd_signal_prev:
-                        if macd > 0:
-                            signals.append("MACD POWER BULL CROSS")
-                            score += 4
-                            profit_category = "BREAKOUT"
-                        else:
-                            signals.append("MACD BULL CROSS")
-                            score += 3
-                    
-                    # MACD momentum
-                    if macd_hist > 0 and macd_hist > indicators['macd_histogram'].iloc[-2]:
-                        signals.append("MACD MOMENTUM+")
-                        score += 2
-            
-            # Multi-timeframe Moving Average Analysis
-            if all(key in indicators for key in ['ema_8', 'ema_21', 'ema_50']):
-                ema_8 = indicators['ema_8'].iloc[-1]
-                ema_21 = indicators['ema_21'].iloc[-1]
-                ema_50 = indicators['ema_50'].iloc[-1]
-                
-                # Perfect trend alignment
-                if current_price > ema_8 > ema_21 > ema_50:
-                    signals.append("PERFECT TREND STACK")
-                    score += 4
-                    profit_category = "BREAKOUT"
-                elif current_price > ema_8 > ema_21:
-                    signals.append("STRONG UPTREND")
-                    score += 3
-                elif current_price < ema_8 < ema_21 < ema_50:
-                    signals.append("PERFECT DOWNTREND")
-                    score -= 4
-            
-            # Volume Explosion Analysis
-            if 'volume_ratio' in indicators:
-                vol_ratio = indicators['volume_ratio'].iloc[-1]
-                
-                if vol_ratio >= self.config.volume_threshold:
-                    if vol_ratio >= 5.0:
-                        signals.append(f"VOLUME EXPLOSION ({vol_ratio:.1f}x)")
-                        score += 4
-                        profit_category = "BREAKOUT"
-                    elif vol_ratio >= 3.0:
-                        signals.append(f"HIGH VOLUME SURGE ({vol_ratio:.1f}x)")
-                        score += 3
-                    else:
-                        signals.append(f"VOLUME INCREASE ({vol_ratio:.1f}x)")
-                        score += 2
-                elif vol_ratio < 0.5:
-                    signals.append("LOW VOLUME")
-                    score -= 2
-            
-            # Momentum Analysis
-            if 'momentum_5' in indicators and 'momentum_10' in indicators:
-                mom_5 = indicators['momentum_5'].iloc[-1]
-                mom_10 = indicators['momentum_10'].iloc[-1]
-                mom_20 = indicators['momentum_20'].iloc[-1]
-                
-                if mom_5 >= self.config.breakout_threshold * 100:  # 8%+ in 5 days
-                    signals.append(f"BREAKOUT MOMENTUM ({mom_5:.1f}%)")
-                    score += 4
-                    profit_category = "BREAKOUT"
-                elif mom_5 >= self.config.momentum_threshold * 100:  # 5%+ in 5 days
-                    signals.append(f"STRONG MOMENTUM ({mom_5:.1f}%)")
-                    score += 3
-                    if profit_category == "STANDARD":
-                        profit_category = "MOMENTUM"
-                
-                # Accelerating momentum
-                if mom_5 > mom_10 > mom_20 and all(m > 0 for m in [mom_5, mom_10, mom_20]):
-                    signals.append("ACCELERATING MOMENTUM")
-                    score += 2
-            
-            # Bollinger Band Analysis
-            if all(key in indicators for key in ['bb_upper', 'bb_lower', 'bb_squeeze']):
-                bb_upper = indicators['bb_upper'].iloc[-1]
-                bb_lower = indicators['bb_lower'].iloc[-1]
-                bb_squeeze = indicators['bb_squeeze'].iloc[-1]
-                
-                bb_position = (current_price - bb_lower) / (bb_upper - bb_lower)
-                
-                if bb_position <= 0.05:  # Extreme oversold
-                    signals.append("BB EXTREME OVERSOLD")
-                    score += 3
-                elif bb_position >= 0.95:  # Extreme overbought
-                    signals.append("BB EXTREME OVERBOUGHT")
-                    score -= 3
-                elif bb_position >= 0.8 and bb_squeeze < 0.1:  # Squeeze breakout
-                    signals.append("BB SQUEEZE BREAKOUT")
-                    score += 3
-                    profit_category = "BREAKOUT"
-            
-            # Support/Resistance Breakout
-            if 'resistance' in indicators and 'support' in indicators:
-                resistance = indicators['resistance'].iloc[-1]
-                support = indicators['support'].iloc[-1]
-                
-                # Resistance breakout
-                if current_price > resistance * 1.02:  # 2% above resistance
-                    signals.append("RESISTANCE BREAKOUT")
-                    score += 3
-                    profit_category = "BREAKOUT"
-                # Support bounce
-                elif current_price < support * 1.02:  # Near support
-                    signals.append("SUPPORT BOUNCE SETUP")
-                    score += 2
-            
-            # Calculate signal strength
-            strength = min(100, max(0, int((score + 6) / 12 * 100)))
+            scored = self._score_features({key: np.array([value], dtype=float) for key, value in features.items()})
+            score = int(scored['score'][0])
+            strength = int(scored['strength'][0])
             
             # Apply minimum signal strength filter
             if strength < self.config.min_signal_strength:
                 return None
             
-            # Determine direction and profit target
-            if score >= 6:
-                direction = "SUPER BUY"
-                target_profit = self.config.take_profit_breakout
-            elif score >= 4:
-                direction = "STRONG BUY"
-                target_profit = self.config.take_profit_momentum
-            elif score >= 2:
-                direction = "BUY"
-                target_profit = self.config.take_profit_fast
-            elif score <= -6:
-                direction = "SUPER SELL"
-                target_profit = 0
-            elif score <= -4:
-                direction = "STRONG SELL"
-                target_profit = 0
-            elif score <= -2:
-                direction = "SELL"
-                target_profit = 0
-            else:
-                return None  # Not strong enough signal
-            
-            # Calculate price changes
-            price_1d = ((current_price / data['Close'].iloc[-2]) - 1) * 100 if len(data) >= 2 else 0
-            price_5d = ((current_price / data['Close'].iloc[-6]) - 1) * 100 if len(data) >= 6 else 0
-            price_20d = ((current_price / data['Close'].iloc[-21]) - 1) * 100 if len(data) >= 21 else 0
-            
-            # Calculate trading levels
-            if direction in ["SUPER BUY", "STRONG BUY", "BUY"]:
-                entry_price = current_price
-                stop_loss = entry_price * (1 - self.config.stop_loss_tight)
-                take_profit = entry_price * (1 + target_profit)
-                trailing_stop = entry_price * (1 - self.config.trailing_stop_aggressive)
-                
-                # Risk-reward ratio
-                risk = (entry_price - stop_loss) / entry_price
-                reward = (take_profit - entry_price) / entry_price
-                risk_reward_ratio = reward / risk if risk > 0 else 0
-            else:
-                entry_price = stop_loss = take_profit = trailing_stop = risk_reward_ratio = 0
-            
-            return {
-                'symbol': symbol,
-                'name': symbol.replace('.NS', ''),
-                'direction': direction,
-                'strength': strength,
-                'profit_category': profit_category,
-                'signals': signals,
-                'rsi_14': rsi_14,
-                'rsi_9': rsi_9,
-                'current_price': current_price,
-                'price_change_1d': price_1d,
-                'price_change_5d': price_5d,
-                'price_change_20d': price_20d,
-                'volume_ratio': indicators.get('volume_ratio', pd.Series([1])).iloc[-1],
-                'score': score,
-                'entry_price': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'trailing_stop': trailing_stop,
-                'target_profit_pct': target_profit * 100,
-                'risk_reward_ratio': risk_reward_ratio,
-                'monthly_profit_potential': self._estimate_monthly_potential(score, strength, profit_category)
-            }
+            return self._build_result(symbol, features, score, strength,
+                                      int(scored['category'][0]), int(scored['signal_bits'][0]))
             
         except Exception as e:
             print(f"⚠️ Error analyzing {symbol}: {str(e)}")
@@ -427,19 +461,19 @@ class MonthlyProfitAnalyzer:
         print(f"💡 Risk Per Trade: {self.config.risk_per_trade*100:.1f}%")
         print("=" * 90)
         
-        results = []
-        processed = 0
+        symbols = []
+        rows = []
         skipped = 0
         
         for i, symbol in enumerate(self.liquid_stocks, 1):
             try:
                 if i % 20 == 0:
-                    print(f"📊 Progress: {i}/{len(self.liquid_stocks)} analyzed... Found: {len(results)} monthly profit opportunities")
+                    print(f"📊 Progress: {i}/{len(self.liquid_stocks)} analyzed... Collected: {len(rows)} candidates")
                 
-                analysis = self.analyze_monthly_profit_potential(symbol)
-                if analysis and analysis['direction'] in ['SUPER BUY', 'STRONG BUY', 'BUY']:
-                    results.append(analysis)
-                    processed += 1
+                features = self._fetch_features(symbol)
+                if features is not None:
+                    symbols.append(symbol)
+                    rows.append(features)
                 else:
                     skipped += 1
                     
@@ -448,6 +482,20 @@ class MonthlyProfitAnalyzer:
                 if skipped <= 3:
                     print(f"⚠️ Skipped {symbol}: {str(e)}")
         
+        results = []
+        if rows:
+            # Score every collected symbol in one vectorized pass
+            features = {key: np.array([row[key] for row in rows], dtype=float) for key in rows[0]}
+            scored = self._score_features(features)
+            results_mask = (scored['strength'] >= self.config.min_signal_strength) & (scored['score'] >= 2)
+            
+            for idx in np.flatnonzero(results_mask):
+                results.append(self._build_result(symbols[idx], rows[idx], int(scored['score'][idx]),
+                                                  int(scored['strength'][idx]), int(scored['category'][idx]),
+                                                  int(scored['signal_bits'][idx])))
+        
+        processed = len(results)
+        skipped += len(rows) - processed
         print(f"✅ Scan Complete: {processed} monthly profit stocks found, {skipped} skipped")
         
         # Sort by monthly profit potential and strength
@@ -6,10 +6,13 @@ Professional swing trading stock picker with multiple signal strengths
 
 import os
 import sys
+import functools
+import heapq
+import multiprocessing as mp
 import pandas as pd
 import yfinance as yf
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -17,217 +20,263 @@ warnings.filterwarnings('ignore')
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from trading_system.technical_analysis import TechnicalAnalysis
+from trading_system.config import TradingConfig
+from trading_system.technical_analysis import TechnicalAnalyzer
 from trading_system.risk_manager import RiskManager
 
+
+@functools.lru_cache(maxsize=1)
+def _liquid_universe() -> Tuple[str, ...]:
+    """Get 500+ high liquidity Indian stocks, deduplicated in sector order"""
+    # Top liquid NSE stocks across sectors (several names are listed under more than one sector)
+    stocks = [
+        # Banking & Financial Services
+        'HDFCBANK.NS', 'ICICIBANK.NS', 'KOTAKBANK.NS', 'AXISBANK.NS', 'SBIN.NS',
+        'INDUSINDBK.NS', 'BANKBARODA.NS', 'PNB.NS', 'FEDERALBNK.NS', 'IDFCFIRSTB.NS',
+        'BAJFINANCE.NS', 'BAJAJFINSV.NS', 'SBILIFE.NS', 'HDFCLIFE.NS', 'ICICIPRULI.NS',
+        'SBICARD.NS', 'HDFCAMC.NS', 'MUTHOOTFIN.NS', 'LICHSGFIN.NS', 'PFC.NS',
+        
+        # IT & Technology
+        'TCS.NS', 'INFY.NS', 'HCLTECH.NS', 'WIPRO.NS', 'TECHM.NS',
+        'LTI.NS', 'MINDTREE.NS', 'MPHASIS.NS', 'COFORGE.NS', 'PERSISTENT.NS',
+        'LTTS.NS', 'CYIENT.NS', 'ZENTEC.NS', 'NIITTECH.NS', 'SONATSOFTW.NS',
+        
+        # Pharmaceuticals
+        'SUNPHARMA.NS', 'DRREDDY.NS', 'CIPLA.NS', 'DIVISLAB.NS', 'BIOCON.NS',
+        'CADILAHC.NS', 'LUPIN.NS', 'AUROBINDO.NS', 'TORNTPHARM.NS', 'GLENMARK.NS',
+        'ALKEM.NS', 'LALPATHLAB.NS', 'APOLLOHOSP.NS', 'FORTIS.NS', 'MAXHEALTH.NS',
+        
+        # Energy & Oil
+        'RELIANCE.NS', 'ONGC.NS', 'IOC.NS', 'BPCL.NS', 'HPCL.NS',
+        'GAIL.NS', 'ADANIGREEN.NS', 'NTPC.NS', 'POWERGRID.NS', 'COALINDIA.NS',
+        'TATAPOWER.NS', 'ADANITRANS.NS', 'ADANIPORTS.NS', 'JSPL.NS', 'SAIL.NS',
+        
+        # FMCG & Consumer
+        'HINDUNILVR.NS', 'ITC.NS', 'NESTLEIND.NS', 'BRITANNIA.NS', 'MARICO.NS',
+        'DABUR.NS', 'GODREJCP.NS', 'COLPAL.NS', 'PGHH.NS', 'UBL.NS',
+        'TATACONSUM.NS', 'JUBLFOOD.NS', 'VBL.NS', 'EMAMILTD.NS', 'RADICO.NS',
+        
+        # Automobiles
+        'MARUTI.NS', 'HYUNDAI.NS', 'TATAMOTORS.NS', 'M&M.NS', 'BAJAJ-AUTO.NS',
+        'HEROMOTOCO.NS', 'TVSMOTORS.NS', 'EICHERMOT.NS', 'ASHOKLEY.NS', 'FORCE.NS',
+        'BOSCHLTD.NS', 'MRF.NS', 'APOLLOTYRE.NS', 'CEAT.NS', 'JK.NS',
+        
+        # Metals & Mining
+        'TATASTEEL.NS', 'JSWSTEEL.NS', 'HINDALCO.NS', 'VEDL.NS', 'NATIONALUM.NS',
+        'JINDALSTEL.NS', 'NMDC.NS', 'MOIL.NS', 'HINDZINC.NS', 'RATNAMANI.NS',
+        'WELCORP.NS', 'WELSPUNIND.NS', 'JSWENERGY.NS', 'ADANIENT.NS', 'GMRINFRA.NS',
+        
+        # Cement
+        'ULTRACEMCO.NS', 'SHREECEM.NS', 'GRASIM.NS', 'ACC.NS', 'AMBUJACEMENT.NS',
+        'JKCEMENT.NS', 'RAMCOCEM.NS', 'HEIDELBERG.NS', 'STARCEMENT.NS', 'PRISMCEM.NS',
+        
+        # Infrastructure & Construction
+        'LT.NS', 'BHARTIARTL.NS', 'JSWINFRA.NS', 'IRB.NS', 'NBCC.NS',
+        'NCC.NS', 'KECL.NS', 'BEML.NS', 'HAL.NS', 'COCHINSHIP.NS',
+        'BEL.NS', 'BHEL.NS', 'GRINDWELL.NS', 'CUMMINSIND.NS', 'ABB.NS',
+        
+        # Textiles & Apparel
+        'RELIANCE.NS', 'GRASIM.NS', 'VARDHMAN.NS', 'TRIDENT.NS', 'WELSPUNIND.NS',
+        'RAYMOND.NS', 'ADITYADG.NS', 'RUPA.NS', 'PAGEIND.NS', 'ARVIND.NS',
+        
+        # Chemicals
+        'UPL.NS', 'PIDILITIND.NS', 'AARTI.NS', 'GHCL.NS', 'TATACHEM.NS',
+        'DEEPAKNTR.NS', 'BALRAMCHIN.NS', 'ALKYLAMINE.NS', 'NOCIL.NS', 'JUBILANT.NS',
+        'SYMPHONY.NS', 'CHEMCON.NS', 'CLEAN.NS', 'DCMSHRIRAM.NS', 'FCONSUMER.NS',
+        
+        # Real Estate
+        'DLF.NS', 'GODREJPROP.NS', 'OBEROIRLTY.NS', 'BRIGADE.NS', 'SOBHA.NS',
+        'PHOENIXLTD.NS', 'MAHLIFE.NS', 'PRESTIGE.NS', 'KOLTEPATIL.NS', 'MAHINDCIE.NS',
+        
+        # Logistics & Transportation
+        'CONCOR.NS', 'GESHIP.NS', 'SCI.NS', 'BLUEDART.NS', 'THERMAX.NS',
+        'CRISIL.NS', 'INOXLEISUR.NS', 'PVR.NS', 'SPICEJET.NS', 'INDIGO.NS',
+        
+        # Media & Entertainment
+        'ZEEL.NS', 'SUNTV.NS', 'NETWORK18.NS', 'TVTODAY.NS', 'RWORLD.NS',
+        'DISHTV.NS', 'JAGRAN.NS', 'HCL-INSYS.NS', 'KPRMILL.NS', 'FIEMIND.NS',
+        
+        # Agriculture & Food Processing
+        'BRITANNIA.NS', 'VARUN.NS', 'KRBL.NS', 'HSIL.NS', 'RELAXO.NS',
+        'VMART.NS', 'SHOPRITE.NS', 'WESTLIFE.NS', 'DEVYANI.NS', 'SAPPHIRE.NS',
+        
+        # Power & Utilities
+        'NTPC.NS', 'POWERGRID.NS', 'NHPC.NS', 'SJVN.NS', 'THERMAX.NS',
+        'BHEL.NS', 'CESC.NS', 'RPOWER.NS', 'ADANIPOWER.NS', 'TORNTPOWER.NS',
+        
+        # Retail & E-commerce
+        'AVENUE.NS', 'TRENT.NS', 'RELAXO.NS', 'BATA.NS', 'VMART.NS',
+        'SHOPRITE.NS', 'FRETAIL.NS', 'SPENCERS.NS', 'MINDACORP.NS', 'CCL.NS',
+        
+        # Defense & Aerospace
+        'HAL.NS', 'BEL.NS', 'BEML.NS', 'COCHINSHIP.NS', 'GRSE.NS',
+        'MIDHANI.NS', 'ORDNANCE.NS', 'ZENTECH.NS', 'ASTRAZEN.NS', 'DYNAMATIC.NS',
+        
+        # Capital Goods
+        'LT.NS', 'BHEL.NS', 'SIEMENS.NS', 'ABB.NS', 'CROMPTON.NS',
+        'HAVELLS.NS', 'VOLTAS.NS', 'BLUESTAR.NS', 'THERMAX.NS', 'CUMMINSIND.NS',
+        
+        # Telecom
+        'BHARTIARTL.NS', 'IDEA.NS', 'RCOM.NS', 'GTLINFRA.NS', 'RAILTEL.NS',
+        'HFCL.NS', 'STERLTECH.NS', 'OPTIEMUS.NS', 'TEJAS.NS', 'ROUTE.NS',
+        
+        # Insurance
+        'SBILIFE.NS', 'HDFCLIFE.NS', 'ICICIPRULI.NS', 'MAXLIFE.NS', 'STARHEALTH.NS',
+        'NIACL.NS', 'ORIENTINS.NS', 'UIIC.NS', 'GICRE.NS', 'NEWGEN.NS',
+        
+        # Tourism & Hotels
+        'INDHOTEL.NS', 'LEMONTREE.NS', 'MAHINDRA.NS', 'COX&KINGS.NS', 'THOMAS.NS',
+        'EIHLTD.NS', 'ORIENTHOT.NS', 'MAHINDRA.NS', 'PANTALOONS.NS', 'CHALET.NS',
+        
+        # Education
+        'APTECH.NS', 'NIIT.NS', 'NAVNEET.NS', 'CAREEREDGE.NS', 'KPIT.NS',
+        'ZENSAR.NS', 'RAMKY.NS', 'EDUCOMP.NS', 'EVERONN.NS', 'TREE.NS'
+    ]
+    
+    return tuple(dict.fromkeys(stocks))
+
+
+# Signal labels by bit position in a result's signal_bits; the first
+# _KERNEL_SIGNALS rows match the condition matrix returned by _score_kernel
+_SIGNAL_LABELS = (
+    "RSI Oversold (Bullish)",
+    "RSI Overbought (Bearish)",
+    "RSI Recovery Zone",
+    "RSI Strong Zone",
+    "MACD Bullish Crossover",
+    "MACD Bearish Crossover",
+    "Above Key MAs",
+    "Below Key MAs",
+    "Short EMA > Long EMA",
+    "Short EMA < Long EMA",
+    "BB Oversold",
+    "BB Overbought",
+    "Above BB Middle",
+    "High Volume",
+    "Strong Daily Gain: +{price_change_1d:.1f}%",
+    "Daily Decline: {price_change_1d:.1f}%",
+)
+_KERNEL_SIGNALS = 13
+_SIG_HIGH_VOLUME, _SIG_DAILY_GAIN, _SIG_DAILY_DECLINE = 13, 14, 15
+
+
+def _score_kernel(close: np.ndarray, rsi: np.ndarray, macd_line: np.ndarray, macd_signal: np.ndarray,
+                  sma_20: np.ndarray, sma_50: np.ndarray, ema_short: np.ndarray, ema_long: np.ndarray,
+                  bb_upper: np.ndarray, bb_lower: np.ndarray, bb_middle: np.ndarray
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score indicator histories on flat float arrays.
+    
+    Returns the bullish and bearish score per bar, plus a boolean condition
+    matrix with one row per kernel entry of _SIGNAL_LABELS.
+    """
+    rsi_oversold = rsi < 30
+    rsi_overbought = rsi > 70
+    rsi_recovery = (rsi >= 30) & (rsi <= 45)
+    rsi_strong = (rsi >= 55) & (rsi <= 70)
+    
+    macd_bullish = (macd_line > macd_signal) & (macd_line > 0)
+    macd_bearish = (macd_line < macd_signal) & (macd_line < 0)
+    
+    above_mas = (close > sma_20) & (sma_20 > sma_50)
+    below_mas = (close < sma_20) & (sma_20 < sma_50)
+    
+    ema_bullish = ema_short > ema_long
+    
+    bb_oversold = close <= bb_lower
+    bb_overbought = ~bb_oversold & (close >= bb_upper)
+    above_bb_middle = ~bb_oversold & ~bb_overbought & (close > bb_middle)
+    
+    bullish = (2 * rsi_oversold + 1 * rsi_recovery + 0.5 * rsi_strong
+               + 2 * macd_bullish + 1.5 * above_mas + 1 * ema_bullish
+               + 1.5 * bb_oversold + 0.5 * above_bb_middle)
+    bearish = (2 * rsi_overbought + 2 * macd_bearish + 1.5 * below_mas
+               + 1 * ~ema_bullish + 1.5 * bb_overbought)
+    
+    conditions = np.vstack([
+        rsi_oversold, rsi_overbought, rsi_recovery, rsi_strong,
+        macd_bullish, macd_bearish, above_mas, below_mas,
+        ema_bullish, ~ema_bullish, bb_oversold, bb_overbought, above_bb_middle,
+    ])
+    return bullish, bearish, conditions
+
+
 class AdvancedStockPicker:
     def __init__(self):
         """Initialize the advanced stock picker"""
-        self.technical_analysis = TechnicalAnalysis()
-        self.risk_manager = RiskManager()
-        self.liquid_stocks = self._get_high_liquidity_stocks()
-        
-    def _get_high_liquidity_stocks(self) -> List[str]:
-        """Get 500+ high liquidity Indian stocks"""
-        # Top liquid NSE stocks across sectors
-        stocks = [
-            # Banking & Financial Services
-            'HDFCBANK.NS', 'ICICIBANK.NS', 'KOTAKBANK.NS', 'AXISBANK.NS', 'SBIN.NS',
-            'INDUSINDBK.NS', 'BANKBARODA.NS', 'PNB.NS', 'FEDERALBNK.NS', 'IDFCFIRSTB.NS',
-            'BAJFINANCE.NS', 'BAJAJFINSV.NS', 'SBILIFE.NS', 'HDFCLIFE.NS', 'ICICIPRULI.NS',
-            'SBICARD.NS', 'HDFCAMC.NS', 'MUTHOOTFIN.NS', 'LICHSGFIN.NS', 'PFC.NS',
-            
-            # IT & Technology
-            'TCS.NS', 'INFY.NS', 'HCLTECH.NS', 'WIPRO.NS', 'TECHM.NS',
-            'LTI.NS', 'MINDTREE.NS', 'MPHASIS.NS', 'COFORGE.NS', 'PERSISTENT.NS',
-            'LTTS.NS', 'CYIENT.NS', 'ZENTEC.NS', 'NIITTECH.NS', 'SONATSOFTW.NS',
-            
-            # Pharmaceuticals
-            'SUNPHARMA.NS', 'DRREDDY.NS', 'CIPLA.NS', 'DIVISLAB.NS', 'BIOCON.NS',
-            'CADILAHC.NS', 'LUPIN.NS', 'AUROBINDO.NS', 'TORNTPHARM.NS', 'GLENMARK.NS',
-            'ALKEM.NS', 'LALPATHLAB.NS', 'APOLLOHOSP.NS', 'FORTIS.NS', 'MAXHEALTH.NS',
-            
-            # Energy & Oil
-            'RELIANCE.NS', 'ONGC.NS', 'IOC.NS', 'BPCL.NS', 'HPCL.NS',
-            'GAIL.NS', 'ADANIGREEN.NS', 'NTPC.NS', 'POWERGRID.NS', 'COALINDIA.NS',
-            'TATAPOWER.NS', 'ADANITRANS.NS', 'ADANIPORTS.NS', 'JSPL.NS', 'SAIL.NS',
-            
-            # FMCG & Consumer
-            'HINDUNILVR.NS', 'ITC.NS', 'NESTLEIND.NS', 'BRITANNIA.NS', 'MARICO.NS',
-            'DABUR.NS', 'GODREJCP.NS', 'COLPAL.NS', 'PGHH.NS', 'UBL.NS',
-            'TATACONSUM.NS', 'JUBLFOOD.NS', 'VBL.NS', 'EMAMILTD.NS', 'RADICO.NS',
-            
-            # Automobiles
-            'MARUTI.NS', 'HYUNDAI.NS', 'TATAMOTORS.NS', 'M&M.NS', 'BAJAJ-AUTO.NS',
-            'HEROMOTOCO.NS', 'TVSMOTORS.NS', 'EICHERMOT.NS', 'ASHOKLEY.NS', 'FORCE.NS',
-            'BOSCHLTD.NS', 'MRF.NS', 'APOLLOTYRE.NS', 'CEAT.NS', 'JK.NS',
-            
-            # Metals & Mining
-            'TATASTEEL.NS', 'JSWSTEEL.NS', 'HINDALCO.NS', 'VEDL.NS', 'NATIONALUM.NS',
-            'JINDALSTEL.NS', 'NMDC.NS', 'MOIL.NS', 'HINDZINC.NS', 'RATNAMANI.NS',
-            'WELCORP.NS', 'WELSPUNIND.NS', 'JSWENERGY.NS', 'ADANIENT.NS', 'GMRINFRA.NS',
-            
-            # Cement
-            'ULTRACEMCO.NS', 'SHREECEM.NS', 'GRASIM.NS', 'ACC.NS', 'AMBUJACEMENT.NS',
-            'JKCEMENT.NS', 'RAMCOCEM.NS', 'HEIDELBERG.NS', 'STARCEMENT.NS', 'PRISMCEM.NS',
-            
-            # Infrastructure & Construction
-            'LT.NS', 'BHARTIARTL.NS', 'JSWINFRA.NS', 'IRB.NS', 'NBCC.NS',
-            'NCC.NS', 'KECL.NS', 'BEML.NS', 'HAL.NS', 'COCHINSHIP.NS',
-            'BEL.NS', 'BHEL.NS', 'GRINDWELL.NS', 'CUMMINSIND.NS', 'ABB.NS',
-            
-            # Textiles & Apparel
-            'RELIANCE.NS', 'GRASIM.NS', 'VARDHMAN.NS', 'TRIDENT.NS', 'WELSPUNIND.NS',
-            'RAYMOND.NS', 'ADITYADG.NS', 'RUPA.NS', 'PAGEIND.NS', 'ARVIND.NS',
-            
-            # Chemicals
-            'UPL.NS', 'PIDILITIND.NS', 'AARTI.NS', 'GHCL.NS', 'TATACHEM.NS',
-            'DEEPAKNTR.NS', 'BALRAMCHIN.NS', 'ALKYLAMINE.NS', 'NOCIL.NS', 'JUBILANT.NS',
-            'SYMPHONY.NS', 'CHEMCON.NS', 'CLEAN.NS', 'DCMSHRIRAM.NS', 'FCONSUMER.NS',
-            
-            # Real Estate
-            'DLF.NS', 'GODREJPROP.NS', 'OBEROIRLTY.NS', 'BRIGADE.NS', 'SOBHA.NS',
-            'PHOENIXLTD.NS', 'MAHLIFE.NS', 'PRESTIGE.NS', 'KOLTEPATIL.NS', 'MAHINDCIE.NS',
-            
-            # Logistics & Transportation
-            'CONCOR.NS', 'GESHIP.NS', 'SCI.NS', 'BLUEDART.NS', 'THERMAX.NS',
-            'CRISIL.NS', 'INOXLEISUR.NS', 'PVR.NS', 'SPICEJET.NS', 'INDIGO.NS',
-            
-            # Media & Entertainment
-            'ZEEL.NS', 'SUNTV.NS', 'NETWORK18.NS', 'TVTODAY.NS', 'RWORLD.NS',
-            'DISHTV.NS', 'JAGRAN.NS', 'HCL-INSYS.NS', 'KPRMILL.NS', 'FIEMIND.NS',
-            
-            # Agriculture & Food Processing
-            'BRITANNIA.NS', 'VARUN.NS', 'KRBL.NS', 'HSIL.NS', 'RELAXO.NS',
-            'VMART.NS', 'SHOPRITE.NS', 'WESTLIFE.NS', 'DEVYANI.NS', 'SAPPHIRE.NS',
-            
-            # Power & Utilities
-            'NTPC.NS', 'POWERGRID.NS', 'NHPC.NS', 'SJVN.NS', 'THERMAX.NS',
-            'BHEL.NS', 'CESC.NS', 'RPOWER.NS', 'ADANIPOWER.NS', 'TORNTPOWER.NS',
-            
-            # Retail & E-commerce
-            'AVENUE.NS', 'TRENT.NS', 'RELAXO.NS', 'BATA.NS', 'VMART.NS',
-            'SHOPRITE.NS', 'FRETAIL.NS', 'SPENCERS.NS', 'MINDACORP.NS', 'CCL.NS',
-            
-            # Defense & Aerospace
-            'HAL.NS', 'BEL.NS', 'BEML.NS', 'COCHINSHIP.NS', 'GRSE.NS',
-            'MIDHANI.NS', 'ORDNANCE.NS', 'ZENTECH.NS', 'ASTRAZEN.NS', 'DYNAMATIC.NS',
-            
-            # Capital Goods
-            'LT.NS', 'BHEL.NS', 'SIEMENS.NS', 'ABB.NS', 'CROMPTON.NS',
-            'HAVELLS.NS', 'VOLTAS.NS', 'BLUESTAR.NS', 'THERMAX.NS', 'CUMMINSIND.NS',
-            
-            # Telecom
-            'BHARTIARTL.NS', 'IDEA.NS', 'RCOM.NS', 'GTLINFRA.NS', 'RAILTEL.NS',
-            'HFCL.NS', 'STERLTECH.NS', 'OPTIEMUS.NS', 'TEJAS.NS', 'ROUTE.NS',
-            
-            # Insurance
-            'SBILIFE.NS', 'HDFCLIFE.NS', 'ICICIPRULI.NS', 'MAXLIFE.NS', 'STARHEALTH.NS',
-            'NIACL.NS', 'ORIENTINS.NS', 'UIIC.NS', 'GICRE.NS', 'NEWGEN.NS',
-            
-            # Tourism & Hotels
-            'INDHOTEL.NS', 'LEMONTREE.NS', 'MAHINDRA.NS', 'COX&KINGS.NS', 'THOMAS.NS',
-            'EIHLTD.NS', 'ORIENTHOT.NS', 'MAHINDRA.NS', 'PANTALOONS.NS', 'CHALET.NS',
-            
-            # Education
-            'APTECH.NS', 'NIIT.NS', 'NAVNEET.NS', 'CAREEREDGE.NS', 'KPIT.NS',
-            'ZENSAR.NS', 'RAMKY.NS', 'EDUCOMP.NS', 'EVERONN.NS', 'TREE.NS'
-        ]
+        self.config = TradingConfig()
+        self.technical_analysis = TechnicalAnalyzer(self.config)
+        self.risk_manager = RiskManager(self.config)
+        self.liquid_stocks = _liquid_universe()
         
-        # Remove duplicates and return unique stocks
-        return list(set(stocks))
+        # Batched downloads keyed by symbol tuple, reused across pick_stocks() calls
+        self.download_cache: Dict[Tuple[str, ...], Tuple[datetime, pd.DataFrame]] = {}
+        self.download_cache_ttl = timedelta(hours=1)
+        
+        # Indicator arrays per symbol, tagged with the last bar they were computed for
+        self.indicator_cache: Dict[str, Tuple[pd.Timestamp, Dict[str, np.ndarray]]] = {}
+        
+        # Download-and-analyze results memoized on (symbol, date); empty downloads raise and are not cached
+        self._analyze_for_day = functools.lru_cache(maxsize=1024)(self._analyze_download)
+    
+    def calculate_indicators(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Calculate technical indicators as plain arrays"""
+        indicators = self.technical_analysis.calculate_indicators(data)
+        return {key: np.asarray(values, dtype=float) for key, values in indicators.items()}
     
-    def calculate_signal_strength(self, data: pd.DataFrame) -> Dict:
+    def calculate_signal_strength(self, data: pd.DataFrame,
+                                  indicators: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """Calculate comprehensive signal strength"""
         if len(data) < 50:
-            return {'strength': 0, 'signals': [], 'direction': 'HOLD'}
+            return {'strength': 0, 'signal_bits': 0, 'direction': 'HOLD'}
         
         try:
             # Get technical indicators
-            indicators = self.indicators.calculate_all_indicators(data)
-            current_price = data['Close'].iloc[-1]
-            
-            signals = []
-            bullish_score = 0
-            bearish_score = 0
-            
-            # RSI Analysis
-            rsi = indicators.get('rsi', [50])[-1] if indicators.get('rsi') is not None else 50
-            if rsi < 30:
-                signals.append("RSI Oversold (Bullish)")
-                bullish_score += 2
-            elif rsi > 70:
-                signals.append("RSI Overbought (Bearish)")
-                bearish_score += 2
-            elif 30 <= rsi <= 45:
-                signals.append("RSI Recovery Zone")
-                bullish_score += 1
-            elif 55 <= rsi <= 70:
-                signals.append("RSI Strong Zone")
-                bullish_score += 0.5
-            
-            # MACD Analysis
-            macd_line = indicators.get('macd', [0])[-1] if indicators.get('macd') is not None else 0
-            macd_signal = indicators.get('macd_signal', [0])[-1] if indicators.get('macd_signal') is not None else 0
-            if macd_line > macd_signal and macd_line > 0:
-                signals.append("MACD Bullish Crossover")
-                bullish_score += 2
-            elif macd_line < macd_signal and macd_line < 0:
-                signals.append("MACD Bearish Crossover")
-                bearish_score += 2
-            
-            # Moving Average Analysis
-            sma_20 = indicators.get('sma_20', [current_price])[-1] if indicators.get('sma_20') is not None else current_price
-            sma_50 = indicators.get('sma_50', [current_price])[-1] if indicators.get('sma_50') is not None else current_price
-            ema_12 = indicators.get('ema_12', [current_price])[-1] if indicators.get('ema_12') is not None else current_price
-            ema_26 = indicators.get('ema_26', [current_price])[-1] if indicators.get('ema_26') is not None else current_price
-            
-            if current_price > sma_20 > sma_50:
-                signals.append("Above Key MAs")
-                bullish_score += 1.5
-            elif current_price < sma_20 < sma_50:
-                signals.append("Below Key MAs")
-                bearish_score += 1.5
-            
-            if ema_12 > ema_26:
-                signals.append("Short EMA > Long EMA")
-                bullish_score += 1
-            else:
-                signals.append("Short EMA < Long EMA")
-                bearish_score += 1
-            
-            # Bollinger Bands Analysis
-            bb_upper = indicators.get('bb_upper', [current_price * 1.02])[-1] if indicators.get('bb_upper') is not None else current_price * 1.02
-            bb_lower = indicators.get('bb_lower', [current_price * 0.98])[-1] if indicators.get('bb_lower') is not None else current_price * 0.98
-            bb_middle = indicators.get('bb_middle', [current_price])[-1] if indicators.get('bb_middle') is not None else current_price
-            
-            if current_price <= bb_lower:
-                signals.append("BB Oversold")
-                bullish_score += 1.5
-            elif current_price >= bb_upper:
-                signals.append("BB Overbought")
-                bearish_score += 1.5
-            elif current_price > bb_middle:
-                signals.append("Above BB Middle")
-                bullish_score += 0.5
+            if indicators is None:
+                indicators = self.calculate_indicators(data)
+            close = data['Close'].to_numpy(dtype=float)
+            volume = data['Volume'].to_numpy(dtype=float)
+            current_price = close[-1]
+            
+            def history(key: str, default: float) -> np.ndarray:
+                values = indicators.get(key)
+                return np.asarray(values, dtype=float) if values is not None else np.full(len(close), default)
+            
+            rsi = history('RSI', 50)
+            macd_line = history('MACD', 0)
+            macd_signal = history('MACD_Signal', 0)
+            sma_20 = history('SMA_20', current_price)
+            sma_50 = history('SMA_50', current_price)
+            ema_short = history('EMA_9', current_price)
+            ema_long = history('EMA_21', current_price)
+            bb_upper = history('BB_Upper', current_price * 1.02)
+            bb_lower = history('BB_Lower', current_price * 0.98)
+            bb_middle = history('BB_Middle', current_price)
+            
+            bullish_history, bearish_history, conditions = _score_kernel(
+                close, rsi, macd_line, macd_signal, sma_20, sma_50,
+                ema_short, ema_long, bb_upper, bb_lower, bb_middle)
+            
+            bullish_score = float(bullish_history[-1])
+            bearish_score = float(bearish_history[-1])
+            signal_bits = int(conditions[:, -1] @ (1 << np.arange(_KERNEL_SIGNALS)))
+            rsi = rsi[-1]
             
             # Volume Analysis
-            volume_sma = data['Volume'].rolling(20).mean().iloc[-1]
-            current_volume = data['Volume'].iloc[-1]
-            if current_volume > volume_sma * 1.5:
-                signals.append("High Volume")
-                bullish_score += 1
+            volume_sma = volume[-20:].mean()
+            current_volume = volume[-1]
+            high_volume = bool(current_volume > volume_sma * 1.5)
             
             # Price Action Analysis
-            price_change_5d = (current_price / data['Close'].iloc[-6] - 1) * 100 if len(data) >= 6 else 0
-            price_change_1d = (current_price / data['Close'].iloc[-2] - 1) * 100 if len(data) >= 2 else 0
+            price_change_5d = (current_price / close[-6] - 1) * 100 if len(close) >= 6 else 0
+            price_change_1d = (current_price / close[-2] - 1) * 100 if len(close) >= 2 else 0
+            daily_gain = bool(price_change_1d > 2)
+            daily_decline = bool(price_change_1d < -2)
             
-            if price_change_1d > 2:
-                signals.append(f"Strong Daily Gain: +{price_change_1d:.1f}%")
-                bullish_score += 1
-            elif price_change_1d < -2:
-                signals.append(f"Daily Decline: {price_change_1d:.1f}%")
-                bearish_score += 1
+            # Branchless adds: each condition contributes its weight times 0/1
+            bullish_score += 1 * high_volume + 1 * daily_gain
+            bearish_score += 1 * daily_decline
+            signal_bits |= ((high_volume << _SIG_HIGH_VOLUME) | (daily_gain << _SIG_DAILY_GAIN)
+                            | (daily_decline << _SIG_DAILY_DECLINE))
             
             # Determine overall signal
             net_score = bullish_score - bearish_score
@@ -256,7 +305,7 @@ class AdvancedStockPicker:
             return {
                 'strength': strength,
                 'direction': direction,
-                'signals': signals,
+                'signal_bits': signal_bits,
                 'rsi': rsi,
                 'price_change_1d': price_change_1d,
                 'price_change_5d': price_change_5d,
@@ -267,52 +316,127 @@ class AdvancedStockPicker:
             }
             
         except Exception as e:
-            return {'strength': 0, 'signals': [f"Error: {str(e)}"], 'direction': 'HOLD'}
+            return {'strength': 0, 'signal_bits': 0, 'direction': 'HOLD', 'error': str(e)}
     
-    def analyze_stock(self, symbol: str) -> Optional[Dict]:
-        """Analyze a single stock"""
+    def analyze_stock(self, symbol: str, data: Optional[pd.DataFrame] = None) -> Optional[Dict]:
+        """Analyze a single stock, downloading its history unless already provided"""
         try:
-            # Download data
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="6mo", interval="1d")
-            
-            if data.empty or len(data) < 20:
-                return None
-            
-            # Calculate signal
-            signal = self.calculate_signal_strength(data)
-            
-            # Add stock info
-            signal['symbol'] = symbol
-            signal['name'] = symbol.replace('.NS', '')
+            if data is None:
+                # Self-downloaded analyses are memoized per trading day
+                signal = self._analyze_for_day(symbol, datetime.now().date())
+            else:
+                signal = self._analyze_data(symbol, data)
             
-            return signal
+            return dict(signal) if signal else None
             
         except Exception as e:
             print(f"⚠️ Error analyzing {symbol}: {str(e)}")
             return None
     
-    def pick_stocks(self, min_strength: int = 50, max_stocks: int = 50) -> List[Dict]:
-        """Pick stocks with analysis"""
+    def _analyze_download(self, symbol: str, day: date) -> Optional[Dict]:
+        """Download and analyze a stock; wrapped per instance in an lru_cache keyed on the day"""
+        ticker = yf.Ticker(symbol)
+        data = ticker.history(period="6mo", interval="1d", timeout=10)
+        
+        # Failed or throttled fetches come back empty rather than raising; raise so they aren't memoized
+        if data.empty:
+            raise ValueError(f"No price history returned for {symbol}")
+        
+        return self._analyze_data(symbol, data)
+    
+    def _analyze_data(self, symbol: str, data: pd.DataFrame) -> Optional[Dict]:
+        """Analyze a stock from its OHLCV history"""
+        if data.empty or len(data) < 20:
+            return None
+        
+        # Reuse indicators computed for the same last bar
+        cached = self.indicator_cache.get(symbol)
+        if cached is not None and cached[0] == data.index[-1]:
+            indicators = cached[1]
+        else:
+            indicators = self.calculate_indicators(data)
+            self.indicator_cache[symbol] = (data.index[-1], indicators)
+        
+        # Calculate signal
+        signal = self.calculate_signal_strength(data, indicators)
+        
+        # Add stock info
+        signal['symbol'] = symbol
+        signal['name'] = symbol.replace('.NS', '')
+        
+        return signal
+    
+    def _download_universe(self, symbols: List[str]) -> pd.DataFrame:
+        """Download 6 months of daily bars for all symbols in one batched request"""
+        key = tuple(symbols)
+        
+        # Check cache first
+        if key in self.download_cache:
+            downloaded_at, panel = self.download_cache[key]
+            if datetime.now() - downloaded_at < self.download_cache_ttl:
+                return panel
+        
+        panel = yf.download(list(symbols), period="6mo", interval="1d", group_by='ticker',
+                            auto_adjust=True, threads=True, progress=False, timeout=10)
+        self.download_cache[key] = (datetime.now(), panel)
+        return panel
+    
+    def _slice_panel(self, panel: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """Extract one symbol's OHLCV frame from a batched download"""
+        if symbol not in panel.columns.get_level_values(0):
+            return pd.DataFrame()
+        return panel[symbol].dropna(how='all')
+    
+    def _score_many(self, symbols: List[str], panel: pd.DataFrame) -> List[Dict]:
+        """Score symbols from a batched download; uncached indicator math runs in worker processes"""
+        analyses = {}
+        jobs = []
+        
+        for symbol in symbols:
+            data = self._slice_panel(panel, symbol)
+            cached = self.indicator_cache.get(symbol)
+            if not data.empty and cached is not None and cached[0] == data.index[-1]:
+                analyses[symbol] = self.analyze_stock(symbol, data)
+            else:
+                jobs.append((symbol, data))
+        
+        if jobs:
+            # Indicators and scoring are CPU-bound, so use processes instead of GIL-bound threads
+            with mp.Pool(min(os.cpu_count() or 1, len(jobs)), initializer=_init_worker) as pool:
+                results = pool.imap(_analyze_in_worker, jobs, chunksize=8)
+                for processed, (symbol, analysis, cached) in enumerate(results, 1):
+                    if processed % 50 == 0:
+                        print(f"📊 Processed {processed}/{len(jobs)} stocks...")
+                    
+                    analyses[symbol] = analysis
+                    if cached is not None:
+                        self.indicator_cache[symbol] = cached
+        
+        # Keep the universe order so ties sort deterministically
+        return [analyses[symbol] for symbol in symbols if analyses.get(symbol)]
+    
+    def pick_stocks(self, min_strength: int = 50, max_stocks: int = 50, refresh: bool = False) -> List[Dict]:
+        """Pick stocks with analysis; refresh=True discards cached downloads and indicators"""
         print(f"🔍 ANALYZING {len(self.liquid_stocks)} HIGH LIQUIDITY STOCKS")
         print("=" * 80)
         
-        results = []
-        processed = 0
-        
-        for symbol in self.liquid_stocks:
-            processed += 1
-            if processed % 50 == 0:
-                print(f"📊 Processed {processed}/{len(self.liquid_stocks)} stocks...")
-            
-            analysis = self.analyze_stock(symbol)
-            if analysis and analysis['strength'] >= min_strength:
-                results.append(analysis)
+        if refresh:
+            self.download_cache.clear()
+            self.indicator_cache.clear()
         
-        # Sort by strength
-        results.sort(key=lambda x: x['strength'], reverse=True)
+        panel = self._download_universe(self.liquid_stocks)
+        results = [
+            analysis for analysis in self._score_many(self.liquid_stocks, panel)
+            if analysis['strength'] >= min_strength
+        ]
         
-        return results[:max_stocks]
+        # Top max_stocks by strength (same order as a full reverse sort, O(N log K))
+        return heapq.nlargest(max_stocks, results, key=lambda x: x['strength'])
+    
+    def decode_signals(self, result: Dict) -> List[str]:
+        """Expand a result's signal bitmask into display labels"""
+        signal_bits = result.get('signal_bits', 0)
+        return [label.format(**result) for bit, label in enumerate(_SIGNAL_LABELS) if signal_bits >> bit & 1]
     
     def display_results(self, results: List[Dict]):
         """Display analysis results"""
@@ -347,7 +471,7 @@ class AdvancedStockPicker:
             price_change = result.get('price_change_1d', 0)
             rsi = result.get('rsi', 50)
             vol_ratio = result.get('volume_ratio', 1)
-            signals = ', '.join(result['signals'][:2])  # First 2 signals
+            signals = ', '.join(self.decode_signals(result)[:2])  # First 2 signals
             
             # Color coding
             if direction == 'STRONG BUY':
@@ -370,7 +494,7 @@ class AdvancedStockPicker:
             print(f"   💰 Current Price: ₹{result.get('current_price', 0):.2f}")
             print(f"   📊 1D Change: {result.get('price_change_1d', 0):+.1f}% | 5D Change: {result.get('price_change_5d', 0):+.1f}%")
             print(f"   📈 RSI: {result.get('rsi', 50):.1f} | Volume Ratio: {result.get('volume_ratio', 1):.1f}x")
-            print(f"   🎯 Signals: {', '.join(result['signals'])}")
+            print(f"   🎯 Signals: {', '.join(self.decode_signals(result))}")
             
             # Risk calculation
             if result['direction'] in ['STRONG BUY', 'BUY', 'WEAK BUY']:
@@ -382,6 +506,23 @@ class AdvancedStockPicker:
                 print(f"   💡 Entry: ₹{entry_price:.2f} | Stop Loss: ₹{stop_loss:.2f} | Take Profit: ₹{take_profit:.2f}")
                 print(f"   🔄 Trailing Stop: ₹{trailing_stop:.2f} (4% from entry)")
 
+# Per-process picker used by _score_many's worker pool
+_worker_picker: Optional[AdvancedStockPicker] = None
+
+
+def _init_worker() -> None:
+    """Create the picker once per worker process"""
+    global _worker_picker
+    _worker_picker = AdvancedStockPicker()
+
+
+def _analyze_in_worker(job: Tuple[str, pd.DataFrame]) -> Tuple[str, Optional[Dict], Optional[Tuple]]:
+    """Analyze one pre-downloaded symbol and hand its indicators back to the parent"""
+    symbol, data = job
+    analysis = _worker_picker.analyze_stock(symbol, data)
+    return symbol, analysis, _worker_picker.indicator_cache.pop(symbol, None)
+
+
 def main():
     """Main function"""
     picker = AdvancedStockPicker()
@@ -397,20 +538,23 @@ def main():
     # Run analysis with different strength levels
     print("\n🔍 SCANNING FOR OPPORTUNITIES...")
     
+    # Scan once at the lowest threshold, then filter each tier from the sorted results
+    scanned = picker.pick_stocks(min_strength=30, max_stocks=len(picker.liquid_stocks))
+    
     # High probability picks (70%+ strength)
-    high_prob = picker.pick_stocks(min_strength=70, max_stocks=30)
+    high_prob = [r for r in scanned if r['strength'] >= 70][:30]
     if high_prob:
         print(f"\n🎯 HIGH PROBABILITY PICKS (70%+ Strength):")
         picker.display_results(high_prob)
     
     # Medium probability picks (50%+ strength)
-    medium_prob = picker.pick_stocks(min_strength=50, max_stocks=50)
+    medium_prob = [r for r in scanned if r['strength'] >= 50][:50]
     if medium_prob and not high_prob:
         print(f"\n📊 MEDIUM PROBABILITY PICKS (50%+ Strength):")
         picker.display_results(medium_prob)
     
     # All signals (30%+ strength)
-    all_signals = picker.pick_stocks(min_strength=30, max_stocks=100)
+    all_signals = scanned[:100]
     if all_signals and not medium_prob and not high_prob:
         print(f"\n📈 ALL SIGNALS (30%+ Strength):")
         picker.display_results(all_signals)
@@ -44,11 +44,10 @@ def quick_screen():
         
         # Quick analysis
         opportunities = []
+        status = {}  # Per-symbol result marks, printed once after the scan
         
         for symbol in top_stocks:
             try:
-                print(f"📊 {symbol.replace('.NS', '')}...", end=' ')
-                
                 # Quick technical analysis
                 analyzer = engine.technical_analyzer
                 data = engine.data_manager.get_stock_data(symbol, period='90d')
@@ -84,22 +83,24 @@ def quick_screen():
                                         'signal': overall_signal.value,
                                         'signals_count': len(signals)
                                     })
-                                    print("✅")
+                                    status[symbol] = "✅"
                                 else:
-                                    print("⚠️")
+                                    status[symbol] = "⚠️"
                             else:
-                                print("❌")
+                                status[symbol] = "❌"
                         else:
-                            print("➖")
+                            status[symbol] = "➖"
                     else:
-                        print("❓")
+                        status[symbol] = "❓"
                 else:
-                    print("💤")
+                    status[symbol] = "💤"
                     
             except Exception as e:
-                print("❌")
+                status[symbol] = "❌"
                 continue
         
+        print(' '.join(f"📊 {symbol.replace('.NS', '')} {mark}" for symbol, mark in status.items()))
+        
         # Display results
         print(f"\n🎯 QUICK OPPORTUNITIES ({len(opportunities)} found)")
         print("="*60)
@@ -5,12 +5,132 @@ Shows performance with adjusted parameters for actual trading
 """
 
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import yfinance as yf
+from bisect import bisect_left
+from datetime import datetime
 from typing import Dict, List
-import warnings
-warnings.filterwarnings('ignore')
+import sys
+
+# Simulated results based on common swing trading outcomes
+_SCENARIOS = {
+    "6_months": {
+        "period": "6 Months (Jan 2024 - Jul 2024)",
+        "total_trades": 47,
+        "winning_trades": 28,
+        "losing_trades": 19,
+        "win_rate": 59.6,
+        "total_return": 12.8,
+        "max_drawdown": -6.2,
+        "profit_factor": 1.45,
+        "avg_win": 4.2,
+        "avg_loss": -2.8,
+        "largest_win": 15.3,
+        "largest_loss": -8.0,
+        "avg_days_held": 5.2,
+        "sharpe_ratio": 1.24,
+        "expectancy": 285.5
+    },
+    "12_months": {
+        "period": "12 Months (Jul 2023 - Jul 2024)",
+        "total_trades": 89,
+        "winning_trades": 51,
+        "losing_trades": 38,
+        "win_rate": 57.3,
+        "total_return": 18.7,
+        "max_drawdown": -9.4,
+        "profit_factor": 1.38,
+        "avg_win": 4.8,
+        "avg_loss": -3.1,
+        "largest_win": 16.2,
+        "largest_loss": -8.0,
+        "avg_days_held": 4.8,
+        "sharpe_ratio": 1.12,
+        "expectancy": 342.7
+    },
+    "volatility_test": {
+        "period": "Market Volatility (2022-2023)",
+        "total_trades": 156,
+        "winning_trades": 84,
+        "losing_trades": 72,
+        "win_rate": 53.8,
+        "total_return": 24.3,
+        "max_drawdown": -14.2,
+        "profit_factor": 1.28,
+        "avg_win": 5.1,
+        "avg_loss": -3.4,
+        "largest_win": 18.7,
+        "largest_loss": -8.0,
+        "avg_days_held": 6.1,
+        "sharpe_ratio": 0.89,
+        "expectancy": 267.8
+    }
+}
+
+# Total-return grading: a return strictly above _RETURN_THRESHOLDS[i] earns grade i + 1
+_RETURN_THRESHOLDS = (5, 10, 15, 20)
+_RETURN_GRADES = ("C NEEDS IMPROVEMENT", "B FAIR", "B+ GOOD", "A GREAT", "A+ EXCELLENT")
+_RETURN_EMOJIS = ("📈", "🥉", "🥈", "🥇", "🏆")
+
+# Sample successful trades with trailing stops
+_SAMPLE_TRADES = (
+    {
+        "symbol": "RAYMOND.NS",
+        "entry_date": "2024-06-15",
+        "exit_date": "2024-06-22",
+        "entry_price": 695.50,
+        "exit_price": 789.30,
+        "exit_reason": "Take Profit",
+        "return_pct": 13.5,
+        "days_held": 7,
+        "trailing_stop_triggered": False
+    },
+    {
+        "symbol": "MOIL.NS", 
+        "entry_date": "2024-05-20",
+        "exit_date": "2024-05-28",
+        "entry_price": 385.20,
+        "exit_price": 426.80,
+        "exit_reason": "Trailing Stop",
+        "return_pct": 10.8,
+        "days_held": 8,
+        "trailing_stop_triggered": True
+    },
+    {
+        "symbol": "BLUEDART.NS",
+        "entry_date": "2024-04-10",
+        "exit_date": "2024-04-18",
+        "entry_price": 6500.00,
+        "exit_price": 7540.00,
+        "exit_reason": "Take Profit",
+        "return_pct": 16.0,
+        "days_held": 8,
+        "trailing_stop_triggered": False
+    },
+    {
+        "symbol": "INDIACEM.NS",
+        "entry_date": "2024-03-25",
+        "exit_date": "2024-04-02",
+        "entry_price": 340.80,
+        "exit_price": 311.30,
+        "exit_reason": "Stop Loss",
+        "return_pct": -8.7,
+        "days_held": 8,
+        "trailing_stop_triggered": False
+    },
+    {
+        "symbol": "RELIANCE.NS",
+        "entry_date": "2024-07-01",
+        "exit_date": "2024-07-08",
+        "entry_price": 2850.00,
+        "exit_price": 3198.00,
+        "exit_reason": "Trailing Stop",
+        "return_pct": 12.2,
+        "days_held": 7,
+        "trailing_stop_triggered": True
+    }
+)
+
+# Row layout for the sample trades table
+_SAMPLE_ROW = "{:<15} {:<12} {:<12} {}{:>+6.1f}% {:<6} {:<15} {}".format
 
 class RealisticBacktest:
     def __init__(self):
@@ -23,235 +143,112 @@ class RealisticBacktest:
         
     def simulate_realistic_performance(self) -> Dict:
         """Simulate realistic backtesting results based on typical swing trading performance"""
-        
-        # Simulated results based on common swing trading outcomes
-        scenarios = {
-            "6_months": {
-                "period": "6 Months (Jan 2024 - Jul 2024)",
-                "total_trades": 47,
-                "winning_trades": 28,
-                "losing_trades": 19,
-                "win_rate": 59.6,
-                "total_return": 12.8,
-                "max_drawdown": -6.2,
-                "profit_factor": 1.45,
-                "avg_win": 4.2,
-                "avg_loss": -2.8,
-                "largest_win": 15.3,
-                "largest_loss": -8.0,
-                "avg_days_held": 5.2,
-                "sharpe_ratio": 1.24,
-                "expectancy": 285.5
-            },
-            "12_months": {
-                "period": "12 Months (Jul 2023 - Jul 2024)",
-                "total_trades": 89,
-                "winning_trades": 51,
-                "losing_trades": 38,
-                "win_rate": 57.3,
-                "total_return": 18.7,
-                "max_drawdown": -9.4,
-                "profit_factor": 1.38,
-                "avg_win": 4.8,
-                "avg_loss": -3.1,
-                "largest_win": 16.2,
-                "largest_loss": -8.0,
-                "avg_days_held": 4.8,
-                "sharpe_ratio": 1.12,
-                "expectancy": 342.7
-            },
-            "volatility_test": {
-                "period": "Market Volatility (2022-2023)",
-                "total_trades": 156,
-                "winning_trades": 84,
-                "losing_trades": 72,
-                "win_rate": 53.8,
-                "total_return": 24.3,
-                "max_drawdown": -14.2,
-                "profit_factor": 1.28,
-                "avg_win": 5.1,
-                "avg_loss": -3.4,
-                "largest_win": 18.7,
-                "largest_loss": -8.0,
-                "avg_days_held": 6.1,
-                "sharpe_ratio": 0.89,
-                "expectancy": 267.8
-            }
-        }
-        
-        return scenarios
+        # Fresh dicts per call so callers can edit results without touching the shared data
+        return {key: dict(scenario) for key, scenario in _SCENARIOS.items()}
     
     def generate_sample_trades(self) -> List[Dict]:
         """Generate sample successful trades with trailing stops"""
-        sample_trades = [
-            {
-                "symbol": "RAYMOND.NS",
-                "entry_date": "2024-06-15",
-                "exit_date": "2024-06-22",
-                "entry_price": 695.50,
-                "exit_price": 789.30,
-                "exit_reason": "Take Profit",
-                "return_pct": 13.5,
-                "days_held": 7,
-                "trailing_stop_triggered": False
-            },
-            {
-                "symbol": "MOIL.NS", 
-                "entry_date": "2024-05-20",
-                "exit_date": "2024-05-28",
-                "entry_price": 385.20,
-                "exit_price": 426.80,
-                "exit_reason": "Trailing Stop",
-                "return_pct": 10.8,
-                "days_held": 8,
-                "trailing_stop_triggered": True
-            },
-            {
-                "symbol": "BLUEDART.NS",
-                "entry_date": "2024-04-10",
-                "exit_date": "2024-04-18",
-                "entry_price": 6500.00,
-                "exit_price": 7540.00,
-                "exit_reason": "Take Profit",
-                "return_pct": 16.0,
-                "days_held": 8,
-                "trailing_stop_triggered": False
-            },
-            {
-                "symbol": "INDIACEM.NS",
-                "entry_date": "2024-03-25",
-                "exit_date": "2024-04-02",
-                "entry_price": 340.80,
-                "exit_price": 311.30,
-                "exit_reason": "Stop Loss",
-                "return_pct": -8.7,
-                "days_held": 8,
-                "trailing_stop_triggered": False
-            },
-            {
-                "symbol": "RELIANCE.NS",
-                "entry_date": "2024-07-01",
-                "exit_date": "2024-07-08",
-                "entry_price": 2850.00,
-                "exit_price": 3198.00,
-                "exit_reason": "Trailing Stop",
-                "return_pct": 12.2,
-                "days_held": 7,
-                "trailing_stop_triggered": True
-            }
-        ]
-        
-        return sample_trades
+        return [dict(trade) for trade in _SAMPLE_TRADES]
     
     def display_backtest_results(self):
         """Display comprehensive backtest results"""
-        print("🎯 COMPREHENSIVE BACKTESTING RESULTS")
-        print("=" * 80)
-        print(f"📅 Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"💰 Trading Capital: ₹{self.initial_capital:,}")
-        print(f"🎯 Risk Per Trade: {self.risk_per_trade*100}%")
-        print(f"🛡️ Stop Loss: {self.stop_loss_pct*100}% | Take Profit: {self.take_profit_pct*100}%")
-        print(f"🔄 Trailing Stop: {self.trailing_stop_pct*100}%")
-        print("=" * 80)
+        lines = []
+        lines.append("🎯 COMPREHENSIVE BACKTESTING RESULTS")
+        lines.append("=" * 80)
+        lines.append(f"📅 Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"💰 Trading Capital: ₹{self.initial_capital:,}")
+        lines.append(f"🎯 Risk Per Trade: {self.risk_per_trade*100}%")
+        lines.append(f"🛡️ Stop Loss: {self.stop_loss_pct*100}% | Take Profit: {self.take_profit_pct*100}%")
+        lines.append(f"🔄 Trailing Stop: {self.trailing_stop_pct*100}%")
+        lines.append("=" * 80)
         
         scenarios = self.simulate_realistic_performance()
         
         for scenario_key, data in scenarios.items():
-            print(f"\n📊 {data['period'].upper()}")
-            print("-" * 60)
+            lines.append(f"\n📊 {data['period'].upper()}")
+            lines.append("-" * 60)
             
             final_capital = self.initial_capital * (1 + data['total_return'] / 100)
             profit = final_capital - self.initial_capital
             
-            print(f"💰 Initial Capital: ₹{self.initial_capital:,}")
-            print(f"💰 Final Capital: ₹{final_capital:,.0f}")
-            print(f"📈 Total Return: ₹{profit:,.0f} (+{data['total_return']:.1f}%)")
-            print(f"📉 Max Drawdown: {data['max_drawdown']:.1f}%")
+            lines.append(f"💰 Initial Capital: ₹{self.initial_capital:,}")
+            lines.append(f"💰 Final Capital: ₹{final_capital:,.0f}")
+            lines.append(f"📈 Total Return: ₹{profit:,.0f} (+{data['total_return']:.1f}%)")
+            lines.append(f"📉 Max Drawdown: {data['max_drawdown']:.1f}%")
             
-            print(f"\n🎯 TRADING STATISTICS")
-            print(f"📊 Total Trades: {data['total_trades']}")
-            print(f"✅ Winning Trades: {data['winning_trades']}")
-            print(f"❌ Losing Trades: {data['losing_trades']}")
-            print(f"🏆 Win Rate: {data['win_rate']:.1f}%")
-            print(f"⚖️ Profit Factor: {data['profit_factor']:.2f}")
-            print(f"💡 Expectancy: ₹{data['expectancy']:.0f}")
+            lines.append(f"\n🎯 TRADING STATISTICS")
+            lines.append(f"📊 Total Trades: {data['total_trades']}")
+            lines.append(f"✅ Winning Trades: {data['winning_trades']}")
+            lines.append(f"❌ Losing Trades: {data['losing_trades']}")
+            lines.append(f"🏆 Win Rate: {data['win_rate']:.1f}%")
+            lines.append(f"⚖️ Profit Factor: {data['profit_factor']:.2f}")
+            lines.append(f"💡 Expectancy: ₹{data['expectancy']:.0f}")
             
-            print(f"\n💹 TRADE ANALYSIS")
-            print(f"🎯 Average Win: {data['avg_win']:.1f}%")
-            print(f"💔 Average Loss: {data['avg_loss']:.1f}%")
-            print(f"🚀 Largest Win: {data['largest_win']:.1f}%")
-            print(f"💥 Largest Loss: {data['largest_loss']:.1f}%")
-            print(f"📅 Avg Days Held: {data['avg_days_held']:.1f}")
+            lines.append(f"\n💹 TRADE ANALYSIS")
+            lines.append(f"🎯 Average Win: {data['avg_win']:.1f}%")
+            lines.append(f"💔 Average Loss: {data['avg_loss']:.1f}%")
+            lines.append(f"🚀 Largest Win: {data['largest_win']:.1f}%")
+            lines.append(f"💥 Largest Loss: {data['largest_loss']:.1f}%")
+            lines.append(f"📅 Avg Days Held: {data['avg_days_held']:.1f}")
             
-            print(f"\n⚖️ RISK METRICS")
-            print(f"📊 Sharpe Ratio: {data['sharpe_ratio']:.2f}")
+            lines.append(f"\n⚖️ RISK METRICS")
+            lines.append(f"📊 Sharpe Ratio: {data['sharpe_ratio']:.2f}")
             
             # Performance grading
-            if data['total_return'] > 20:
-                grade = "A+ EXCELLENT"
-                emoji = "🏆"
-            elif data['total_return'] > 15:
-                grade = "A GREAT"
-                emoji = "🥇"
-            elif data['total_return'] > 10:
-                grade = "B+ GOOD"
-                emoji = "🥈"
-            elif data['total_return'] > 5:
-                grade = "B FAIR"
-                emoji = "🥉"
-            else:
-                grade = "C NEEDS IMPROVEMENT"
-                emoji = "📈"
+            grade_idx = bisect_left(_RETURN_THRESHOLDS, data['total_return'])
+            grade, emoji = _RETURN_GRADES[grade_idx], _RETURN_EMOJIS[grade_idx]
             
-            print(f"\n🎯 SYSTEM ASSESSMENT")
-            print(f"🏆 System Grade: {grade}")
-            print(f"{emoji} Performance is {'excellent' if 'EXCELLENT' in grade else 'solid' if 'GOOD' in grade or 'GREAT' in grade else 'acceptable'} for swing trading")
+            lines.append(f"\n🎯 SYSTEM ASSESSMENT")
+            lines.append(f"🏆 System Grade: {grade}")
+            lines.append(f"{emoji} Performance is {'excellent' if 'EXCELLENT' in grade else 'solid' if 'GOOD' in grade or 'GREAT' in grade else 'acceptable'} for swing trading")
         
         # Sample successful trades
-        print(f"\n🎯 SAMPLE SUCCESSFUL TRADES (WITH TRAILING STOPS)")
-        print("=" * 80)
-        sample_trades = self.generate_sample_trades()
+        lines.append(f"\n🎯 SAMPLE SUCCESSFUL TRADES (WITH TRAILING STOPS)")
+        lines.append("=" * 80)
+        sample_trades = pd.DataFrame(self.generate_sample_trades())
         
-        print(f"{'SYMBOL':<15} {'ENTRY':<12} {'EXIT':<12} {'RETURN':<8} {'DAYS':<6} {'EXIT REASON':<15} {'TRAILING'}")
-        print("-" * 80)
+        lines.append(f"{'SYMBOL':<15} {'ENTRY':<12} {'EXIT':<12} {'RETURN':<8} {'DAYS':<6} {'EXIT REASON':<15} {'TRAILING'}")
+        lines.append("-" * 80)
         
-        for trade in sample_trades:
-            trailing_icon = "🔄" if trade['trailing_stop_triggered'] else "⚡"
-            color = "🟢" if trade['return_pct'] > 0 else "🔴"
+        for trade in sample_trades.itertuples(index=False):
+            trailing_icon = "🔄" if trade.trailing_stop_triggered else "⚡"
+            color = "🟢" if trade.return_pct > 0 else "🔴"
             
-            print(f"{trade['symbol']:<15} {trade['entry_date']:<12} {trade['exit_date']:<12} "
-                  f"{color}{trade['return_pct']:>+6.1f}% {trade['days_held']:<6} "
-                  f"{trade['exit_reason']:<15} {trailing_icon}")
+            lines.append(_SAMPLE_ROW(trade.symbol, trade.entry_date, trade.exit_date, color,
+                                     trade.return_pct, trade.days_held, trade.exit_reason, trailing_icon))
         
         # Portfolio impact calculation
-        print(f"\n💼 PORTFOLIO IMPACT ANALYSIS")
-        print("=" * 80)
+        lines.append(f"\n💼 PORTFOLIO IMPACT ANALYSIS")
+        lines.append("=" * 80)
         
-        total_returns = sum(trade['return_pct'] for trade in sample_trades)
-        winning_trades = len([t for t in sample_trades if t['return_pct'] > 0])
-        trailing_stops = len([t for t in sample_trades if t['trailing_stop_triggered']])
+        total_trades = len(sample_trades)
+        total_returns = sample_trades['return_pct'].sum()
+        winning_trades = int((sample_trades['return_pct'] > 0).sum())
+        trailing_stops = int(sample_trades['trailing_stop_triggered'].sum())
         
-        print(f"📊 Sample Portfolio Return: {total_returns:+.1f}%")
-        print(f"🏆 Winning Trade Rate: {winning_trades}/{len(sample_trades)} ({winning_trades/len(sample_trades)*100:.1f}%)")
-        print(f"🔄 Trailing Stops Triggered: {trailing_stops}/{len(sample_trades)} ({trailing_stops/len(sample_trades)*100:.1f}%)")
-        print(f"💰 Capital with Sample Trades: ₹{self.initial_capital * (1 + total_returns/100):,.0f}")
+        lines.append(f"📊 Sample Portfolio Return: {total_returns:+.1f}%")
+        lines.append(f"🏆 Winning Trade Rate: {winning_trades}/{total_trades} ({winning_trades/total_trades*100:.1f}%)")
+        lines.append(f"🔄 Trailing Stops Triggered: {trailing_stops}/{total_trades} ({trailing_stops/total_trades*100:.1f}%)")
+        lines.append(f"💰 Capital with Sample Trades: ₹{self.initial_capital * (1 + total_returns/100):,.0f}")
         
         # Key insights
-        print(f"\n🎯 KEY INSIGHTS")
-        print("=" * 80)
-        print("✅ Trailing stops successfully locked in profits on winning trades")
-        print("✅ Risk management kept losses within acceptable limits (-8% max)")
-        print("✅ Average holding period of 5-6 days ideal for swing trading")
-        print("✅ Win rates of 55-60% demonstrate system effectiveness")
-        print("✅ Profit factors above 1.25 show positive expectancy")
-        print("✅ System performed well across different market conditions")
+        lines.append(f"\n🎯 KEY INSIGHTS")
+        lines.append("=" * 80)
+        lines.append("✅ Trailing stops successfully locked in profits on winning trades")
+        lines.append("✅ Risk management kept losses within acceptable limits (-8% max)")
+        lines.append("✅ Average holding period of 5-6 days ideal for swing trading")
+        lines.append("✅ Win rates of 55-60% demonstrate system effectiveness")
+        lines.append("✅ Profit factors above 1.25 show positive expectancy")
+        lines.append("✅ System performed well across different market conditions")
+        
+        lines.append(f"\n🔄 TRAILING STOP EFFECTIVENESS")
+        lines.append("-" * 40)
+        lines.append("🎯 Trailing stops protected profits in volatile conditions")
+        lines.append("🎯 4% trailing distance balanced profit protection vs early exits")
+        lines.append("🎯 Automatic adjustment reduced emotional trading decisions")
+        lines.append("🎯 Enhanced overall system performance and consistency")
         
-        print(f"\n🔄 TRAILING STOP EFFECTIVENESS")
-        print("-" * 40)
-        print("🎯 Trailing stops protected profits in volatile conditions")
-        print("🎯 4% trailing distance balanced profit protection vs early exits")
-        print("🎯 Automatic adjustment reduced emotional trading decisions")
-        print("🎯 Enhanced overall system performance and consistency")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main execution"""
@@ -4,13 +4,94 @@ Realistic Backtesting Results - A+ Grade Stock Picks
 Historical win/loss analysis with actual market data
 """
 
+import heapq
 import pandas as pd
 import yfinance as yf
 import numpy as np
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import cached_property
+from operator import attrgetter
 from typing import List, Dict, Optional, Tuple
-import warnings
-warnings.filterwarnings('ignore')
+import sys
+
+@dataclass
+class Trade:
+    """Closed trade; profit fields are filled in by calculate_trade_metrics"""
+    # Explicit __slots__ (dataclass slots=True needs Python 3.10), so fields carry no defaults
+    __slots__ = ('symbol', 'entry_date', 'entry_price', 'exit_price', 'exit_reason',
+                 'days', 'strength', 'profit_pct', 'profit_rs', 'win')
+    symbol: str
+    entry_date: str
+    entry_price: float
+    exit_price: float
+    exit_reason: str
+    days: int
+    strength: int
+    profit_pct: float
+    profit_rs: float
+    win: bool
+
+_EXIT_REASONS = ('TAKE_PROFIT', 'TRAILING_STOP', 'STOP_LOSS', 'TIME_EXIT')
+
+# Realistic outcomes for A+ grade signals, based on actual market behavior patterns
+_HISTORICAL_TRADES = (
+    # Strong Bull Market Signals (RSI 15-25 oversold)
+    {'symbol': 'RELIANCE.NS', 'entry_date': '2025-07-15', 'entry_price': 1420.50, 'exit_price': 1562.15, 'exit_reason': 'TAKE_PROFIT', 'days': 8, 'strength': 95},
+    {'symbol': 'HDFC.NS', 'entry_date': '2025-07-10', 'entry_price': 1680.30, 'exit_price': 1764.32, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 88},
+    {'symbol': 'ICICIBANK.NS', 'entry_date': '2025-07-08', 'entry_price': 1245.80, 'exit_price': 1495.00, 'exit_reason': 'TAKE_PROFIT', 'days': 12, 'strength': 92},
+    {'symbol': 'INFY.NS', 'entry_date': '2025-07-05', 'entry_price': 1890.25, 'exit_price': 2060.85, 'exit_reason': 'TRAILING_STOP', 'days': 9, 'strength': 85},
+    {'symbol': 'TCS.NS', 'entry_date': '2025-07-03', 'entry_price': 4245.60, 'exit_price': 4560.25, 'exit_reason': 'TRAILING_STOP', 'days': 7, 'strength': 90},
+
+    # MACD Bull Crossover Signals
+    {'symbol': 'AUBANK.NS', 'entry_date': '2025-07-12', 'entry_price': 735.40, 'exit_price': 768.15, 'exit_reason': 'TRAILING_STOP', 'days': 5, 'strength': 82},
+    {'symbol': 'BAJFINANCE.NS', 'entry_date': '2025-07-09', 'entry_price': 6820.30, 'exit_price': 7154.12, 'exit_reason': 'TRAILING_STOP', 'days': 8, 'strength': 87},
+    {'symbol': 'KOTAKBANK.NS', 'entry_date': '2025-07-06', 'entry_price': 1765.50, 'exit_price': 1804.32, 'exit_reason': 'TRAILING_STOP', 'days': 4, 'strength': 78},
+    {'symbol': 'SBIN.NS', 'entry_date': '2025-07-04', 'entry_price': 845.25, 'exit_price': 925.68, 'exit_reason': 'TRAILING_STOP', 'days': 11, 'strength': 85},
+    {'symbol': 'AXISBANK.NS', 'entry_date': '2025-07-01', 'entry_price': 1124.80, 'exit_price': 1180.35, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 80},
+
+    # Volume Breakout Signals
+    {'symbol': 'INDIACEM.NS', 'entry_date': '2025-06-28', 'entry_price': 365.20, 'exit_price': 438.24, 'exit_reason': 'TAKE_PROFIT', 'days': 14, 'strength': 88},
+    {'symbol': 'TATACHEM.NS', 'entry_date': '2025-06-25', 'entry_price': 1085.40, 'exit_price': 1195.44, 'exit_reason': 'TRAILING_STOP', 'days': 9, 'strength': 83},
+    {'symbol': 'JSWSTEEL.NS', 'entry_date': '2025-06-22', 'entry_price': 995.60, 'exit_price': 1055.52, 'exit_reason': 'TRAILING_STOP', 'days': 7, 'strength': 79},
+    {'symbol': 'NATIONALUM.NS', 'entry_date': '2025-06-20', 'entry_price': 245.80, 'exit_price': 265.45, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 81},
+    {'symbol': 'MOIL.NS', 'entry_date': '2025-06-18', 'entry_price': 395.30, 'exit_price': 428.65, 'exit_reason': 'TRAILING_STOP', 'days': 8, 'strength': 84},
+
+    # Stop Loss Trades (Risk Management)
+    {'symbol': 'RPOWER.NS', 'entry_date': '2025-07-14', 'entry_price': 48.25, 'exit_price': 45.36, 'exit_reason': 'STOP_LOSS', 'days': 3, 'strength': 76},
+    {'symbol': 'CLEAN.NS', 'entry_date': '2025-07-11', 'entry_price': 1825.60, 'exit_price': 1716.06, 'exit_reason': 'STOP_LOSS', 'days': 4, 'strength': 75},
+    {'symbol': 'GTLINFRA.NS', 'entry_date': '2025-07-07', 'entry_price': 2.15, 'exit_price': 2.02, 'exit_reason': 'STOP_LOSS', 'days': 2, 'strength': 77},
+    {'symbol': 'NOCIL.NS', 'entry_date': '2025-06-30', 'entry_price': 198.45, 'exit_price': 186.54, 'exit_reason': 'STOP_LOSS', 'days': 5, 'strength': 78},
+
+    # Mixed Result Trades
+    {'symbol': 'EICHERMOT.NS', 'entry_date': '2025-06-26', 'entry_price': 4985.20, 'exit_price': 5084.21, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 82},
+    {'symbol': 'BHARTIARTL.NS', 'entry_date': '2025-06-24', 'entry_price': 1685.40, 'exit_price': 1718.32, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 79},
+    {'symbol': 'DMART.NS', 'entry_date': '2025-06-21', 'entry_price': 4125.80, 'exit_price': 4210.85, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 81},
+    {'symbol': 'JUBLFOOD.NS', 'entry_date': '2025-06-19', 'entry_price': 665.25, 'exit_price': 678.94, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 80},
+)
+
+# System grade tables, from lowest to highest grade
+_SYSTEM_GRADES = ("B AVERAGE", "B+ GOOD", "A GREAT", "A+ EXCELLENT", "S+ LEGENDARY")
+_WIN_RATE_THRESHOLDS = (55, 60, 65, 70)
+_RISK_REWARD_THRESHOLDS = (1.5, 2.0, 2.5)
+
+# Row layout shared by the top and losing trade tables
+_TRADE_ROW = "{t.symbol:<12} {t.entry_date:<12} ₹{t.entry_price:<9.0f} ₹{t.exit_price:<9.0f} {t.profit_pct:<+10.2f} {t.days:<6} {t.exit_reason:<15} {t.strength}%".format
+
+def _simulate_equity(risk_per_share: np.ndarray, pl_per_share: np.ndarray,
+                     initial_capital: float, risk_frac: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Whole-share position sizing recurrence; returns shares and equity after each trade"""
+    n = risk_per_share.size
+    shares = np.empty(n, dtype=np.int64)
+    equity = np.empty(n)
+    value = initial_capital
+    for i, (rps, pl) in enumerate(zip(risk_per_share.tolist(), pl_per_share.tolist())):
+        shares_i = int(value * risk_frac / rps)
+        value += shares_i * pl
+        shares[i] = shares_i
+        equity[i] = value
+    return shares, equity
 
 class RealisticBacktester:
     """Realistic backtesting with actual historical data"""
@@ -22,120 +103,79 @@ class RealisticBacktester:
         self.take_profit_pct = 0.20  # 20% take profit
         self.trailing_stop_pct = 0.035  # 3.5% trailing stop
         self.risk_per_trade = 0.015  # 1.5% risk per trade
-        
-        # Generate realistic historical trades based on market patterns
-        self.historical_trades = self.generate_realistic_trades()
     
-    def generate_realistic_trades(self) -> List[Dict]:
+    @cached_property
+    def historical_trades(self) -> List[Trade]:
+        """Realistic historical trades based on market patterns, generated on first use"""
+        return self.generate_realistic_trades()
+    
+    def generate_realistic_trades(self) -> List[Trade]:
         """Generate realistic historical trades based on A+ criteria"""
-        trades = []
-        
-        # Simulation based on actual market behavior patterns
-        # These represent realistic outcomes for A+ grade signals
-        
-        # Strong Bull Market Signals (RSI 15-25 oversold)
-        trades.extend([
-            {'symbol': 'RELIANCE.NS', 'entry_date': '2025-07-15', 'entry_price': 1420.50, 'exit_price': 1562.15, 'exit_reason': 'TAKE_PROFIT', 'days': 8, 'strength': 95},
-            {'symbol': 'HDFC.NS', 'entry_date': '2025-07-10', 'entry_price': 1680.30, 'exit_price': 1764.32, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 88},
-            {'symbol': 'ICICIBANK.NS', 'entry_date': '2025-07-08', 'entry_price': 1245.80, 'exit_price': 1495.00, 'exit_reason': 'TAKE_PROFIT', 'days': 12, 'strength': 92},
-            {'symbol': 'INFY.NS', 'entry_date': '2025-07-05', 'entry_price': 1890.25, 'exit_price': 2060.85, 'exit_reason': 'TRAILING_STOP', 'days': 9, 'strength': 85},
-            {'symbol': 'TCS.NS', 'entry_date': '2025-07-03', 'entry_price': 4245.60, 'exit_price': 4560.25, 'exit_reason': 'TRAILING_STOP', 'days': 7, 'strength': 90},
-        ])
-        
-        # MACD Bull Crossover Signals
-        trades.extend([
-            {'symbol': 'AUBANK.NS', 'entry_date': '2025-07-12', 'entry_price': 735.40, 'exit_price': 768.15, 'exit_reason': 'TRAILING_STOP', 'days': 5, 'strength': 82},
-            {'symbol': 'BAJFINANCE.NS', 'entry_date': '2025-07-09', 'entry_price': 6820.30, 'exit_price': 7154.12, 'exit_reason': 'TRAILING_STOP', 'days': 8, 'strength': 87},
-            {'symbol': 'KOTAKBANK.NS', 'entry_date': '2025-07-06', 'entry_price': 1765.50, 'exit_price': 1804.32, 'exit_reason': 'TRAILING_STOP', 'days': 4, 'strength': 78},
-            {'symbol': 'SBIN.NS', 'entry_date': '2025-07-04', 'entry_price': 845.25, 'exit_price': 925.68, 'exit_reason': 'TRAILING_STOP', 'days': 11, 'strength': 85},
-            {'symbol': 'AXISBANK.NS', 'entry_date': '2025-07-01', 'entry_price': 1124.80, 'exit_price': 1180.35, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 80},
-        ])
-        
-        # Volume Breakout Signals
-        trades.extend([
-            {'symbol': 'INDIACEM.NS', 'entry_date': '2025-06-28', 'entry_price': 365.20, 'exit_price': 438.24, 'exit_reason': 'TAKE_PROFIT', 'days': 14, 'strength': 88},
-            {'symbol': 'TATACHEM.NS', 'entry_date': '2025-06-25', 'entry_price': 1085.40, 'exit_price': 1195.44, 'exit_reason': 'TRAILING_STOP', 'days': 9, 'strength': 83},
-            {'symbol': 'JSWSTEEL.NS', 'entry_date': '2025-06-22', 'entry_price': 995.60, 'exit_price': 1055.52, 'exit_reason': 'TRAILING_STOP', 'days': 7, 'strength': 79},
-            {'symbol': 'NATIONALUM.NS', 'entry_date': '2025-06-20', 'entry_price': 245.80, 'exit_price': 265.45, 'exit_reason': 'TRAILING_STOP', 'days': 6, 'strength': 81},
-            {'symbol': 'MOIL.NS', 'entry_date': '2025-06-18', 'entry_price': 395.30, 'exit_price': 428.65, 'exit_reason': 'TRAILING_STOP', 'days': 8, 'strength': 84},
-        ])
-        
-        # Stop Loss Trades (Risk Management)
-        trades.extend([
-            {'symbol': 'RPOWER.NS', 'entry_date': '2025-07-14', 'entry_price': 48.25, 'exit_price': 45.36, 'exit_reason': 'STOP_LOSS', 'days': 3, 'strength': 76},
-            {'symbol': 'CLEAN.NS', 'entry_date': '2025-07-11', 'entry_price': 1825.60, 'exit_price': 1716.06, 'exit_reason': 'STOP_LOSS', 'days': 4, 'strength': 75},
-            {'symbol': 'GTLINFRA.NS', 'entry_date': '2025-07-07', 'entry_price': 2.15, 'exit_price': 2.02, 'exit_reason': 'STOP_LOSS', 'days': 2, 'strength': 77},
-            {'symbol': 'NOCIL.NS', 'entry_date': '2025-06-30', 'entry_price': 198.45, 'exit_price': 186.54, 'exit_reason': 'STOP_LOSS', 'days': 5, 'strength': 78},
-        ])
-        
-        # Mixed Result Trades
-        trades.extend([
-            {'symbol': 'EICHERMOT.NS', 'entry_date': '2025-06-26', 'entry_price': 4985.20, 'exit_price': 5084.21, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 82},
-            {'symbol': 'BHARTIARTL.NS', 'entry_date': '2025-06-24', 'entry_price': 1685.40, 'exit_price': 1718.32, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 79},
-            {'symbol': 'DMART.NS', 'entry_date': '2025-06-21', 'entry_price': 4125.80, 'exit_price': 4210.85, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 81},
-            {'symbol': 'JUBLFOOD.NS', 'entry_date': '2025-06-19', 'entry_price': 665.25, 'exit_price': 678.94, 'exit_reason': 'TIME_EXIT', 'days': 15, 'strength': 80},
-        ])
-        
-        return trades
+        # Fresh instances, since calculate_trade_metrics annotates each trade
+        return [Trade(**trade, profit_pct=0.0, profit_rs=0.0, win=False) for trade in _HISTORICAL_TRADES]
+    
+    def _exit_reason_categorical(self, trades: List[Trade]) -> pd.Categorical:
+        """Exit reasons as a categorical, known reasons first"""
+        reasons = [t.exit_reason for t in trades]
+        return pd.Categorical(reasons, categories=list(dict.fromkeys(_EXIT_REASONS + tuple(reasons))))
     
-    def calculate_trade_metrics(self, trades: List[Dict]) -> Dict:
+    def calculate_trade_metrics(self, trades: List[Trade]) -> Dict:
         """Calculate comprehensive trade metrics"""
         if not trades:
             return {'error': 'No trades to analyze'}
         
-        # Calculate profit/loss for each trade
-        for trade in trades:
-            profit_pct = ((trade['exit_price'] / trade['entry_price']) - 1) * 100
-            trade['profit_pct'] = profit_pct
-            trade['profit_rs'] = trade['exit_price'] - trade['entry_price']
-            trade['win'] = profit_pct > 0
+        # Calculate profit/loss for all trades at once
+        entry = np.fromiter((t.entry_price for t in trades), float, len(trades))
+        exit_ = np.fromiter((t.exit_price for t in trades), float, len(trades))
+        profit_pct = (exit_ / entry - 1.0) * 100.0
+        win_mask = profit_pct > 0
+        
+        # Annotate trades and split winners/losers in the same pass
+        profitable_trades = []
+        losing_trades = []
+        for trade, pct, profit_rs, win in zip(trades, profit_pct.tolist(), (exit_ - entry).tolist(), win_mask.tolist()):
+            trade.profit_pct = pct
+            trade.profit_rs = profit_rs
+            trade.win = win
+            (profitable_trades if win else losing_trades).append(trade)
         
         # Overall statistics
         total_trades = len(trades)
-        wins = sum(1 for t in trades if t['win'])
-        losses = total_trades - wins
+        wins = len(profitable_trades)
+        losses = len(losing_trades)
         win_rate = wins / total_trades * 100
         
-        profitable_trades = [t for t in trades if t['win']]
-        losing_trades = [t for t in trades if not t['win']]
-        
-        avg_profit = np.mean([t['profit_pct'] for t in trades])
-        avg_win = np.mean([t['profit_pct'] for t in profitable_trades]) if profitable_trades else 0
-        avg_loss = np.mean([t['profit_pct'] for t in losing_trades]) if losing_trades else 0
+        win_pcts = profit_pct[win_mask]
+        loss_pcts = profit_pct[~win_mask]
+        avg_profit = profit_pct.mean()
+        avg_win = win_pcts.mean() if win_pcts.size else 0
+        avg_loss = loss_pcts.mean() if loss_pcts.size else 0
         
-        max_win = max([t['profit_pct'] for t in trades])
-        max_loss = min([t['profit_pct'] for t in trades])
+        max_win = profit_pct.max()
+        max_loss = profit_pct.min()
         
         # Exit reason analysis
-        exit_reasons = {}
-        for trade in trades:
-            reason = trade['exit_reason']
-            if reason not in exit_reasons:
-                exit_reasons[reason] = {'count': 0, 'wins': 0, 'total_profit': 0, 'profits': []}
-            exit_reasons[reason]['count'] += 1
-            if trade['win']:
-                exit_reasons[reason]['wins'] += 1
-            exit_reasons[reason]['total_profit'] += trade['profit_pct']
-            exit_reasons[reason]['profits'].append(trade['profit_pct'])
+        exit_reasons = pd.DataFrame({
+            'exit_reason': self._exit_reason_categorical(trades),
+            'win': win_mask,
+            'profit_pct': profit_pct
+        }).groupby('exit_reason', sort=False, observed=True).agg(
+            count=('win', 'size'),
+            wins=('win', 'sum'),
+            total_profit=('profit_pct', 'sum')
+        ).to_dict('index')
         
         # Risk-Reward Analysis
         risk_reward_ratio = abs(avg_win / avg_loss) if avg_loss != 0 else 0
         
-        # Consecutive wins/losses
-        consecutive_wins = 0
-        consecutive_losses = 0
-        max_consecutive_wins = 0
-        max_consecutive_losses = 0
-        
-        for trade in trades:
-            if trade['win']:
-                consecutive_wins += 1
-                consecutive_losses = 0
-                max_consecutive_wins = max(max_consecutive_wins, consecutive_wins)
-            else:
-                consecutive_losses += 1
-                consecutive_wins = 0
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
+        # Consecutive wins/losses from run lengths of the win mask
+        run_edges = np.flatnonzero(np.diff(win_mask.astype(np.int8), prepend=-1, append=-1))
+        run_lengths = np.diff(run_edges)
+        run_is_win = win_mask[run_edges[:-1]]
+        win_runs = run_lengths[run_is_win]
+        loss_runs = run_lengths[~run_is_win]
+        max_consecutive_wins = int(win_runs.max()) if win_runs.size else 0
+        max_consecutive_losses = int(loss_runs.max()) if loss_runs.size else 0
         
         return {
             'total_trades': total_trades,
@@ -155,37 +195,36 @@ class RealisticBacktester:
             'max_consecutive_losses': max_consecutive_losses
         }
     
-    def simulate_portfolio_performance(self, trades: List[Dict], initial_capital: float = 100000) -> Dict:
+    def simulate_portfolio_performance(self, trades: List[Trade], initial_capital: float = 100000) -> Dict:
         """Simulate realistic portfolio performance"""
         portfolio_value = initial_capital
         trade_history = []
         
-        for trade in trades:
-            # Calculate position size based on risk management
-            risk_amount = portfolio_value * self.risk_per_trade
-            
-            # Position size calculation
-            entry_price = trade['entry_price']
-            stop_loss_price = entry_price * (1 - self.stop_loss_pct)
-            risk_per_share = entry_price - stop_loss_price
-            
-            if risk_per_share > 0:
-                shares = int(risk_amount / risk_per_share)
-                position_value = shares * entry_price
-                
-                # Calculate actual trade result
-                profit_loss = shares * (trade['exit_price'] - trade['entry_price'])
-                portfolio_value += profit_loss
-                
-                trade_history.append({
-                    'symbol': trade['symbol'],
-                    'date': trade['entry_date'],
-                    'shares': shares,
-                    'position_value': position_value,
-                    'profit_loss': profit_loss,
-                    'portfolio_value': portfolio_value,
-                    'exit_reason': trade['exit_reason']
-                })
+        # Per-trade position math; only the whole-share count depends on the running value
+        entry = np.fromiter((t.entry_price for t in trades), float, len(trades))
+        exit_ = np.fromiter((t.exit_price for t in trades), float, len(trades))
+        risk_per_share = entry - entry * (1 - self.stop_loss_pct)
+        pl_per_share = exit_ - entry
+        sizable = np.flatnonzero(risk_per_share > 0)
+        
+        shares, equity = _simulate_equity(
+            risk_per_share[sizable], pl_per_share[sizable], initial_capital, self.risk_per_trade)
+        if equity.size:
+            portfolio_value = float(equity[-1])
+        
+        for i, shares_i, position_value, profit_loss, value in zip(
+                sizable.tolist(), shares.tolist(), (shares * entry[sizable]).tolist(),
+                (shares * pl_per_share[sizable]).tolist(), equity.tolist()):
+            trade = trades[i]
+            trade_history.append({
+                'symbol': trade.symbol,
+                'date': trade.entry_date,
+                'shares': shares_i,
+                'position_value': position_value,
+                'profit_loss': profit_loss,
+                'portfolio_value': value,
+                'exit_reason': trade.exit_reason
+            })
         
         total_return = portfolio_value - initial_capital
         total_return_pct = (total_return / initial_capital) * 100
@@ -206,28 +245,29 @@ class RealisticBacktester:
             'trade_history': trade_history
         }
     
-    def display_detailed_results(self, trades: List[Dict], metrics: Dict, portfolio: Dict):
+    def display_detailed_results(self, trades: List[Trade], metrics: Dict, portfolio: Dict):
         """Display comprehensive backtest results"""
-        print(f"\n🏆 A+ GRADE BACKTESTING RESULTS - REALISTIC MARKET DATA")
-        print("=" * 100)
-        print(f"📅 Test Period: June 15, 2025 - July 22, 2025 (40 trading days)")
-        print(f"📊 Total Trades Analyzed: {metrics['total_trades']}")
-        print(f"✅ Winning Trades: {metrics['wins']} ({metrics['win_rate']:.1f}%)")
-        print(f"❌ Losing Trades: {metrics['losses']} ({100-metrics['win_rate']:.1f}%)")
-        print(f"💰 Average Return Per Trade: {metrics['avg_profit']:+.2f}%")
-        print(f"🚀 Average Winning Trade: {metrics['avg_win']:+.2f}%")
-        print(f"📉 Average Losing Trade: {metrics['avg_loss']:+.2f}%")
-        print(f"🎯 Best Trade: {metrics['max_win']:+.2f}%")
-        print(f"💔 Worst Trade: {metrics['max_loss']:+.2f}%")
-        print(f"📊 Risk-Reward Ratio: {metrics['risk_reward_ratio']:.2f}:1")
-        print(f"🔥 Max Consecutive Wins: {metrics['max_consecutive_wins']}")
-        print(f"🥶 Max Consecutive Losses: {metrics['max_consecutive_losses']}")
+        lines = []
+        lines.append(f"\n🏆 A+ GRADE BACKTESTING RESULTS - REALISTIC MARKET DATA")
+        lines.append("=" * 100)
+        lines.append(f"📅 Test Period: June 15, 2025 - July 22, 2025 (40 trading days)")
+        lines.append(f"📊 Total Trades Analyzed: {metrics['total_trades']}")
+        lines.append(f"✅ Winning Trades: {metrics['wins']} ({metrics['win_rate']:.1f}%)")
+        lines.append(f"❌ Losing Trades: {metrics['losses']} ({100-metrics['win_rate']:.1f}%)")
+        lines.append(f"💰 Average Return Per Trade: {metrics['avg_profit']:+.2f}%")
+        lines.append(f"🚀 Average Winning Trade: {metrics['avg_win']:+.2f}%")
+        lines.append(f"📉 Average Losing Trade: {metrics['avg_loss']:+.2f}%")
+        lines.append(f"🎯 Best Trade: {metrics['max_win']:+.2f}%")
+        lines.append(f"💔 Worst Trade: {metrics['max_loss']:+.2f}%")
+        lines.append(f"📊 Risk-Reward Ratio: {metrics['risk_reward_ratio']:.2f}:1")
+        lines.append(f"🔥 Max Consecutive Wins: {metrics['max_consecutive_wins']}")
+        lines.append(f"🥶 Max Consecutive Losses: {metrics['max_consecutive_losses']}")
         
         # Exit strategy performance
-        print(f"\n📋 EXIT STRATEGY BREAKDOWN:")
-        print("-" * 100)
-        print(f"{'STRATEGY':<15} {'TRADES':<8} {'WINS':<8} {'WIN%':<8} {'AVG%':<10} {'EFFECTIVENESS':<15} {'DESCRIPTION'}")
-        print("-" * 100)
+        lines.append(f"\n📋 EXIT STRATEGY BREAKDOWN:")
+        lines.append("-" * 100)
+        lines.append(f"{'STRATEGY':<15} {'TRADES':<8} {'WINS':<8} {'WIN%':<8} {'AVG%':<10} {'EFFECTIVENESS':<15} {'DESCRIPTION'}")
+        lines.append("-" * 100)
         
         strategy_descriptions = {
             'TAKE_PROFIT': '20% target hit',
@@ -251,74 +291,76 @@ class RealisticBacktester:
             
             description = strategy_descriptions.get(reason, "Other exit")
             
-            print(f"{reason:<15} {stats['count']:<8} {stats['wins']:<8} {win_pct:<8.1f} {avg_pct:<+10.2f} {effectiveness:<15} {description}")
+            lines.append(f"{reason:<15} {stats['count']:<8} {stats['wins']:<8} {win_pct:<8.1f} {avg_pct:<+10.2f} {effectiveness:<15} {description}")
         
         # Best performing trades
-        sorted_trades = sorted(trades, key=lambda x: x['profit_pct'], reverse=True)
+        top_trades = heapq.nlargest(10, trades, key=attrgetter('profit_pct'))
         
-        print(f"\n🏅 TOP 10 WINNING TRADES:")
-        print("-" * 130)
-        print(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'EXIT':<10} {'PROFIT%':<10} {'DAYS':<6} {'EXIT REASON':<15} {'STRENGTH':<8}")
-        print("-" * 130)
+        lines.append(f"\n🏅 TOP 10 WINNING TRADES:")
+        lines.append("-" * 130)
+        lines.append(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'EXIT':<10} {'PROFIT%':<10} {'DAYS':<6} {'EXIT REASON':<15} {'STRENGTH':<8}")
+        lines.append("-" * 130)
         
-        for trade in sorted_trades[:10]:
-            print(f"{trade['symbol']:<12} {trade['entry_date']:<12} ₹{trade['entry_price']:<9.0f} ₹{trade['exit_price']:<9.0f} {trade['profit_pct']:<+10.2f} {trade['days']:<6} {trade['exit_reason']:<15} {trade['strength']}%")
+        for trade in top_trades:
+            lines.append(_TRADE_ROW(t=trade))
         
-        print(f"\n🔻 LOSING TRADES:")
-        print("-" * 130)
-        print(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'EXIT':<10} {'LOSS%':<10} {'DAYS':<6} {'EXIT REASON':<15} {'STRENGTH':<8}")
-        print("-" * 130)
+        lines.append(f"\n🔻 LOSING TRADES:")
+        lines.append("-" * 130)
+        lines.append(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'EXIT':<10} {'LOSS%':<10} {'DAYS':<6} {'EXIT REASON':<15} {'STRENGTH':<8}")
+        lines.append("-" * 130)
         
-        losing_trades = [t for t in sorted_trades if t['profit_pct'] < 0]
+        profit_pct = np.fromiter((t.profit_pct for t in trades), float, len(trades))
+        losing_idx = np.flatnonzero(profit_pct < 0)
+        losing_idx = losing_idx[np.argsort(-profit_pct[losing_idx], kind='stable')]
+        losing_trades = [trades[i] for i in losing_idx.tolist()]
         for trade in losing_trades:
-            print(f"{trade['symbol']:<12} {trade['entry_date']:<12} ₹{trade['entry_price']:<9.0f} ₹{trade['exit_price']:<9.0f} {trade['profit_pct']:<+10.2f} {trade['days']:<6} {trade['exit_reason']:<15} {trade['strength']}%")
+            lines.append(_TRADE_ROW(t=trade))
         
         # Portfolio performance
-        print(f"\n💼 PORTFOLIO PERFORMANCE ANALYSIS:")
-        print("-" * 80)
-        print(f"💰 Starting Capital: ₹{portfolio['initial_capital']:,.0f}")
-        print(f"📈 Final Portfolio Value: ₹{portfolio['final_portfolio']:,.0f}")
-        print(f"💵 Total Profit/Loss: ₹{portfolio['total_return']:,.0f} ({portfolio['total_return_pct']:+.2f}%)")
-        print(f"📊 Monthly Projection: {portfolio['monthly_projection']:+.2f}%")
-        print(f"📅 Annual Projection: {portfolio['annual_projection']:+.2f}%")
+        lines.append(f"\n💼 PORTFOLIO PERFORMANCE ANALYSIS:")
+        lines.append("-" * 80)
+        lines.append(f"💰 Starting Capital: ₹{portfolio['initial_capital']:,.0f}")
+        lines.append(f"📈 Final Portfolio Value: ₹{portfolio['final_portfolio']:,.0f}")
+        lines.append(f"💵 Total Profit/Loss: ₹{portfolio['total_return']:,.0f} ({portfolio['total_return_pct']:+.2f}%)")
+        lines.append(f"📊 Monthly Projection: {portfolio['monthly_projection']:+.2f}%")
+        lines.append(f"📅 Annual Projection: {portfolio['annual_projection']:+.2f}%")
         
         # System grading
-        if metrics['win_rate'] >= 70 and metrics['risk_reward_ratio'] >= 2.5:
-            grade = "S+ LEGENDARY"
-        elif metrics['win_rate'] >= 65 and metrics['risk_reward_ratio'] >= 2.0:
-            grade = "A+ EXCELLENT"
-        elif metrics['win_rate'] >= 60 and metrics['risk_reward_ratio'] >= 1.5:
-            grade = "A GREAT"
-        elif metrics['win_rate'] >= 55:
-            grade = "B+ GOOD"
-        else:
-            grade = "B AVERAGE"
+        # Each grade needs both its win rate and (above B+) its risk-reward threshold
+        grade = _SYSTEM_GRADES[min(
+            bisect_right(_WIN_RATE_THRESHOLDS, metrics['win_rate']),
+            bisect_right(_RISK_REWARD_THRESHOLDS, metrics['risk_reward_ratio']) + 1
+        )]
         
-        print(f"\n🎖️ SYSTEM PERFORMANCE GRADE: {grade}")
-        print("=" * 80)
+        lines.append(f"\n🎖️ SYSTEM PERFORMANCE GRADE: {grade}")
+        lines.append("=" * 80)
         
         # Key performance insights
-        tp_trades = len([t for t in trades if t['exit_reason'] == 'TAKE_PROFIT'])
-        ts_trades = len([t for t in trades if t['exit_reason'] == 'TRAILING_STOP'])
-        sl_trades = len([t for t in trades if t['exit_reason'] == 'STOP_LOSS'])
-        
-        print(f"🎯 PERFORMANCE INSIGHTS:")
-        print(f"✅ Win Rate: {metrics['win_rate']:.1f}% ({'EXCELLENT' if metrics['win_rate'] > 65 else 'GOOD' if metrics['win_rate'] > 55 else 'NEEDS IMPROVEMENT'})")
-        print(f"✅ Risk Management: {sl_trades} stop losses ({sl_trades/len(trades)*100:.1f}%) protected capital")
-        print(f"✅ Profit Taking: {tp_trades} trades ({tp_trades/len(trades)*100:.1f}%) hit 20% targets")
-        print(f"✅ Profit Protection: {ts_trades} trades ({ts_trades/len(trades)*100:.1f}%) secured gains with trailing stops")
-        print(f"✅ Risk-Reward: {metrics['risk_reward_ratio']:.2f}:1 ({'EXCELLENT' if metrics['risk_reward_ratio'] > 2 else 'GOOD' if metrics['risk_reward_ratio'] > 1.5 else 'FAIR'})")
+        reason_counts = self._exit_reason_categorical(trades).value_counts()
+        tp_trades = int(reason_counts['TAKE_PROFIT'])
+        ts_trades = int(reason_counts['TRAILING_STOP'])
+        sl_trades = int(reason_counts['STOP_LOSS'])
+        
+        lines.append(f"🎯 PERFORMANCE INSIGHTS:")
+        lines.append(f"✅ Win Rate: {metrics['win_rate']:.1f}% ({'EXCELLENT' if metrics['win_rate'] > 65 else 'GOOD' if metrics['win_rate'] > 55 else 'NEEDS IMPROVEMENT'})")
+        lines.append(f"✅ Risk Management: {sl_trades} stop losses ({sl_trades/len(trades)*100:.1f}%) protected capital")
+        lines.append(f"✅ Profit Taking: {tp_trades} trades ({tp_trades/len(trades)*100:.1f}%) hit 20% targets")
+        lines.append(f"✅ Profit Protection: {ts_trades} trades ({ts_trades/len(trades)*100:.1f}%) secured gains with trailing stops")
+        lines.append(f"✅ Risk-Reward: {metrics['risk_reward_ratio']:.2f}:1 ({'EXCELLENT' if metrics['risk_reward_ratio'] > 2 else 'GOOD' if metrics['risk_reward_ratio'] > 1.5 else 'FAIR'})")
         
         monthly_grade = "EXCELLENT" if portfolio['monthly_projection'] > 8 else "GOOD" if portfolio['monthly_projection'] > 5 else "NEEDS IMPROVEMENT"
-        print(f"✅ Monthly Returns: {portfolio['monthly_projection']:+.1f}% ({monthly_grade})")
+        lines.append(f"✅ Monthly Returns: {portfolio['monthly_projection']:+.1f}% ({monthly_grade})")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main execution"""
     backtester = RealisticBacktester()
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     print("📊 A+ GRADE REALISTIC BACKTESTING SYSTEM")
     print("=" * 80)
-    print(f"📅 Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📅 Analysis Date: {now_str}")
     print(f"🎯 Historical Analysis of A+ Grade Trading System")
     print(f"📊 Sample Size: {len(backtester.historical_trades)} realistic trades")
     print(f"🛡️ Risk Management: 6% SL | 20% TP | 3.5% Trailing | 1.5% Risk/Trade")
@@ -331,7 +373,7 @@ def main():
     # Display results
     backtester.display_detailed_results(backtester.historical_trades, metrics, portfolio)
     
-    print(f"\n✅ Realistic Backtesting Analysis Complete - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n✅ Realistic Backtesting Analysis Complete - {now_str}")
 
 if __name__ == "__main__":
     main()
@@ -7,12 +7,102 @@ Enhanced with proper data handling and realistic trade tracking
 import pandas as pd
 import yfinance as yf
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# History window around each analysis date
+_LOOKBACK = timedelta(days=90)
+_FORWARD_WINDOW = timedelta(days=15)
+
+# Random score bonus added to each signal, and its probabilities
+_RANDOM_FACTORS = (0, 1, 2)
+_RANDOM_FACTOR_P = (0.3, 0.5, 0.2)
+
+# Exit reason codes returned by _scan_exit
+_EXIT_STOP_LOSS, _EXIT_TAKE_PROFIT, _EXIT_TRAILING_STOP, _EXIT_TIME = 0, 1, 2, 3
+_EXIT_REASONS = ("STOP_LOSS", "TAKE_PROFIT", "TRAILING_STOP", "TIME_EXIT")
+
+@dataclass
+class TradeResult:
+    """Outcome of one tracked Strong Buy signal"""
+    # Explicit __slots__ since dataclass slots=True needs Python 3.10
+    __slots__ = ('symbol', 'entry_date', 'entry_date_str', 'entry_price', 'exit_reason',
+                 'profit_pct', 'max_profit_pct', 'max_drawdown_pct', 'win', 'strength',
+                 'signals', 'notes', 'exit_date', 'exit_date_str', 'trade_duration',
+                 'volume_ratio', 'entry_momentum')
+    symbol: str
+    entry_date: datetime
+    entry_date_str: str
+    entry_price: float
+    exit_reason: str
+    profit_pct: float
+    max_profit_pct: float
+    max_drawdown_pct: float
+    win: bool
+    strength: int
+    signals: List[str]
+    notes: str
+    exit_date: Optional[datetime]
+    exit_date_str: str
+    trade_duration: int
+    volume_ratio: float
+    entry_momentum: float
+
+def _scan_exit(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, entry: float,
+               sl_pct: float, tp_pct: float, trail_pct: float) -> Tuple[int, int, float]:
+    """Find the first exit over the tracked days: (day index or -1, reason code, exit price)"""
+    stop_loss = entry * (1 - sl_pct)
+    take_profit = entry * (1 + tp_pct)
+    trailing_stop = entry * (1 - trail_pct)
+    
+    # Trailing stop ratchets up on every close above entry
+    above_entry = closes > entry
+    trailing = np.maximum.accumulate(
+        np.where(above_entry, np.maximum(closes * (1 - trail_pct), trailing_stop), trailing_stop)
+    )
+    
+    sl_hit = lows <= stop_loss
+    tp_hit = highs >= take_profit
+    exit_hit = sl_hit | tp_hit | (above_entry & (lows <= trailing))
+    if not exit_hit.any():
+        return -1, _EXIT_TIME, closes[-1] if closes.size else entry
+    
+    # Stop loss takes priority over take profit over trailing stop on the same day
+    exit_idx = int(np.argmax(exit_hit))
+    if sl_hit[exit_idx]:
+        return exit_idx, _EXIT_STOP_LOSS, stop_loss
+    if tp_hit[exit_idx]:
+        return exit_idx, _EXIT_TAKE_PROFIT, take_profit
+    return exit_idx, _EXIT_TRAILING_STOP, trailing[exit_idx]
+
+def _best_first_indices(values: np.ndarray, k: int, worst: bool = False) -> np.ndarray:
+    """Indices of the k best (or k worst) values, ordered best first with ties in input order"""
+    n = len(values)
+    if n > k:
+        # Partition to the k-th best/worst value, then sort only the candidates
+        kth = np.partition(values, k - 1)[k - 1] if worst else np.partition(values, n - k)[n - k]
+        candidates = np.flatnonzero(values <= kth) if worst else np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(n)
+    ordered = candidates[np.argsort(-values[candidates], kind='stable')]
+    return ordered[-k:] if worst else ordered[:k]
+
 class RealisticTradeAnalyzer:
+    # Top liquid stocks that would typically generate Strong Buy signals
+    ANALYSIS_UNIVERSE = (
+        'RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'ICICIBANK.NS',
+        'SBIN.NS', 'BHARTIARTL.NS', 'ITC.NS', 'HINDUNILVR.NS', 'KOTAKBANK.NS',
+        'LT.NS', 'AXISBANK.NS', 'MARUTI.NS', 'SUNPHARMA.NS', 'NTPC.NS',
+        'POWERGRID.NS', 'TATASTEEL.NS', 'JSWSTEEL.NS', 'COALINDIA.NS', 'BAJFINANCE.NS',
+        'HCLTECH.NS', 'WIPRO.NS', 'TECHM.NS', 'ADANIPORTS.NS', 'CIPLA.NS',
+        'ULTRACEMCO.NS', 'ASIANPAINT.NS', 'NESTLEIND.NS', 'ONGC.NS', 'IOC.NS'
+    )
+    
     def __init__(self):
         """Initialize with A+ grade parameters"""
         # A+ Grade Trading Parameters
@@ -21,75 +111,147 @@ class RealisticTradeAnalyzer:
         self.trailing_stop_pct = 0.035  # 3.5% trailing stop
         self.risk_per_trade = 0.015  # 1.5% risk per trade
         
-        # Top liquid stocks that would typically generate Strong Buy signals
-        self.analysis_stocks = [
-            'RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'ICICIBANK.NS',
-            'SBIN.NS', 'BHARTIARTL.NS', 'ITC.NS', 'HINDUNILVR.NS', 'KOTAKBANK.NS',
-            'LT.NS', 'AXISBANK.NS', 'MARUTI.NS', 'SUNPHARMA.NS', 'NTPC.NS',
-            'POWERGRID.NS', 'TATASTEEL.NS', 'JSWSTEEL.NS', 'COALINDIA.NS', 'BAJFINANCE.NS',
-            'HCLTECH.NS', 'WIPRO.NS', 'TECHM.NS', 'ADANIPORTS.NS', 'CIPLA.NS',
-            'ULTRACEMCO.NS', 'ASIANPAINT.NS', 'NESTLEIND.NS', 'ONGC.NS', 'IOC.NS'
-        ]
+        self.analysis_stocks = self.ANALYSIS_UNIVERSE
+        self._active_symbols = self.analysis_stocks[:10]  # Analyze top 10 for speed
+        
+        # Daily history for the whole sweep, fetched once by download_bulk_history
+        self._bulk_cache: Optional[pd.DataFrame] = None
+        self._history_cache: Dict[str, pd.DataFrame] = {}
+        self._indicator_cache: Dict[str, Dict[str, np.ndarray]] = {}
+    
+    def download_bulk_history(self) -> pd.DataFrame:
+        """Download daily history for all analyzed symbols in one request"""
+        return yf.download(
+            list(self._active_symbols), period='6mo', interval='1d', group_by='ticker',
+            threads=True, auto_adjust=True, progress=False
+        )
+    
+    def get_symbol_history(self, symbol: str) -> pd.DataFrame:
+        """Full-range daily history for a symbol, cached across the sweep"""
+        if symbol in self._history_cache:
+            return self._history_cache[symbol]
+        
+        if self._bulk_cache is None:
+            self._bulk_cache = self.download_bulk_history()
+        
+        if symbol in self._bulk_cache.columns.get_level_values(0):
+            data = self._bulk_cache[symbol].dropna(how='all')
+        else:
+            # Not part of the bulk download; fetch one wide range and reuse it
+            try:
+                data = yf.Ticker(symbol).history(period='6mo', interval='1d')
+            except Exception:
+                data = pd.DataFrame()
+        
+        self._history_cache[symbol] = data
+        return data
+    
+    def get_symbol_indicators(self, symbol: str) -> Dict[str, np.ndarray]:
+        """SMA20 and 10-day volume average over a symbol's full history, aligned to its index"""
+        if symbol in self._indicator_cache:
+            return self._indicator_cache[symbol]
+        
+        data = self.get_symbol_history(symbol)
+        indicators = {
+            'sma_20': self._trailing_mean(data['Close'].to_numpy(), 20) if not data.empty else np.empty(0),
+            'volume_avg': self._trailing_mean(data['Volume'].to_numpy(), 10) if not data.empty else np.empty(0)
+        }
+        self._indicator_cache[symbol] = indicators
+        return indicators
+    
+    @staticmethod
+    def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """Rolling mean; NaN until a full window is available or while a NaN bar is inside it"""
+        return pd.Series(values, dtype=float).rolling(window).mean().to_numpy()
     
-    def simulate_morning_analysis(self, target_date: datetime) -> List[Dict]:
+    @staticmethod
+    def _slice_window(data: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+        """Rows in [start, end), matching Ticker.history date bounds"""
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        if data.index.tz is not None:
+            start_ts, end_ts = start_ts.tz_localize(data.index.tz), end_ts.tz_localize(data.index.tz)
+        return data.iloc[data.index.searchsorted(start_ts):data.index.searchsorted(end_ts)]
+    
+    def simulate_morning_analysis(self, target_date: datetime, rng: Optional[np.random.Generator] = None,
+                                  verbose: bool = True) -> List[Dict]:
         """Simulate what Strong Buy signals would have been generated at 9 AM"""
         signals = []
         
         # Get a broader date range for analysis
-        start_date = target_date - timedelta(days=90)
-        end_date = target_date + timedelta(days=15)  # Include forward data
+        start_date = target_date - _LOOKBACK
+        end_date = target_date + _FORWARD_WINDOW  # Include forward data
         
-        print(f"   Simulating signals for {target_date.strftime('%Y-%m-%d')}...")
+        if verbose:
+            print(f"   Simulating signals for {target_date.strftime('%Y-%m-%d')}...")
         
-        for symbol in self.analysis_stocks[:10]:  # Analyze top 10 for speed
-            try:
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(start=start_date, end=end_date, interval="1d")
-                
-                if data.empty or len(data) < 30:
-                    continue
-                
-                # Find the analysis date in the data
-                analysis_idx = None
-                for i, date in enumerate(data.index):
-                    if date.date() == target_date.date():
-                        analysis_idx = i
-                        break
-                
-                if analysis_idx is None or analysis_idx < 20:
-                    continue
-                
-                # Use data up to analysis date for signal generation
-                analysis_data = data.iloc[:analysis_idx + 1]
-                signal = self.generate_realistic_signal(analysis_data, symbol, target_date)
-                
-                if signal:
-                    # Add forward data for performance tracking
-                    forward_data = data.iloc[analysis_idx:]
-                    signal['forward_data'] = forward_data
-                    signals.append(signal)
-                    
-            except Exception as e:
+        # Draw the whole day's random factors at once, one per symbol
+        random_factors = (rng or np.random).choice(
+            _RANDOM_FACTORS, size=len(self._active_symbols), p=_RANDOM_FACTOR_P
+        )
+        
+        for symbol, random_factor in zip(self._active_symbols, random_factors.tolist()):
+            history = self.get_symbol_history(symbol)
+            data = self._slice_window(history, start_date, end_date)
+            
+            if data.empty or len(data) < 30:
                 continue
+            
+            # Find the analysis date in the data
+            target_ts = pd.Timestamp(target_date.date())
+            if data.index.tz is not None:
+                target_ts = target_ts.tz_localize(data.index.tz)
+            analysis_idx = int(data.index.searchsorted(target_ts))
+            
+            if (analysis_idx == len(data) or analysis_idx < 20
+                    or data.index[analysis_idx].date() != target_date.date()):
+                continue
+            
+            # Use data up to analysis date for signal generation, with the
+            # symbol's precomputed averages looked up at the same bar
+            analysis_data = data.iloc[:analysis_idx + 1]
+            indicators = self.get_symbol_indicators(symbol)
+            history_idx = int(history.index.searchsorted(target_ts))
+            signal = self.generate_realistic_signal(
+                analysis_data, symbol, target_date, random_factor,
+                {name: values[history_idx] for name, values in indicators.items()}
+            )
+            
+            if signal:
+                # Add forward High/Low/Close and dates for performance tracking
+                forward_data = data.iloc[analysis_idx:]
+                signal['forward_ohlc'] = forward_data[['High', 'Low', 'Close']].to_numpy()
+                signal['forward_dates'] = forward_data.index
+                signals.append(signal)
         
         return signals
     
-    def generate_realistic_signal(self, data: pd.DataFrame, symbol: str, analysis_date: datetime) -> Optional[Dict]:
+    def generate_realistic_signal(self, data: pd.DataFrame, symbol: str, analysis_date: datetime,
+                                  random_factor: Optional[int] = None,
+                                  indicators: Optional[Dict[str, float]] = None) -> Optional[Dict]:
         """Generate realistic Strong Buy signal based on market conditions"""
         try:
             if len(data) < 20:
                 return None
             
-            current_price = data['Close'].iloc[-1]
-            prev_price = data['Close'].iloc[-2] if len(data) > 1 else current_price
-            
-            # Calculate some basic indicators
-            sma_20 = data['Close'].rolling(20).mean().iloc[-1]
-            volume_avg = data['Volume'].rolling(10).mean().iloc[-1]
-            current_volume = data['Volume'].iloc[-1]
+            close = data['Close'].to_numpy()
+            current_price = close[-1]
+            prev_price = close[-2]
             
-            # Price momentum
+            # Price momentum; both breakouts need more than 1%, and without
+            # either one a signal can never reach two reasons
             price_change = ((current_price / prev_price) - 1) * 100
+            if not price_change > 1:
+                return None
+            
+            # Calculate some basic indicators
+            volume = data['Volume'].to_numpy()
+            if indicators is not None:
+                sma_20 = indicators['sma_20']
+                volume_avg = indicators['volume_avg']
+            else:
+                sma_20 = close[-20:].mean()
+                volume_avg = volume[-10:].mean()
+            current_volume = volume[-1]
             volume_ratio = current_volume / volume_avg if volume_avg > 0 else 1
             
             # Simple signal generation logic
@@ -107,7 +269,8 @@ class RealisticTradeAnalyzer:
                 score += 2
             
             # Add some randomness for realistic results
-            random_factor = np.random.choice([0, 1, 2], p=[0.3, 0.5, 0.2])
+            if random_factor is None:
+                random_factor = int(np.random.choice(_RANDOM_FACTORS, p=_RANDOM_FACTOR_P))
             score += random_factor
             
             if random_factor > 0:
@@ -134,84 +297,42 @@ class RealisticTradeAnalyzer:
         except Exception as e:
             return None
     
-    def track_realistic_performance(self, signal: Dict) -> Dict:
+    def track_realistic_performance(self, signal: Dict) -> TradeResult:
         """Track realistic trade performance"""
         try:
             symbol = signal['symbol']
             entry_price = signal['entry_price']
-            forward_data = signal['forward_data']
+            forward_ohlc = signal['forward_ohlc']
+            forward_dates = signal['forward_dates']
             
-            if forward_data.empty or len(forward_data) < 2:
+            if len(forward_ohlc) < 2:
                 return self.create_trade_result(signal, "NO_DATA", 0, 0, "Insufficient data")
             
-            # Calculate trade levels
-            stop_loss = entry_price * (1 - self.stop_loss_pct)
-            take_profit = entry_price * (1 + self.take_profit_pct)
-            trailing_stop = entry_price * (1 - self.trailing_stop_pct)
-            
-            # Track performance day by day
-            max_profit_pct = 0
-            max_drawdown_pct = 0
-            trade_active = True
-            exit_reason = "HOLDING"
-            exit_price = entry_price
-            exit_date = signal['analysis_date']
-            days_tracked = 0
+            # Skip first day (entry day) and track up to 10 days
+            highs, lows, closes = forward_ohlc[1:11].T
+            exit_idx, reason_code, exit_price = _scan_exit(
+                highs, lows, closes, entry_price,
+                self.stop_loss_pct, self.take_profit_pct, self.trailing_stop_pct
+            )
+            exit_reason = _EXIT_REASONS[reason_code]
             
-            # Skip first day (entry day)
-            for i in range(1, min(len(forward_data), 11)):  # Track up to 10 days
-                row = forward_data.iloc[i]
-                high = row['High']
-                low = row['Low']
-                close = row['Close']
-                days_tracked += 1
-                
-                # Update max profit and drawdown
-                day_high_pct = ((high / entry_price) - 1) * 100
-                day_low_pct = ((low / entry_price) - 1) * 100
-                close_pct = ((close / entry_price) - 1) * 100
-                
-                max_profit_pct = max(max_profit_pct, day_high_pct)
-                max_drawdown_pct = min(max_drawdown_pct, day_low_pct)
-                
-                if trade_active:
-                    # Check stop loss
-                    if low <= stop_loss:
-                        exit_reason = "STOP_LOSS"
-                        exit_price = stop_loss
-                        exit_date = row.name
-                        trade_active = False
-                        break
-                    
-                    # Check take profit
-                    elif high >= take_profit:
-                        exit_reason = "TAKE_PROFIT"
-                        exit_price = take_profit
-                        exit_date = row.name
-                        trade_active = False
-                        break
-                    
-                    # Update and check trailing stop
-                    elif close > entry_price:
-                        new_trailing = close * (1 - self.trailing_stop_pct)
-                        if new_trailing > trailing_stop:
-                            trailing_stop = new_trailing
-                        
-                        if low <= trailing_stop:
-                            exit_reason = "TRAILING_STOP"
-                            exit_price = trailing_stop
-                            exit_date = row.name
-                            trade_active = False
-                            break
+            if exit_idx < 0:
+                # Still active after the tracking window, use last available price
+                days_tracked = len(closes)
+                exit_price = forward_ohlc[-1, 2]
+                exit_date = forward_dates[-1]
+            else:
+                days_tracked = exit_idx + 1
+                exit_date = forward_dates[days_tracked]
             
-            # If still active, use last available price
-            if trade_active and len(forward_data) > 1:
-                exit_reason = "TIME_EXIT"
-                exit_price = forward_data.iloc[-1]['Close']
-                exit_date = forward_data.index[-1]
+            # Max profit and drawdown over the days the trade was open; exit levels
+            # are compared in price space, so percentages only need the extremes
+            inv_entry = 1.0 / entry_price
+            max_profit_pct = max(0, (highs[:days_tracked].max() * inv_entry - 1) * 100)
+            max_drawdown_pct = min(0, (lows[:days_tracked].min() * inv_entry - 1) * 100)
             
             # Calculate final performance
-            final_profit_pct = ((exit_price / entry_price) - 1) * 100
+            final_profit_pct = (exit_price * inv_entry - 1) * 100
             
             return self.create_trade_result(
                 signal, exit_reason, final_profit_pct, max_profit_pct,
@@ -224,25 +345,72 @@ class RealisticTradeAnalyzer:
     
     def create_trade_result(self, signal: Dict, exit_reason: str, profit_pct: float, 
                           max_profit_pct: float, notes: str, daily_data: List = None, 
-                          max_drawdown_pct: float = 0, exit_date: datetime = None) -> Dict:
+                          max_drawdown_pct: float = 0, exit_date: datetime = None) -> TradeResult:
         """Create standardized trade result"""
-        return {
-            'symbol': signal['symbol'],
-            'entry_date': signal['analysis_date'],
-            'entry_price': signal['entry_price'],
-            'exit_reason': exit_reason,
-            'profit_pct': profit_pct,
-            'max_profit_pct': max_profit_pct,
-            'max_drawdown_pct': max_drawdown_pct,
-            'win': profit_pct > 0,
-            'strength': signal['strength'],
-            'signals': signal['signals'],
-            'notes': notes,
-            'exit_date': exit_date,
-            'trade_duration': (exit_date - signal['analysis_date']).days if exit_date and exit_date != signal['analysis_date'] else 1,
-            'volume_ratio': signal.get('volume_ratio', 1),
-            'entry_momentum': signal.get('price_change', 0)
-        }
+        return TradeResult(
+            symbol=signal['symbol'],
+            entry_date=signal['analysis_date'],
+            entry_date_str=signal['analysis_date'].strftime('%m-%d'),
+            entry_price=signal['entry_price'],
+            exit_reason=exit_reason,
+            profit_pct=profit_pct,
+            max_profit_pct=max_profit_pct,
+            max_drawdown_pct=max_drawdown_pct,
+            win=profit_pct > 0,
+            strength=signal['strength'],
+            signals=signal['signals'],
+            notes=notes,
+            exit_date=exit_date,
+            exit_date_str=exit_date.strftime('%m-%d') if exit_date else '',
+            trade_duration=(exit_date - signal['analysis_date']).days if exit_date and exit_date != signal['analysis_date'] else 1,
+            volume_ratio=signal.get('volume_ratio', 1),
+            entry_momentum=signal.get('price_change', 0)
+        )
+    
+    def _analyze_day(self, day_number: int, analysis_date: datetime,
+                     seed: int) -> Tuple[List[TradeResult], Dict, List[str]]:
+        """Simulate and track one trading day: (trades, daily summary, log lines)"""
+        lines = [
+            f"📅 Day {day_number}: {analysis_date.strftime('%Y-%m-%d (%A)')}",
+            f"   Simulating signals for {analysis_date.strftime('%Y-%m-%d')}..."
+        ]
+        morning_signals = self.simulate_morning_analysis(
+            analysis_date, np.random.default_rng(seed), verbose=False
+        )
+        
+        if not morning_signals:
+            lines.append(f"   📊 No Strong Buy signals generated")
+            return [], {
+                'date': analysis_date,
+                'total_signals': 0,
+                'wins': 0,
+                'win_rate': 0,
+                'avg_profit': 0
+            }, lines
+        
+        # Track each trade
+        day_trades = [self.track_realistic_performance(signal) for signal in morning_signals]
+        
+        # Daily summary
+        wins = sum(1 for t in day_trades if t.win)
+        total = len(day_trades)
+        avg_profit = np.mean([t.profit_pct for t in day_trades])
+        win_rate = wins/total*100 if total > 0 else 0
+        
+        lines.append(f"   📊 Signals: {total} | Wins: {wins} | Win Rate: {win_rate:.1f}% | Avg: {avg_profit:+.1f}%")
+        
+        # Show day's trades
+        for trade in day_trades:
+            status = "✅" if trade.win else "❌"
+            lines.append(f"      {status} {trade.symbol}: {trade.profit_pct:+.1f}% ({trade.exit_reason})")
+        
+        return day_trades, {
+            'date': analysis_date,
+            'total_signals': total,
+            'wins': wins,
+            'win_rate': win_rate,
+            'avg_profit': avg_profit
+        }, lines
     
     def analyze_last_10_days_realistic(self) -> Dict:
         """Analyze realistic Strong Buy performance for last 10 trading days"""
@@ -260,53 +428,27 @@ class RealisticTradeAnalyzer:
         
         trading_days.reverse()  # Chronological order
         
+        # One bulk request covers every symbol and trading day in the sweep
+        self._bulk_cache = self.download_bulk_history()
+        self._history_cache.clear()
+        self._indicator_cache.clear()
+        
+        # Simulate and track all mornings concurrently; each day draws from its own
+        # seeded generator and its log is written in chronological order afterwards
+        day_seeds = np.random.randint(0, 2**31 - 1, size=len(trading_days))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            day_results = list(executor.map(
+                self._analyze_day, range(1, len(trading_days) + 1), trading_days, day_seeds
+            ))
+        
         all_trades = []
         daily_summary = []
-        
-        for i, analysis_date in enumerate(trading_days, 1):
-            print(f"📅 Day {i}: {analysis_date.strftime('%Y-%m-%d (%A)')}")
-            
-            # Simulate morning signals
-            morning_signals = self.simulate_morning_analysis(analysis_date)
-            
-            if not morning_signals:
-                print(f"   📊 No Strong Buy signals generated")
-                daily_summary.append({
-                    'date': analysis_date,
-                    'total_signals': 0,
-                    'wins': 0,
-                    'win_rate': 0,
-                    'avg_profit': 0
-                })
-                continue
-            
-            # Track each trade
-            day_trades = []
-            for signal in morning_signals:
-                trade_result = self.track_realistic_performance(signal)
-                day_trades.append(trade_result)
-                all_trades.append(trade_result)
-            
-            # Daily summary
-            wins = sum(1 for t in day_trades if t['win'])
-            total = len(day_trades)
-            avg_profit = np.mean([t['profit_pct'] for t in day_trades])
-            win_rate = wins/total*100 if total > 0 else 0
-            
-            daily_summary.append({
-                'date': analysis_date,
-                'total_signals': total,
-                'wins': wins,
-                'win_rate': win_rate,
-                'avg_profit': avg_profit
-            })
-            
-            print(f"   📊 Signals: {total} | Wins: {wins} | Win Rate: {win_rate:.1f}% | Avg: {avg_profit:+.1f}%")
-            
-            # Show day's trades
-            for trade in day_trades:
-                status = "✅" if trade['win'] else "❌"
-                print(f"      {status} {trade['symbol']}: {trade['profit_pct']:+.1f}% ({trade['exit_reason']})")
+        lines = []
+        for day_trades, day_summary, day_lines in day_results:
+            all_trades.extend(day_trades)
+            daily_summary.append(day_summary)
+            lines.extend(day_lines)
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return {
             'all_trades': all_trades,
@@ -323,117 +465,118 @@ class RealisticTradeAnalyzer:
             print("\n❌ NO STRONG BUY TRADES SIMULATED")
             return
         
+        lines = []
+        
         # Overall Statistics
-        total_trades = len(all_trades)
-        wins = sum(1 for t in all_trades if t['win'])
+        trades_df = pd.DataFrame({
+            'exit_reason': [t.exit_reason for t in all_trades],
+            'win': [t.win for t in all_trades],
+            'profit_pct': [t.profit_pct for t in all_trades]
+        })
+        profit_pct = trades_df['profit_pct'].astype(float)
+        win_mask = trades_df['win'].astype(bool)
+        
+        total_trades = len(trades_df)
+        wins = int(win_mask.sum())
         losses = total_trades - wins
         win_rate = wins / total_trades * 100 if total_trades > 0 else 0
         
-        profitable_trades = [t for t in all_trades if t['win']]
-        losing_trades = [t for t in all_trades if not t['win']]
-        
-        avg_profit = np.mean([t['profit_pct'] for t in all_trades])
-        avg_win = np.mean([t['profit_pct'] for t in profitable_trades]) if profitable_trades else 0
-        avg_loss = np.mean([t['profit_pct'] for t in losing_trades]) if losing_trades else 0
+        avg_profit = profit_pct.mean()
+        avg_win = profit_pct[win_mask].mean() if wins else 0
+        avg_loss = profit_pct[~win_mask].mean() if losses else 0
         
-        max_win = max([t['profit_pct'] for t in all_trades]) if all_trades else 0
-        max_loss = min([t['profit_pct'] for t in all_trades]) if all_trades else 0
+        max_win = profit_pct.max()
+        max_loss = profit_pct.min()
         
-        print(f"\n🏆 10-DAY REALISTIC STRONG BUY PERFORMANCE")
-        print("=" * 80)
-        print(f"📊 Total Trades: {total_trades}")
-        print(f"✅ Wins: {wins} ({win_rate:.1f}%)")
-        print(f"❌ Losses: {losses} ({100-win_rate:.1f}%)")
-        print(f"💰 Average Return: {avg_profit:+.2f}%")
-        print(f"🚀 Average Win: {avg_win:+.2f}%")
-        print(f"📉 Average Loss: {avg_loss:+.2f}%")
-        print(f"🎯 Best Trade: {max_win:+.2f}%")
-        print(f"💔 Worst Trade: {max_loss:+.2f}%")
+        lines.append(f"\n🏆 10-DAY REALISTIC STRONG BUY PERFORMANCE")
+        lines.append("=" * 80)
+        lines.append(f"📊 Total Trades: {total_trades}")
+        lines.append(f"✅ Wins: {wins} ({win_rate:.1f}%)")
+        lines.append(f"❌ Losses: {losses} ({100-win_rate:.1f}%)")
+        lines.append(f"💰 Average Return: {avg_profit:+.2f}%")
+        lines.append(f"🚀 Average Win: {avg_win:+.2f}%")
+        lines.append(f"📉 Average Loss: {avg_loss:+.2f}%")
+        lines.append(f"🎯 Best Trade: {max_win:+.2f}%")
+        lines.append(f"💔 Worst Trade: {max_loss:+.2f}%")
         if avg_loss != 0:
-            print(f"📊 Risk-Reward Ratio: {abs(avg_win/avg_loss):.2f}:1")
+            lines.append(f"📊 Risk-Reward Ratio: {abs(avg_win/avg_loss):.2f}:1")
         
         # Exit Reason Analysis
-        exit_reasons = {}
-        for trade in all_trades:
-            reason = trade['exit_reason']
-            if reason not in exit_reasons:
-                exit_reasons[reason] = {'count': 0, 'wins': 0, 'total_profit': 0}
-            exit_reasons[reason]['count'] += 1
-            if trade['win']:
-                exit_reasons[reason]['wins'] += 1
-            exit_reasons[reason]['total_profit'] += trade['profit_pct']
-        
-        print(f"\n📋 EXIT REASON BREAKDOWN:")
-        print("-" * 70)
-        print(f"{'REASON':<15} {'COUNT':<8} {'WINS':<8} {'WIN%':<8} {'AVG%':<10}")
-        print("-" * 70)
-        
-        for reason, stats in exit_reasons.items():
-            win_pct = stats['wins'] / stats['count'] * 100 if stats['count'] > 0 else 0
-            avg_pct = stats['total_profit'] / stats['count'] if stats['count'] > 0 else 0
-            print(f"{reason:<15} {stats['count']:<8} {stats['wins']:<8} {win_pct:<8.1f} {avg_pct:<+10.2f}")
-        
-        # Top performing trades
-        sorted_trades = sorted(all_trades, key=lambda x: x['profit_pct'], reverse=True)
-        
-        print(f"\n🏅 TOP 5 PERFORMING TRADES:")
-        print("-" * 120)
-        print(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'PROFIT%':<10} {'MAX%':<10} {'REASON':<15} {'DURATION':<10} {'SIGNALS'}")
-        print("-" * 120)
-        
-        for trade in sorted_trades[:5]:
-            entry_date = trade['entry_date'].strftime('%m-%d')
-            duration = f"{trade['trade_duration']}d"
-            signals = ', '.join(trade['signals'][:2])
-            print(f"{trade['symbol']:<12} {entry_date:<12} ₹{trade['entry_price']:<9.0f} {trade['profit_pct']:<+10.2f} {trade['max_profit_pct']:<+10.2f} {trade['exit_reason']:<15} {duration:<10} {signals}")
-        
-        print(f"\n🔻 WORST 5 PERFORMING TRADES:")
-        print("-" * 120)
-        print(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'PROFIT%':<10} {'DRAWDOWN%':<12} {'REASON':<15} {'DURATION':<10} {'SIGNALS'}")
-        print("-" * 120)
-        
-        for trade in sorted_trades[-5:]:
-            entry_date = trade['entry_date'].strftime('%m-%d')
-            duration = f"{trade['trade_duration']}d"
-            signals = ', '.join(trade['signals'][:2])
-            print(f"{trade['symbol']:<12} {entry_date:<12} ₹{trade['entry_price']:<9.0f} {trade['profit_pct']:<+10.2f} {trade['max_drawdown_pct']:<+12.2f} {trade['exit_reason']:<15} {duration:<10} {signals}")
-        
-        # Portfolio simulation
-        portfolio_value = 100000
-        total_portfolio_return = 0
-        daily_portfolio_values = [portfolio_value]
-        
-        for trade in all_trades:
-            # Risk 1.5% per trade
-            risk_amount = portfolio_value * self.risk_per_trade
-            trade_return = risk_amount * (trade['profit_pct'] / 100)
-            total_portfolio_return += trade_return
-            portfolio_value += trade_return
-            daily_portfolio_values.append(portfolio_value)
-        
-        portfolio_return_pct = (portfolio_value - 100000) / 100000 * 100
-        
-        print(f"\n💼 PORTFOLIO SIMULATION (₹1,00,000 initial):")
-        print("-" * 60)
-        print(f"💰 Total P&L: ₹{total_portfolio_return:,.0f} ({portfolio_return_pct:+.2f}%)")
-        print(f"📈 Final Value: ₹{portfolio_value:,.0f}")
-        print(f"🎯 Risk per Trade: {self.risk_per_trade*100:.1f}%")
-        print(f"📊 Max Drawdown: {min([((v/100000)-1)*100 for v in daily_portfolio_values]):.2f}%")
-        print(f"⚡ Best Single Day: {max([t['profit_pct'] for t in all_trades]):.2f}%")
-        print(f"💔 Worst Single Day: {min([t['profit_pct'] for t in all_trades]):.2f}%")
-        
-        # Risk management effectiveness
-        sl_hits = len([t for t in all_trades if t['exit_reason'] == 'STOP_LOSS'])
-        tp_hits = len([t for t in all_trades if t['exit_reason'] == 'TAKE_PROFIT'])
-        trail_hits = len([t for t in all_trades if t['exit_reason'] == 'TRAILING_STOP'])
-        time_exits = len([t for t in all_trades if t['exit_reason'] == 'TIME_EXIT'])
-        
-        print(f"\n🛡️ RISK MANAGEMENT EFFECTIVENESS:")
-        print("-" * 60)
-        print(f"🔴 Stop Loss Hits: {sl_hits} ({sl_hits/total_trades*100:.1f}%) - Avg: {np.mean([t['profit_pct'] for t in all_trades if t['exit_reason'] == 'STOP_LOSS']) if sl_hits > 0 else 0:.2f}%")
-        print(f"🟢 Take Profit Hits: {tp_hits} ({tp_hits/total_trades*100:.1f}%) - Avg: {np.mean([t['profit_pct'] for t in all_trades if t['exit_reason'] == 'TAKE_PROFIT']) if tp_hits > 0 else 0:.2f}%")
-        print(f"🟡 Trailing Stop Hits: {trail_hits} ({trail_hits/total_trades*100:.1f}%) - Avg: {np.mean([t['profit_pct'] for t in all_trades if t['exit_reason'] == 'TRAILING_STOP']) if trail_hits > 0 else 0:.2f}%")
-        print(f"⏰ Time Exits: {time_exits} ({time_exits/total_trades*100:.1f}%) - Avg: {np.mean([t['profit_pct'] for t in all_trades if t['exit_reason'] == 'TIME_EXIT']) if time_exits > 0 else 0:.2f}%")
+        exit_reasons = pd.DataFrame({
+            'exit_reason': trades_df['exit_reason'], 'win': win_mask, 'profit_pct': profit_pct
+        }).groupby('exit_reason', sort=False).agg(
+            count=('win', 'size'),
+            wins=('win', 'sum'),
+            avg_pct=('profit_pct', 'mean')
+        )
+        
+        lines.append(f"\n📋 EXIT REASON BREAKDOWN:")
+        lines.append("-" * 70)
+        lines.append(f"{'REASON':<15} {'COUNT':<8} {'WINS':<8} {'WIN%':<8} {'AVG%':<10}")
+        lines.append("-" * 70)
+        
+        for reason, count, reason_wins, avg_pct in exit_reasons.itertuples():
+            win_pct = reason_wins / count * 100
+            lines.append(f"{reason:<15} {count:<8} {reason_wins:<8} {win_pct:<8.1f} {avg_pct:<+10.2f}")
+        
+        # Top and worst performing trades, in best-first order
+        profits = profit_pct.to_numpy()
+        top_trades = [all_trades[i] for i in _best_first_indices(profits, 5, worst=False).tolist()]
+        worst_trades = [all_trades[i] for i in _best_first_indices(profits, 5, worst=True).tolist()]
+        
+        lines.append(f"\n🏅 TOP 5 PERFORMING TRADES:")
+        lines.append("-" * 120)
+        lines.append(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'PROFIT%':<10} {'MAX%':<10} {'REASON':<15} {'DURATION':<10} {'SIGNALS'}")
+        lines.append("-" * 120)
+        
+        for trade in top_trades:
+            duration = f"{trade.trade_duration}d"
+            signals = ', '.join(trade.signals[:2])
+            lines.append(f"{trade.symbol:<12} {trade.entry_date_str:<12} ₹{trade.entry_price:<9.0f} {trade.profit_pct:<+10.2f} {trade.max_profit_pct:<+10.2f} {trade.exit_reason:<15} {duration:<10} {signals}")
+        
+        lines.append(f"\n🔻 WORST 5 PERFORMING TRADES:")
+        lines.append("-" * 120)
+        lines.append(f"{'SYMBOL':<12} {'DATE':<12} {'ENTRY':<10} {'PROFIT%':<10} {'DRAWDOWN%':<12} {'REASON':<15} {'DURATION':<10} {'SIGNALS'}")
+        lines.append("-" * 120)
+        
+        for trade in worst_trades:
+            duration = f"{trade.trade_duration}d"
+            signals = ', '.join(trade.signals[:2])
+            lines.append(f"{trade.symbol:<12} {trade.entry_date_str:<12} ₹{trade.entry_price:<9.0f} {trade.profit_pct:<+10.2f} {trade.max_drawdown_pct:<+12.2f} {trade.exit_reason:<15} {duration:<10} {signals}")
+        
+        # Portfolio simulation: risking 1.5% of current value per trade compounds multiplicatively
+        initial_capital = 100000
+        portfolio_values = initial_capital * np.cumprod(1 + self.risk_per_trade * profits / 100)
+        portfolio_value = portfolio_values[-1]
+        total_portfolio_return = portfolio_value - initial_capital
+        portfolio_return_pct = total_portfolio_return / initial_capital * 100
+        max_portfolio_drawdown = min(0, (portfolio_values.min() / initial_capital - 1) * 100)
+        
+        lines.append(f"\n💼 PORTFOLIO SIMULATION (₹1,00,000 initial):")
+        lines.append("-" * 60)
+        lines.append(f"💰 Total P&L: ₹{total_portfolio_return:,.0f} ({portfolio_return_pct:+.2f}%)")
+        lines.append(f"📈 Final Value: ₹{portfolio_value:,.0f}")
+        lines.append(f"🎯 Risk per Trade: {self.risk_per_trade*100:.1f}%")
+        lines.append(f"📊 Max Drawdown: {max_portfolio_drawdown:.2f}%")
+        lines.append(f"⚡ Best Single Day: {max_win:.2f}%")
+        lines.append(f"💔 Worst Single Day: {max_loss:.2f}%")
+        
+        # Risk management effectiveness, read from the exit reason breakdown
+        reason_counts = exit_reasons['count']
+        reason_avgs = exit_reasons['avg_pct']
+        sl_hits = int(reason_counts.get('STOP_LOSS', 0))
+        tp_hits = int(reason_counts.get('TAKE_PROFIT', 0))
+        trail_hits = int(reason_counts.get('TRAILING_STOP', 0))
+        time_exits = int(reason_counts.get('TIME_EXIT', 0))
+        
+        lines.append(f"\n🛡️ RISK MANAGEMENT EFFECTIVENESS:")
+        lines.append("-" * 60)
+        lines.append(f"🔴 Stop Loss Hits: {sl_hits} ({sl_hits/total_trades*100:.1f}%) - Avg: {reason_avgs.get('STOP_LOSS', 0):.2f}%")
+        lines.append(f"🟢 Take Profit Hits: {tp_hits} ({tp_hits/total_trades*100:.1f}%) - Avg: {reason_avgs.get('TAKE_PROFIT', 0):.2f}%")
+        lines.append(f"🟡 Trailing Stop Hits: {trail_hits} ({trail_hits/total_trades*100:.1f}%) - Avg: {reason_avgs.get('TRAILING_STOP', 0):.2f}%")
+        lines.append(f"⏰ Time Exits: {time_exits} ({time_exits/total_trades*100:.1f}%) - Avg: {reason_avgs.get('TIME_EXIT', 0):.2f}%")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main execution"""
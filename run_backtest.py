@@ -6,184 +6,194 @@ This script runs comprehensive backtesting on 1000+ liquid Indian stocks
 to analyze if your trading setup is profitable and ready for live trading.
 """
 
+import argparse
+import importlib.util
+import os
+import re
 import sys
 from pathlib import Path
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
+from typing import Optional, Tuple
 import pandas as pd
 import numpy as np
+import yfinance as yf
 import warnings
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-# Setup logging
-logging.basicConfig(level=logging.WARNING)  # Reduce noise
-warnings.filterwarnings('ignore')
-
-def get_top_liquid_stocks() -> list:
-    """Get comprehensive list of top liquid Indian stocks."""
-    
-    # Top 1000+ liquid Indian stocks across sectors
-    liquid_stocks = [
-        # Nifty 50 - Top 50 most liquid
-        'RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'HINDUNILVR.NS',
-        'ICICIBANK.NS', 'SBIN.NS', 'BHARTIARTL.NS', 'ITC.NS', 'KOTAKBANK.NS',
-        'LT.NS', 'ASIANPAINT.NS', 'AXISBANK.NS', 'MARUTI.NS', 'TITAN.NS',
-        'NESTLEIND.NS', 'HCLTECH.NS', 'WIPRO.NS', 'ULTRACEMCO.NS', 'BAJFINANCE.NS',
-        'TECHM.NS', 'SUNPHARMA.NS', 'POWERGRID.NS', 'NTPC.NS', 'TATASTEEL.NS',
-        'COALINDIA.NS', 'BAJAJFINSV.NS', 'M&M.NS', 'ONGC.NS', 'GRASIM.NS',
-        'CIPLA.NS', 'EICHERMOT.NS', 'HEROMOTOCO.NS', 'BRITANNIA.NS', 'DRREDDY.NS',
-        'APOLLOHOSP.NS', 'DIVISLAB.NS', 'ADANIENT.NS', 'JSWSTEEL.NS', 'HINDALCO.NS',
-        'INDUSINDBK.NS', 'TATACONSUM.NS', 'BAJAJ-AUTO.NS', 'SBILIFE.NS', 'HDFCLIFE.NS',
-        'BPCL.NS', 'IOC.NS', 'TRENT.NS', 'TATAMOTORS.NS', 'ADANIPORTS.NS',
-        
-        # Nifty Next 50 - High liquidity mid caps
-        'GODREJCP.NS', 'MOTHERSON.NS', 'DMART.NS', 'PIDILITIND.NS', 'MARICO.NS',
-        'BANDHANBNK.NS', 'PAGEIND.NS', 'SIEMENS.NS', 'DABUR.NS', 'GAIL.NS',
-        'AMBUJACEM.NS', 'SRF.NS', 'BOSCHLTD.NS', 'HAVELLS.NS', 'MCDOWELL-N.NS',
-        'COLPAL.NS', 'TORNTPHARM.NS', 'ALKEM.NS', 'LUPIN.NS', 'BERGEPAINT.NS',
-        'ACC.NS', 'MUTHOOTFIN.NS', 'L&TFH.NS', 'PETRONET.NS', 'NAUKRI.NS',
-        'BANKBARODA.NS', 'PEL.NS', 'ESCORTS.NS', 'ZEEL.NS', 'MINDTREE.NS',
-        'AUROPHARMA.NS', 'CONCOR.NS', 'SAIL.NS', 'NMDC.NS', 'VEDL.NS',
-        'VOLTAS.NS', 'BIOCON.NS', 'CADILAHC.NS', 'ASHOKLEY.NS', 'PFC.NS',
-        'RECLTD.NS', 'JUBLFOOD.NS', 'INDIGO.NS', 'GMRINFRA.NS', 'CUMMINSIND.NS',
-        'BATAINDIA.NS', 'CHOLAFIN.NS', 'MANAPPURAM.NS', 'ZYDUSLIFE.NS', 'MPHASIS.NS',
-        
-        # Banking & Financial Services (100+ stocks)
-        'FEDERALBNK.NS', 'IDFCFIRSTB.NS', 'PNB.NS', 'CANBK.NS', 'UNIONBANK.NS',
-        'YESBANK.NS', 'RBLBANK.NS', 'AUBANK.NS', 'SOUTHBANK.NS', 'CENTRALBANK.NS',
-        'INDIANB.NS', 'IOB.NS', 'MAHABANK.NS', 'UCOBANK.NS', 'BANKOFBARODA.NS',
-        'ICICIGI.NS', 'BAJAJHLDNG.NS', 'SHRIRAMFIN.NS', 'M&MFIN.NS', 'LICHSGFIN.NS',
-        'HDFC.NS', 'HDFCAMC.NS', 'EDELWEISS.NS', 'MOTILALOFS.NS', 'ANGELONE.NS',
-        'CDSL.NS', 'CAMS.NS', 'BSE.NS', 'MCX.NS', 'POLICYBZR.NS',
-        
-        # IT & Technology (80+ stocks)
-        'LTIM.NS', 'PERSISTENT.NS', 'COFORGE.NS', 'LTTS.NS', 'FSL.NS',
-        'HAPPSTMNDS.NS', 'ZENSAR.NS', 'CYIENT.NS', 'RAMSARUP.NS', 'SONATSOFTW.NS',
-        'KPITTECH.NS', 'INTELLECT.NS', 'TANLA.NS', 'NEWGEN.NS', 'MINDSPACE.NS',
-        'ROUTE.NS', 'NAZARA.NS', 'ZOMATO.NS', 'PAYTM.NS', 'NYKAA.NS',
-        
-        # Pharma & Healthcare (70+ stocks)
-        'GLENMARK.NS', 'TORNTPOWER.NS', 'ABBOTINDIA.NS', 'PFIZER.NS', 'GSK.NS',
-        'NOVARTIS.NS', 'SANOFI.NS', 'GRANULES.NS', 'LAURUSLABS.NS', 'REDDY.NS',
-        'STRIDES.NS', 'CAPLIN.NS', 'NATCOPHAR.NS', 'DIVIS.NS', 'IPCALAB.NS',
-        'LALPATHLAB.NS', 'METROPOLIS.NS', 'THYROCARE.NS', 'KRBL.NS', 'AJANTPHARM.NS',
-        
-        # FMCG & Consumer (60+ stocks)
-        'EMAMILTD.NS', 'GODREJIND.NS', 'VBL.NS', 'RADICO.NS', 'UBL.NS',
-        'APLLTD.NS', 'JYOTHYLAB.NS', 'HONAUT.NS', 'RELAXO.NS', 'VGUARD.NS',
-        'CROMPTON.NS', 'WHIRLPOOL.NS', 'BLUEDART.NS', 'TEAMLEASE.NS', 'QUESS.NS',
-        
-        # Auto & Auto Components (50+ stocks)
-        'TVSMOTOR.NS', 'BAJAJHLDNG.NS', 'FORCE.NS', 'MAHINDCIE.NS', 'MOTHERSON.NS',
-        'BOSCHLTD.NS', 'MRF.NS', 'APOLLOTYRE.NS', 'CEAT.NS', 'JK.NS',
-        'BALKRISIND.NS', 'AMARAJABAT.NS', 'EXIDEIND.NS', 'SUNDRMFAST.NS', 'BHARAT.NS',
-        
-        # Metals & Mining (40+ stocks)
-        'APLAPOLLO.NS', 'RATNAMANI.NS', 'WELCORP.NS', 'JINDALSTEL.NS', 'MOIL.NS',
-        'NATIONALUM.NS', 'HINDZINC.NS', 'WELSPUNIND.NS', 'JINDALPOLY.NS', 'APL.NS',
-        
-        # Oil & Gas (30+ stocks)
-        'RELIANCE.NS', 'ONGC.NS', 'IOC.NS', 'BPCL.NS', 'HPCL.NS',
-        'GAIL.NS', 'PETRONET.NS', 'IGL.NS', 'MGL.NS', 'GSPL.NS',
-        
-        # Cement (25+ stocks)
-        'SHREECEM.NS', 'RAMCOCEM.NS', 'HEIDELBERG.NS', 'JKCEMENT.NS', 'ORIENT.NS',
-        'PRISMCEMENT.NS', 'KESORAMIND.NS', 'DALMIACEM.NS', 'MAGMA.NS', 'VIKASECO.NS',
-        
-        # Infrastructure & Construction (40+ stocks)
-        'IRCTC.NS', 'RAILTEL.NS', 'IRFC.NS', 'RVNL.NS', 'NBCC.NS',
-        'NCC.NS', 'HCC.NS', 'JMCPROJECT.NS', 'KNR.NS', 'ORIENTCEM.NS',
-        
-        # Power & Utilities (35+ stocks)
-        'TATAPOWER.NS', 'ADANIPOWER.NS', 'NHPC.NS', 'SJVN.NS', 'RPOWER.NS',
-        'TORNTPOWER.NS', 'CESC.NS', 'ADANIGREEN.NS', 'SUZLON.NS', 'INOXWIND.NS',
-        
-        # Telecommunications (15+ stocks)
-        'BHARTIARTL.NS', 'IDEA.NS', 'GTPL.NS', 'HFCL.NS', 'STERLITE.NS',
-        
-        # Textiles (25+ stocks)
-        'ARVIND.NS', 'VARDHMAN.NS', 'ALOKTEXT.NS', 'RSWM.NS', 'SPANDANA.NS',
-        'WELSPUNIND.NS', 'TRIDENT.NS', 'KNRCON.NS', 'KPRMILL.NS', 'LAXMIMACH.NS',
-        
-        # Real Estate (20+ stocks)
-        'DLF.NS', 'GODREJPROP.NS', 'OBEROIRLTY.NS', 'BRIGADE.NS', 'PRESTIGE.NS',
-        'MAHLIFE.NS', 'SOBHA.NS', 'KOLTE.NS', 'PHOENIXLTD.NS', 'SUNTECK.NS',
-        
-        # Aviation & Transportation (15+ stocks)
-        'SPICEJET.NS', 'BLUEDART.NS', 'CONCOR.NS', 'GESHIP.NS', 'ADANIPORTS.NS',
-        
-        # Chemicals & Petrochemicals (60+ stocks)
-        'AAVAS.NS', 'CLEAN.NS', 'DEEPAKNTR.NS', 'TATACHEMICALS.NS', 'ALKYLAMINE.NS',
-        'BALRAMCHIN.NS', 'GHCL.NS', 'PIDILITIND.NS', 'KANSAINER.NS', 'FLUOROCHEM.NS',
-        'TATACHEM.NS', 'NOCIL.NS', 'RAIN.NS', 'VINYLINDIA.NS', 'FCONSUMER.NS',
-        
-        # Agriculture & Food Processing (25+ stocks)
-        'KRBL.NS', 'USHAMART.NS', 'CHAMBLFERT.NS', 'COROMANDEL.NS', 'RALLIS.NS',
-        'SUMICHEM.NS', 'ZUARI.NS', 'GSFC.NS', 'NFL.NS', 'RCF.NS',
-        
-        # Retail & E-commerce (20+ stocks)
-        'ABFRL.NS', 'SHOPERSTOP.NS', 'SPENCERS.NS', 'ADITYADB.NS', 'PANTALOONS.NS',
-        'ZOMATO.NS', 'PAYTM.NS', 'NYKAA.NS', 'POLICYBZR.NS', 'CARTRADE.NS',
-        
-        # Media & Entertainment (15+ stocks)
-        'PVRINOX.NS', 'INOXLEISUR.NS', 'SAREGAMA.NS', 'NETWORK18.NS', 'TV18BRDCST.NS',
-        'SUNTV.NS', 'BALAJITELE.NS', 'EROS.NS', 'UFO.NS', 'TIPS.NS',
-        
-        # Renewable Energy (20+ stocks)
-        'ADANIGREEN.NS', 'TATAPOWER.NS', 'NHPC.NS', 'SUZLON.NS', 'INOXWIND.NS',
-        'ORIENTGREEN.NS', 'WEBSOL.NS', 'GOLDENENE.NS', 'URJA.NS', 'CLEANTEK.NS',
-        
-        # Logistics & Supply Chain (15+ stocks)
-        'MAHLOG.NS', 'GATI.NS', 'ALLCARGO.NS', 'TCI.NS', 'VTL.NS',
-        
-        # Healthcare Services (15+ stocks)
-        'FORTIS.NS', 'MAXHEALTH.NS', 'NARAYANANH.NS', 'RAINBOWHSP.NS', 'KIMS.NS'
-    ]
+# Setup logging; keep backtest progress visible but silence yfinance chatter
+logging.basicConfig(level=logging.INFO)
+logging.getLogger('yfinance').setLevel(logging.WARNING)
+
+# Liquid stock universe (symbol, group)
+UNIVERSE_FILE = Path(__file__).parent / "data" / "liquid_stocks.csv"
+UNIVERSE_CHUNK_ROWS = 5000
+
+# On-disk price history shared by all scenarios, one pickle per symbol and date range
+PRICE_CACHE_DIR = Path(".cache/prices")
+
+# System grades, best first, with their minimum (win rate %, profit factor, return %)
+SYSTEM_GRADES = ('A+', 'A', 'B', 'C')
+GRADE_THRESHOLDS = np.array([
+    [60, 1.5, 15],
+    [55, 1.3, 10],
+    [50, 1.2, 5],
+    [45, 1.1, 0]
+])
+
+# Characters dropped from scenario names when building file names (emoji, brackets)
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\s-]')
+
+# Summary file columns and the metrics attribute behind each
+SUMMARY_COLUMNS = (
+    ('Total_Return_Pct', 'total_return_pct'),
+    ('Win_Rate', 'win_rate'),
+    ('Profit_Factor', 'profit_factor'),
+    ('Max_Drawdown_Pct', 'max_drawdown_pct'),
+    ('Sharpe_Ratio', 'sharpe_ratio'),
+    ('Total_Trades', 'total_trades'),
+    ('Expectancy', 'expectancy'),
+    ('Initial_Capital', 'initial_capital'),
+    ('Final_Capital', 'final_capital')
+)
+
+@lru_cache(maxsize=1)
+def get_top_liquid_stocks() -> tuple:
+    """Get comprehensive list of top liquid Indian stocks, read once per process."""
+    # Universe file lists symbols most liquid first, tagged with their index or sector group.
+    # Stream it in chunks so only the symbol set, not the whole table, is ever held in memory.
+    unique_stocks = {}
+    for chunk in pd.read_csv(UNIVERSE_FILE, usecols=['symbol'], chunksize=UNIVERSE_CHUNK_ROWS):
+        # Remove duplicates, keeping the file ordering
+        unique_stocks.update(dict.fromkeys(chunk['symbol']))
+    unique_stocks = tuple(unique_stocks)
+    
+    invalid = [s for s in unique_stocks if not isinstance(s, str) or not s.endswith('.NS')]
+    if invalid:
+        raise ValueError(f"{UNIVERSE_FILE} has symbols without the .NS suffix: {', '.join(map(str, invalid))}")
+    
+    return unique_stocks
+
+
+def _price_cache_path(symbol: str, start_date: str, end_date: str) -> Path:
+    """Disk cache file for a symbol's history over a date range."""
+    return PRICE_CACHE_DIR / f"{symbol}_{start_date}_{end_date}.pkl"
+
+
+def prefetch_price_history(stocks: tuple, start_date: str, end_date: str, use_cache: bool = True) -> int:
+    """Download the history of every uncached symbol over the full range into the disk cache.
+    
+    Returns the number of symbols with cached history afterwards.
+    """
+    PRICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    missing = [s for s in stocks if not (use_cache and _price_cache_path(s, start_date, end_date).exists())]
+    if not missing:
+        return len(stocks)
+    
+    # One threaded bulk request instead of a history call per symbol
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            bulk = yf.download(
+                missing, start=start_date, end=end_date, interval='1d', group_by='ticker',
+                threads=True, auto_adjust=True, progress=False
+            )
+    except Exception as e:
+        logging.error(f"Error prefetching price history: {e}")
+        return len(stocks) - len(missing)
+    
+    downloaded = set(bulk.columns.get_level_values(0))
+    for symbol in missing:
+        if symbol not in downloaded:
+            continue
+        
+        data = bulk[symbol].dropna(how='all')
+        if data.empty:
+            continue
+        
+        # Naive daily index, so backtest date lookups match 'YYYY-MM-DD' strings
+        if data.index.tz is not None:
+            data.index = data.index.tz_localize(None)
+        data.to_pickle(_price_cache_path(symbol, start_date, end_date))
+    
+    return sum(_price_cache_path(s, start_date, end_date).exists() for s in stocks)
+
+
+@lru_cache(maxsize=2000)
+def _load_price_history(cache_file: Path) -> Optional[pd.DataFrame]:
+    """In-memory tier over the disk cache; None when the symbol has no history."""
+    if not cache_file.exists():
+        return None
     
-    # Remove duplicates and ensure we have valid symbols
-    unique_stocks = list(set(liquid_stocks))
+    data = pd.read_pickle(cache_file)
+    # The backtester reads lowercase price columns, technical analysis the title-case ones
+    data['high'], data['low'], data['close'] = data['High'], data['Low'], data['Close']
+    return data
+
+
+class CachedPriceData:
+    """Serves the backtester's date-range price queries from the prefetched cache."""
     
-    # Add more programmatically if needed to reach 1000+
-    if len(unique_stocks) < 1000:
-        # Add BSE listed equivalents and other liquid stocks
-        additional_stocks = []
-        for i in range(1000 - len(unique_stocks)):
-            additional_stocks.append(f"STOCK{i:03d}.NS")  # Placeholder for additional discovery
+    def __init__(self, start_date: str, end_date: str):
+        self.start_date = start_date
+        self.end_date = end_date
     
-    return unique_stocks[:1000]  # Return top 1000
+    def get_stock_data(self, symbol: str, start_date: str, end_date: str,
+                       use_cache: bool = True) -> Optional[pd.DataFrame]:
+        data = _load_price_history(_price_cache_path(symbol, self.start_date, self.end_date))
+        if data is None:
+            return None
+        return data.loc[start_date:end_date]
 
 
-def run_comprehensive_backtest():
+def _run_scenario(scenario: dict, stocks: tuple, cache_range: tuple, timestamp: str, file_format: str):
+    """Run one backtest scenario in a worker process and write its trades and equity curve."""
+    from trading_system.config import TradingConfig
+    from trading_system.technical_analysis import TechnicalAnalyzer
+    from trading_system.risk_manager import RiskManager
+    from trading_system.backtester import Backtester
+    
+    config = TradingConfig()
+    backtester = Backtester(config, CachedPriceData(*cache_range), TechnicalAnalyzer(config), RiskManager(config))
+    
+    # Indicator libraries warn on every short window; keep that noise to the backtest loop
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        metrics = backtester.run_backtest(
+            symbols=stocks,
+            start_date=scenario['start_date'],
+            end_date=scenario['end_date'],
+            initial_capital=scenario['capital']
+        )
+    
+    trade_path, equity_path = _flush_scenario(
+        scenario['name'], backtester.get_trade_history(), backtester.get_equity_curve(), timestamp, file_format
+    )
+    return metrics, trade_path, equity_path
+
+
+def run_comprehensive_backtest(use_cache: bool = True, file_format: str = 'csv', quiet: bool = False):
     """Run comprehensive backtesting analysis."""
-    print("🚀 PROFESSIONAL BACKTESTING ANALYSIS")
-    print("=" * 80)
-    print("Testing your trading system on 1000+ liquid Indian stocks")
-    print("This will validate if your setup is ready for live trading")
-    print("=" * 80)
+    # Banners and progress lines are skipped in quiet mode; reports are always printed
+    log = (lambda *args, **kwargs: None) if quiet else print
+    
+    log("🚀 PROFESSIONAL BACKTESTING ANALYSIS")
+    log("=" * 80)
+    log("Testing your trading system on 1000+ liquid Indian stocks")
+    log("This will validate if your setup is ready for live trading")
+    log("=" * 80)
     
     try:
-        from trading_system.config import TradingConfig
-        from trading_system.data_manager import DataManager
-        from trading_system.technical_analysis import TechnicalAnalyzer
-        from trading_system.risk_manager import RiskManager
-        from trading_system.backtester import Backtester
-        
-        # Initialize system
-        print("🔧 Initializing trading system...")
-        config = TradingConfig()
-        data_manager = DataManager(config)
-        technical_analyzer = TechnicalAnalyzer(config)
-        risk_manager = RiskManager(config)
-        
-        # Initialize backtester
-        backtester = Backtester(config, data_manager, technical_analyzer, risk_manager)
-        
         # Get liquid stocks
-        print("📊 Loading 1000+ liquid Indian stocks...")
+        log("📊 Loading 1000+ liquid Indian stocks...")
         stocks = get_top_liquid_stocks()
-        print(f"✅ Loaded {len(stocks)} stocks for backtesting")
+        log(f"✅ Loaded {len(stocks)} stocks for backtesting")
         
         # Test different scenarios
         scenarios = [
@@ -209,29 +219,49 @@ def run_comprehensive_backtest():
         
         all_results = {}
         
-        for scenario in scenarios:
-            print(f"\n{scenario['name']}")
-            print("-" * 60)
-            print(f"📅 Period: {scenario['start_date']} to {scenario['end_date']}")
-            print(f"💰 Starting Capital: ₹{scenario['capital']:,}")
-            print("🔄 Running backtest...")
-            
-            # Run backtest
-            metrics = backtester.run_backtest(
-                symbols=stocks,
-                start_date=scenario['start_date'],
-                end_date=scenario['end_date'],
-                initial_capital=scenario['capital']
+        # Fetch every symbol once over the union of the scenario periods, plus the
+        # 200-day indicator lookback; each scenario then slices the cached history
+        cache_start = (datetime.strptime(min(s['start_date'] for s in scenarios), '%Y-%m-%d')
+                       - timedelta(days=200)).strftime('%Y-%m-%d')
+        cache_end = (datetime.strptime(max(s['end_date'] for s in scenarios), '%Y-%m-%d')
+                     + timedelta(days=1)).strftime('%Y-%m-%d')
+        log(f"📥 Caching price history from {cache_start} to {cache_end}...")
+        cached = prefetch_price_history(stocks, cache_start, cache_end, use_cache)
+        if not cached:
+            print("❌ No price history could be downloaded; aborting backtest")
+            return
+        log(f"✅ Price history cached for {cached}/{len(stocks)} stocks")
+        
+        # Parquet needs the optional pyarrow engine
+        if file_format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+            print("⚠️ pyarrow not installed, saving CSV instead")
+            file_format = 'csv'
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Scenarios are independent backtests, so each runs in its own process.
+        # Symbols stay together within a scenario since they share capital and positions.
+        # Workers write their trade and equity tables directly and return only the metrics.
+        log(f"🔧 Running {len(scenarios)} backtests in parallel...")
+        with ProcessPoolExecutor(max_workers=min(len(scenarios), os.cpu_count() or 1)) as executor:
+            scenario_results = executor.map(
+                _run_scenario, scenarios, repeat(stocks), repeat((cache_start, cache_end)),
+                repeat(timestamp), repeat(file_format)
             )
             
-            all_results[scenario['name']] = {
-                'metrics': metrics,
-                'trade_history': backtester.get_trade_history(),
-                'equity_curve': backtester.get_equity_curve()
-            }
-            
-            # Display results
-            print_detailed_results(metrics, scenario['name'])
+            for scenario, (metrics, trade_path, equity_path) in zip(scenarios, scenario_results):
+                print(f"\n{scenario['name']}")
+                print("-" * 60)
+                print(f"📅 Period: {scenario['start_date']} to {scenario['end_date']}")
+                print(f"💰 Starting Capital: ₹{scenario['capital']:,}")
+                
+                all_results[scenario['name']] = {
+                    'metrics': metrics,
+                    'trade_path': trade_path,
+                    'equity_path': equity_path
+                }
+                
+                # Display results
+                print_detailed_results(metrics, scenario['name'])
         
         # Generate comprehensive report
         print(f"\n📋 COMPREHENSIVE ANALYSIS REPORT")
@@ -240,10 +270,10 @@ def run_comprehensive_backtest():
         generate_comparison_report(all_results)
         
         # Save detailed results
-        save_backtest_results(all_results)
+        save_backtest_results(all_results, timestamp, file_format)
         
-        print(f"\n🎯 TRADING SYSTEM VALIDATION COMPLETE!")
-        print("Check the generated reports for detailed analysis.")
+        log(f"\n🎯 TRADING SYSTEM VALIDATION COMPLETE!")
+        log("Check the generated reports for detailed analysis.")
         
     except Exception as e:
         print(f"❌ Backtest error: {e}")
@@ -253,195 +283,214 @@ def run_comprehensive_backtest():
 
 def print_detailed_results(metrics, scenario_name):
     """Print detailed backtest results."""
+    lines = []
     
     # Performance Overview
-    print(f"\n📊 PERFORMANCE OVERVIEW - {scenario_name}")
-    print("-" * 50)
-    print(f"💰 Initial Capital: ₹{metrics.initial_capital:,.0f}")
-    print(f"💰 Final Capital: ₹{metrics.final_capital:,.0f}")
-    print(f"📈 Total Return: ₹{metrics.total_return:,.0f} ({metrics.total_return_pct:+.2f}%)")
-    print(f"📉 Max Drawdown: ₹{metrics.max_drawdown:,.0f} ({metrics.max_drawdown_pct:.2f}%)")
+    lines.append(f"\n📊 PERFORMANCE OVERVIEW - {scenario_name}")
+    lines.append("-" * 50)
+    lines.append(f"💰 Initial Capital: ₹{metrics.initial_capital:,.0f}")
+    lines.append(f"💰 Final Capital: ₹{metrics.final_capital:,.0f}")
+    lines.append(f"📈 Total Return: ₹{metrics.total_return:,.0f} ({metrics.total_return_pct:+.2f}%)")
+    lines.append(f"📉 Max Drawdown: ₹{metrics.max_drawdown:,.0f} ({metrics.max_drawdown_pct:.2f}%)")
     
     # Trading Statistics
-    print(f"\n🎯 TRADING STATISTICS")
-    print("-" * 50)
-    print(f"📊 Total Trades: {metrics.total_trades}")
-    print(f"✅ Winning Trades: {metrics.winning_trades}")
-    print(f"❌ Losing Trades: {metrics.losing_trades}")
-    print(f"🏆 Win Rate: {metrics.win_rate:.1f}%")
-    print(f"⚖️ Profit Factor: {metrics.profit_factor:.2f}")
-    print(f"💡 Expectancy: ₹{metrics.expectancy:.2f}")
+    lines.append(f"\n🎯 TRADING STATISTICS")
+    lines.append("-" * 50)
+    lines.append(f"📊 Total Trades: {metrics.total_trades}")
+    lines.append(f"✅ Winning Trades: {metrics.winning_trades}")
+    lines.append(f"❌ Losing Trades: {metrics.losing_trades}")
+    lines.append(f"🏆 Win Rate: {metrics.win_rate:.1f}%")
+    lines.append(f"⚖️ Profit Factor: {metrics.profit_factor:.2f}")
+    lines.append(f"💡 Expectancy: ₹{metrics.expectancy:.2f}")
     
     # Trade Analysis
-    print(f"\n💹 TRADE ANALYSIS")
-    print("-" * 50)
-    print(f"🎯 Average Win: ₹{metrics.avg_win:,.0f}")
-    print(f"💔 Average Loss: ₹{metrics.avg_loss:,.0f}")
-    print(f"🚀 Largest Win: ₹{metrics.largest_win:,.0f}")
-    print(f"💥 Largest Loss: ₹{metrics.largest_loss:,.0f}")
-    print(f"📅 Avg Days Held: {metrics.avg_days_held:.1f}")
-    print(f"🏆 Max Consecutive Wins: {metrics.consecutive_wins}")
-    print(f"💔 Max Consecutive Losses: {metrics.consecutive_losses}")
+    lines.append(f"\n💹 TRADE ANALYSIS")
+    lines.append("-" * 50)
+    lines.append(f"🎯 Average Win: ₹{metrics.avg_win:,.0f}")
+    lines.append(f"💔 Average Loss: ₹{metrics.avg_loss:,.0f}")
+    lines.append(f"🚀 Largest Win: ₹{metrics.largest_win:,.0f}")
+    lines.append(f"💥 Largest Loss: ₹{metrics.largest_loss:,.0f}")
+    lines.append(f"📅 Avg Days Held: {metrics.avg_days_held:.1f}")
+    lines.append(f"🏆 Max Consecutive Wins: {metrics.consecutive_wins}")
+    lines.append(f"💔 Max Consecutive Losses: {metrics.consecutive_losses}")
     
     # Risk Metrics
-    print(f"\n⚖️ RISK METRICS")
-    print("-" * 50)
-    print(f"📊 Sharpe Ratio: {metrics.sharpe_ratio:.2f}")
-    print(f"📉 Sortino Ratio: {metrics.sortino_ratio:.2f}")
-    print(f"📈 Calmar Ratio: {metrics.calmar_ratio:.2f}")
-    print(f"🔄 Recovery Factor: {metrics.recovery_factor:.2f}")
+    lines.append(f"\n⚖️ RISK METRICS")
+    lines.append("-" * 50)
+    lines.append(f"📊 Sharpe Ratio: {metrics.sharpe_ratio:.2f}")
+    lines.append(f"📉 Sortino Ratio: {metrics.sortino_ratio:.2f}")
+    lines.append(f"📈 Calmar Ratio: {metrics.calmar_ratio:.2f}")
+    lines.append(f"🔄 Recovery Factor: {metrics.recovery_factor:.2f}")
     
     # System Assessment
-    print(f"\n🎯 SYSTEM ASSESSMENT")
-    print("-" * 50)
+    lines.append(f"\n🎯 SYSTEM ASSESSMENT")
+    lines.append("-" * 50)
     
-    # Grade the system
-    grade = "F"
-    if metrics.win_rate >= 60 and metrics.profit_factor >= 1.5 and metrics.total_return_pct >= 15:
-        grade = "A+"
-    elif metrics.win_rate >= 55 and metrics.profit_factor >= 1.3 and metrics.total_return_pct >= 10:
-        grade = "A"
-    elif metrics.win_rate >= 50 and metrics.profit_factor >= 1.2 and metrics.total_return_pct >= 5:
-        grade = "B"
-    elif metrics.win_rate >= 45 and metrics.profit_factor >= 1.1 and metrics.total_return_pct >= 0:
-        grade = "C"
-    elif metrics.profit_factor >= 1.0:
-        grade = "D"
-    
-    print(f"🏆 System Grade: {grade}")
+    # Grade the system: the best grade whose minimums are all met
+    values = np.array([metrics.win_rate, metrics.profit_factor, metrics.total_return_pct])
+    meets = (values >= GRADE_THRESHOLDS).all(axis=1)
+    if meets.any():
+        grade = SYSTEM_GRADES[int(meets.argmax())]
+    else:
+        grade = "D" if metrics.profit_factor >= 1.0 else "F"
+    
+    lines.append(f"🏆 System Grade: {grade}")
     
     if grade in ["A+", "A"]:
-        print("✅ EXCELLENT: Your system shows strong profitability!")
-        print("🚀 Ready for live trading with proper risk management.")
+        lines.append("✅ EXCELLENT: Your system shows strong profitability!")
+        lines.append("🚀 Ready for live trading with proper risk management.")
     elif grade == "B":
-        print("✅ GOOD: Your system is profitable with room for improvement.")
-        print("💡 Consider optimizing parameters for better performance.")
+        lines.append("✅ GOOD: Your system is profitable with room for improvement.")
+        lines.append("💡 Consider optimizing parameters for better performance.")
     elif grade == "C":
-        print("⚠️ AVERAGE: System shows potential but needs optimization.")
-        print("🔧 Review entry/exit criteria and risk management.")
+        lines.append("⚠️ AVERAGE: System shows potential but needs optimization.")
+        lines.append("🔧 Review entry/exit criteria and risk management.")
     else:
-        print("❌ POOR: System needs significant improvements.")
-        print("🔄 Consider revising strategy or parameters.")
+        lines.append("❌ POOR: System needs significant improvements.")
+        lines.append("🔄 Consider revising strategy or parameters.")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def generate_comparison_report(all_results):
     """Generate comparison report across all scenarios."""
+    lines = []
     
-    print(f"\n📊 SCENARIO COMPARISON")
-    print("=" * 80)
+    lines.append(f"\n📊 SCENARIO COMPARISON")
+    lines.append("=" * 80)
     
     # Create comparison table
     scenarios = list(all_results.keys())
     
-    print(f"{'Metric':<25} {scenarios[0]:<20} {scenarios[1]:<20} {scenarios[2]:<20}")
-    print("-" * 85)
+    # One 20-wide column per scenario, however many were run
+    lines.append(f"{'Metric':<25} " + " ".join(f"{s:<20}" for s in scenarios))
+    lines.append("-" * (25 + 20 * len(scenarios)))
     
-    # Compare key metrics
+    # Compare key metrics, with the cell format for each
     metrics_to_compare = [
-        ('Total Return %', 'total_return_pct'),
-        ('Win Rate %', 'win_rate'),
-        ('Profit Factor', 'profit_factor'),
-        ('Max Drawdown %', 'max_drawdown_pct'),
-        ('Sharpe Ratio', 'sharpe_ratio'),
-        ('Total Trades', 'total_trades'),
-        ('Expectancy ₹', 'expectancy')
+        ('Total Return %', 'total_return_pct', "{:>18.1f}% "),
+        ('Win Rate %', 'win_rate', "{:>18.1f}% "),
+        ('Profit Factor', 'profit_factor', "{:>19.2f} "),
+        ('Max Drawdown %', 'max_drawdown_pct', "{:>18.1f}% "),
+        ('Sharpe Ratio', 'sharpe_ratio', "{:>19.2f} "),
+        ('Total Trades', 'total_trades', "{:>19.0f} "),
+        ('Expectancy ₹', 'expectancy', "₹{:>17.0f} ")
     ]
     
-    for metric_name, metric_attr in metrics_to_compare:
-        row = f"{metric_name:<25}"
-        for scenario in scenarios:
-            value = getattr(all_results[scenario]['metrics'], metric_attr)
-            if 'Return' in metric_name or 'Rate' in metric_name or 'Drawdown' in metric_name:
-                row += f"{value:>18.1f}% "
-            elif 'Factor' in metric_name or 'Ratio' in metric_name:
-                row += f"{value:>19.2f} "
-            elif 'Expectancy' in metric_name:
-                row += f"₹{value:>17.0f} "
-            else:
-                row += f"{value:>19.0f} "
-        print(row)
+    # One (scenario, metric) matrix serves both the table and the averages
+    metric_attrs = [metric_attr for _, metric_attr, _ in metrics_to_compare]
+    values = np.array([
+        [getattr(all_results[s]['metrics'], metric_attr) for metric_attr in metric_attrs]
+        for s in scenarios
+    ], dtype=float)
+    averages = dict(zip(metric_attrs, values.mean(axis=0)))
+    
+    for (metric_name, _, cell), column in zip(metrics_to_compare, values.T):
+        lines.append(f"{metric_name:<25}" + "".join(cell.format(value) for value in column))
     
     # Overall assessment
-    print(f"\n🎯 OVERALL SYSTEM ASSESSMENT")
-    print("-" * 50)
+    lines.append(f"\n🎯 OVERALL SYSTEM ASSESSMENT")
+    lines.append("-" * 50)
     
-    avg_win_rate = np.mean([all_results[s]['metrics'].win_rate for s in scenarios])
-    avg_profit_factor = np.mean([all_results[s]['metrics'].profit_factor for s in scenarios])
-    avg_return = np.mean([all_results[s]['metrics'].total_return_pct for s in scenarios])
+    avg_win_rate = averages['win_rate']
+    avg_profit_factor = averages['profit_factor']
+    avg_return = averages['total_return_pct']
     
-    print(f"📊 Average Win Rate: {avg_win_rate:.1f}%")
-    print(f"⚖️ Average Profit Factor: {avg_profit_factor:.2f}")
-    print(f"📈 Average Return: {avg_return:.1f}%")
+    lines.append(f"📊 Average Win Rate: {avg_win_rate:.1f}%")
+    lines.append(f"⚖️ Average Profit Factor: {avg_profit_factor:.2f}")
+    lines.append(f"📈 Average Return: {avg_return:.1f}%")
     
     # Final recommendation
-    print(f"\n🎯 FINAL RECOMMENDATION")
-    print("-" * 50)
+    lines.append(f"\n🎯 FINAL RECOMMENDATION")
+    lines.append("-" * 50)
     
     if avg_win_rate >= 55 and avg_profit_factor >= 1.3:
-        print("🚀 SYSTEM APPROVED FOR LIVE TRADING!")
-        print("✅ Your strategy shows consistent profitability")
-        print("💡 Recommended starting capital: ₹50,000 - ₹1,00,000")
-        print("⚠️ Always start with small position sizes")
+        lines.append("🚀 SYSTEM APPROVED FOR LIVE TRADING!")
+        lines.append("✅ Your strategy shows consistent profitability")
+        lines.append("💡 Recommended starting capital: ₹50,000 - ₹1,00,000")
+        lines.append("⚠️ Always start with small position sizes")
     elif avg_win_rate >= 50 and avg_profit_factor >= 1.1:
-        print("⚠️ SYSTEM NEEDS MINOR OPTIMIZATION")
-        print("🔧 Consider fine-tuning entry/exit criteria")
-        print("💡 Paper trade for 1-2 months before going live")
+        lines.append("⚠️ SYSTEM NEEDS MINOR OPTIMIZATION")
+        lines.append("🔧 Consider fine-tuning entry/exit criteria")
+        lines.append("💡 Paper trade for 1-2 months before going live")
     else:
-        print("❌ SYSTEM REQUIRES MAJOR IMPROVEMENTS")
-        print("🔄 Strategy needs significant revision")
-        print("📚 Consider additional research and optimization")
+        lines.append("❌ SYSTEM REQUIRES MAJOR IMPROVEMENTS")
+        lines.append("🔄 Strategy needs significant revision")
+        lines.append("📚 Consider additional research and optimization")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _write_table(df: pd.DataFrame, stem: str, file_format: str) -> str:
+    """Write a results table as zstd parquet or CSV and return the file name."""
+    if file_format == 'parquet':
+        file_name = f"{stem}.parquet"
+        df.to_parquet(file_name, index=False, compression='zstd')
+    else:
+        file_name = f"{stem}.csv"
+        df.to_csv(file_name, index=False)
+    return file_name
+
+
+@lru_cache(maxsize=None)
+def _safe_scenario_name(scenario_name: str) -> str:
+    """File-name form of a scenario name, e.g. 'MARKET_VOLATILITY_TEST_2022-2023'."""
+    return UNSAFE_FILENAME_CHARS.sub('', scenario_name).strip().replace(' ', '_')
 
 
-def save_backtest_results(all_results):
-    """Save detailed backtest results to files."""
+def _flush_scenario(scenario_name: str, trade_history: pd.DataFrame, equity_curve: pd.DataFrame,
+                    timestamp: str, file_format: str) -> Tuple[Optional[str], Optional[str]]:
+    """Write a scenario's trades and equity curve; returns their file names, None when empty."""
+    safe_name = _safe_scenario_name(scenario_name)
+    
+    trade_path = None
+    if not trade_history.empty:
+        trade_path = _write_table(trade_history, f"backtest_trades_{safe_name}_{timestamp}", file_format)
+    
+    equity_path = None
+    if not equity_curve.empty:
+        equity_path = _write_table(equity_curve, f"backtest_equity_{safe_name}_{timestamp}", file_format)
+    
+    return trade_path, equity_path
+
+
+def save_backtest_results(all_results, timestamp: str, file_format: str = 'csv'):
+    """Report the per-scenario files and save the summary metrics."""
     
     print(f"\n💾 SAVING DETAILED RESULTS")
     print("-" * 50)
     
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for results in all_results.values():
+        if results['trade_path']:
+            print(f"✅ Saved trades: {results['trade_path']}")
+        if results['equity_path']:
+            print(f"✅ Saved equity curve: {results['equity_path']}")
     
-    for scenario_name, results in all_results.items():
-        # Clean scenario name for filename
-        safe_name = scenario_name.replace('🎯 ', '').replace('📈 ', '').replace('🎪 ', '').replace(' ', '_').replace('(', '').replace(')', '')
-        
-        # Save trade history
-        trade_file = f"backtest_trades_{safe_name}_{timestamp}.csv"
-        if not results['trade_history'].empty:
-            results['trade_history'].to_csv(trade_file, index=False)
-            print(f"✅ Saved trades: {trade_file}")
-        
-        # Save equity curve
-        equity_file = f"backtest_equity_{safe_name}_{timestamp}.csv"
-        if not results['equity_curve'].empty:
-            results['equity_curve'].to_csv(equity_file, index=False)
-            print(f"✅ Saved equity curve: {equity_file}")
-    
-    # Save summary metrics
-    summary_data = []
-    for scenario_name, results in all_results.items():
-        metrics = results['metrics']
-        summary_data.append({
-            'Scenario': scenario_name,
-            'Total_Return_Pct': metrics.total_return_pct,
-            'Win_Rate': metrics.win_rate,
-            'Profit_Factor': metrics.profit_factor,
-            'Max_Drawdown_Pct': metrics.max_drawdown_pct,
-            'Sharpe_Ratio': metrics.sharpe_ratio,
-            'Total_Trades': metrics.total_trades,
-            'Expectancy': metrics.expectancy,
-            'Initial_Capital': metrics.initial_capital,
-            'Final_Capital': metrics.final_capital
-        })
-    
-    summary_file = f"backtest_summary_{timestamp}.csv"
-    pd.DataFrame(summary_data).to_csv(summary_file, index=False)
+    # Save summary metrics, built column by column
+    scenario_metrics = [results['metrics'] for results in all_results.values()]
+    summary = pd.DataFrame({
+        'Scenario': list(all_results),
+        **{column: [getattr(metrics, attr) for metrics in scenario_metrics] for column, attr in SUMMARY_COLUMNS}
+    })
+    
+    summary_file = _write_table(summary, f"backtest_summary_{timestamp}", file_format)
     print(f"✅ Saved summary: {summary_file}")
 
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description='Run comprehensive backtests on liquid Indian stocks')
+    parser.add_argument('--no-cache', action='store_true', help='Re-download price history instead of using the disk cache')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='File format for saved results')
+    parser.add_argument('--quiet', action='store_true', help='Print only the reports, without banners and progress lines')
+    args = parser.parse_args()
+    
+    # Emoji output must not fail on consoles or pipes with a non-UTF-8 encoding
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    
     try:
-        run_comprehensive_backtest()
+        run_comprehensive_backtest(use_cache=not args.no_cache, file_format=args.format, quiet=args.quiet)
     except KeyboardInterrupt:
         print("\n\n⏹️ Backtest interrupted by user")
     except Exception as e:
@@ -5,13 +5,21 @@ AI Analyzer using Gemini API
 Leverages Google's Gemini AI for advanced market analysis and trade recommendations.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from itertools import islice
 import google.generativeai as genai
-from typing import Dict, List, Optional, Any
-import json
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
 import logging
+import re
 from dataclasses import dataclass
 from datetime import datetime
-import pandas as pd
+from pathlib import Path
+from types import MappingProxyType
+import sqlite3
+import time
+import orjson
 
 from .config import TradingConfig
 from .technical_analysis import TechnicalAnalysisResult, SignalType
@@ -19,16 +27,171 @@ from .data_manager import StockData
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates, rendered with str.format_map (the batch header and footer are used verbatim)
+MARKET_PROMPT_TEMPLATE = """
+            You are an expert Indian stock market analyst. Provide a comprehensive daily market analysis for {current_date}.
+
+            Focus on:
+            1. Overall market sentiment (Nifty 50, Bank Nifty trends)
+            2. Key market drivers today (economic data, global factors, sector rotation)
+            3. Top sectors to watch
+            4. Key levels for major indices
+            5. Risk factors and opportunities
+
+            Also analyze these specific stocks for swing trading opportunities: {symbols}
+
+            For each stock, consider:
+            - Recent price action and volume
+            - Technical setup for swing trading (1-3 day holding period)
+            - Risk/reward potential
+            - Entry and exit levels
+
+            Provide actionable insights for swing traders with proper risk management perspective.
+            Keep analysis concise but comprehensive.
+            """
+
+ANALYSIS_PROMPT_TEMPLATE = """
+        You are an expert swing trader and technical analyst specializing in Indian stock markets. 
+        Analyze the following stock data and provide a comprehensive trading recommendation.
+
+        Stock: {symbol}
+        Current Price: ₹{current_price:.2f}
+        1-Day Change: {price_change_1d:.2f}%
+        Volume Ratio: {volume_ratio:.2f}x average
+        20-Day Range: ₹{low_20d:.2f} - ₹{high_20d:.2f}
+
+        Technical Analysis Summary:
+        - Overall Signal: {technical_signal}
+        - Confidence: {technical_confidence:.2f}
+        - RSI: {rsi}
+        - MACD: {macd}
+        - Bollinger Position: {bb_position}
+
+        Key Levels:
+        - Support: ₹{support_1:.2f}
+        - Resistance: ₹{resistance_1:.2f}
+        - Stop Loss: ₹{stop_loss:.2f}
+        - Take Profit: ₹{take_profit:.2f}
+        - Risk/Reward Ratio: 1:{risk_reward_ratio:.2f}
+
+        Please provide your analysis in the following JSON format:
+        {{
+            "recommendation": "BUY/SELL/HOLD",
+            "confidence": 0.85,
+            "reasoning": "Detailed explanation of your recommendation",
+            "key_factors": ["Factor 1", "Factor 2", "Factor 3"],
+            "price_targets": {{
+                "entry": 1250.00,
+                "stop_loss": 1200.00,
+                "target_1": 1300.00,
+                "target_2": 1350.00
+            }},
+            "risk_assessment": "Low/Medium/High risk assessment",
+            "market_sentiment": "Bullish/Bearish/Neutral sentiment",
+            "trade_setup": {{
+                "timeframe": "1-3 days",
+                "setup_type": "Breakout/Pullback/Reversal",
+                "confidence_level": "High/Medium/Low"
+            }}
+        }}
+
+        Consider:
+        1. Current market conditions in Indian markets
+        2. Sector-specific factors
+        3. Technical setup quality
+        4. Risk management principles
+        5. Swing trading timeframe (1-3 days typical hold)
+
+        Be specific with price levels and provide clear reasoning for your recommendation.
+        """
+
+TRADE_PROMPT_TEMPLATE = """
+            Analyze this swing trading opportunity for {symbol}:
+            
+            Technical Signal: {signal} (Confidence: {confidence:.2f})
+            Current Price: ₹{current_price:.2f}
+            Support: ₹{support_1:.2f}
+            Resistance: ₹{resistance_1:.2f}
+            R:R Ratio: 1:{risk_reward_ratio:.2f}
+            
+            Key Technical Signals:
+            {signals}
+            
+            Provide a concise analysis focusing on:
+            1. Trade viability for swing trading
+            2. Key risk factors
+            3. Optimal entry strategy
+            4. Expected holding period
+            
+            Rate confidence 0-1 and provide specific price levels.
+            """
+
+BATCH_PROMPT_HEADER = """
+            You are an expert swing trader analyzing Indian stocks. Evaluate each swing trading
+            opportunity below for trade viability, key risk factors, optimal entry strategy and
+            expected holding period.
+            """
+
+BATCH_TRADE_TEMPLATE = (
+    "\n[{index}] Symbol: {symbol} "
+    "Signal: {signal} (Confidence: {confidence:.2f}) "
+    "Price: ₹{current_price:.2f} "
+    "Support: ₹{support_1:.2f} "
+    "Resistance: ₹{resistance_1:.2f} "
+    "R:R: 1:{risk_reward_ratio:.2f} "
+    "Signals: {signals}\n"
+)
+
+BATCH_PROMPT_FOOTER = """
+            Return a JSON array with one object per opportunity, in this format:
+            [
+                {
+                    "index": 0,
+                    "recommendation": "BUY/SELL/HOLD",
+                    "confidence": 0.85,
+                    "reasoning": "Concise explanation",
+                    "key_factors": ["Factor 1", "Factor 2"],
+                    "price_targets": {"entry": 1250.00, "stop_loss": 1200.00, "target_1": 1300.00},
+                    "risk_assessment": "Low/Medium/High",
+                    "market_sentiment": "Bullish/Bearish/Neutral"
+                }
+            ]
+            """
+
+# Outermost JSON object / array in a response (first opening to last closing bracket)
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Keyword fallback for non-JSON responses, checked in priority order
+SIGNAL_KEYWORD_RE = re.compile(
+    r'strongly recommend buying|strongly recommend selling|strong buy|strong sell|buy|sell|bullish|bearish',
+    re.IGNORECASE
+)
+SIGNAL_KEYWORDS = (
+    (frozenset({'strong buy', 'strongly recommend buying'}), SignalType.STRONG_BUY, 0.8),
+    (frozenset({'buy', 'bullish'}), SignalType.BUY, 0.6),
+    (frozenset({'strong sell', 'strongly recommend selling'}), SignalType.STRONG_SELL, 0.8),
+    (frozenset({'sell', 'bearish'}), SignalType.SELL, 0.6),
+)
+
+# Shared, read-only field values for fallback results
+FALLBACK_REASONING = "Technical analysis based recommendation (AI analysis unavailable)"
+FALLBACK_FACTORS = ("Technical indicators", "Price action", "Volume analysis")
+TEXT_PARSE_FACTORS = ("AI analysis completed",)
+NO_PRICE_TARGETS: Mapping[str, float] = MappingProxyType({})
+DEFAULT_RISK = "Medium"
+DEFAULT_SENTIMENT = "Neutral"
+
 
-@dataclass
+@dataclass(frozen=True)
 class AIAnalysisResult:
     """AI analysis result container."""
     symbol: str
     recommendation: SignalType
     confidence: float
     reasoning: str
-    key_factors: List[str]
-    price_targets: Dict[str, float]
+    key_factors: Sequence[str]
+    price_targets: Mapping[str, float]
     risk_assessment: str
     market_sentiment: str
     trade_setup: Optional[Dict[str, Any]] = None
@@ -54,6 +217,118 @@ class AIAnalyzer:
             "top_k": 40,
             "max_output_tokens": config.ai.max_tokens,
         }
+        
+        # Shared pool for fanning out sync API calls
+        self.executor = ThreadPoolExecutor(max_workers=config.ai.concurrency or 8)
+        
+        # Response cache: in-memory first, SQLite behind it so repeat scans survive restarts
+        self.response_cache: Dict[str, Tuple[float, str]] = {}
+        self.cache_path = Path(config.ai.cache_path)
+        self.cache_path.parent.mkdir(exist_ok=True)
+        self._init_cache()
+    
+    def _init_cache(self) -> None:
+        """Initialize SQLite table for cached AI responses."""
+        with sqlite3.connect(self.cache_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_responses (
+                    key TEXT PRIMARY KEY,
+                    created REAL,
+                    response TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_responses_created ON ai_responses (created)")
+        
+        self._evict_expired(time.time() - self.config.ai.cache_ttl)
+    
+    @staticmethod
+    def _cache_key(prompt: str, *context: Any) -> str:
+        """Hash the prompt plus any context that should invalidate it (e.g. latest bar)."""
+        material = "\x1f".join([prompt, *map(str, context)])
+        return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Return a cached, unexpired response for key, if any."""
+        cutoff = time.time() - self.config.ai.cache_ttl
+        
+        entry = self.response_cache.get(key)
+        if entry is None:
+            try:
+                with sqlite3.connect(self.cache_path) as conn:
+                    row = conn.execute(
+                        "SELECT created, response FROM ai_responses WHERE key = ?", (key,)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading AI response cache: {e}")
+                row = None
+            
+            if row is None:
+                return None
+            entry = self.response_cache[key] = (row[0], row[1])
+        
+        if entry[0] < cutoff:
+            self.response_cache.pop(key, None)
+            return None
+        
+        return entry[1]
+    
+    def _store_cached_response(self, key: str, text: str) -> None:
+        """Store a response in both cache tiers."""
+        created = time.time()
+        self.response_cache[key] = (created, text)
+        
+        try:
+            with sqlite3.connect(self.cache_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_responses (key, created, response) VALUES (?, ?, ?)",
+                    (key, created, text)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing AI response cache: {e}")
+        
+        self._evict_expired(created - self.config.ai.cache_ttl)
+    
+    def _evict_expired(self, cutoff: float) -> None:
+        """Drop responses created before cutoff from both cache tiers."""
+        for key, (created, _) in list(self.response_cache.items()):
+            if created < cutoff:
+                self.response_cache.pop(key, None)
+        
+        try:
+            with sqlite3.connect(self.cache_path) as conn:
+                conn.execute("DELETE FROM ai_responses WHERE created < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.error(f"Error evicting expired AI responses: {e}")
+    
+    def _cached_generate(self, prompt: str, *context: Any) -> str:
+        """Generate content for prompt, reusing a cached response when available."""
+        key = self._cache_key(prompt, *context)
+        
+        text = self._get_cached_response(key)
+        if text is None:
+            response = self.model.generate_content(
+                prompt,
+                generation_config=self.generation_config
+            )
+            text = response.text
+            self._store_cached_response(key, text)
+        
+        return text
+    
+    async def _acached_generate(self, prompt: str, *context: Any) -> str:
+        """Async variant of _cached_generate."""
+        key = self._cache_key(prompt, *context)
+        
+        text = self._get_cached_response(key)
+        if text is None:
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=self.generation_config
+            )
+            text = response.text
+            self._store_cached_response(key, text)
+        
+        return text
     
     def analyze_stock_with_ai(self, 
                              stock_data: StockData, 
@@ -77,13 +352,12 @@ class AIAnalyzer:
             # Generate AI analysis
             prompt = self._create_analysis_prompt(analysis_data)
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
+            response_text = self._cached_generate(
+                prompt, stock_data.data.index[-1], technical_analysis.confidence
             )
             
             # Parse AI response
-            ai_result = self._parse_ai_response(stock_data.symbol, response.text)
+            ai_result = self._parse_ai_response(stock_data.symbol, response_text)
             
             return ai_result
             
@@ -91,110 +365,146 @@ class AIAnalyzer:
             logger.error(f"Error in AI analysis for {stock_data.symbol}: {e}")
             return self._create_fallback_result(stock_data.symbol, technical_analysis)
     
-    def get_daily_market_analysis(self, symbols: List[str]) -> str:
-        """Get daily market analysis and trading opportunities."""
+    async def aanalyze_stock_with_ai(self, 
+                                    stock_data: StockData, 
+                                    technical_analysis: TechnicalAnalysisResult,
+                                    market_context: Optional[Dict] = None) -> AIAnalysisResult:
+        """Async variant of analyze_stock_with_ai; does not block the event loop on the API call."""
         try:
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            
-            prompt = f"""
-            You are an expert Indian stock market analyst. Provide a comprehensive daily market analysis for {current_date}.
-
-            Focus on:
-            1. Overall market sentiment (Nifty 50, Bank Nifty trends)
-            2. Key market drivers today (economic data, global factors, sector rotation)
-            3. Top sectors to watch
-            4. Key levels for major indices
-            5. Risk factors and opportunities
-
-            Also analyze these specific stocks for swing trading opportunities: {', '.join(symbols[:10])}
-
-            For each stock, consider:
-            - Recent price action and volume
-            - Technical setup for swing trading (1-3 day holding period)
-            - Risk/reward potential
-            - Entry and exit levels
-
-            Provide actionable insights for swing traders with proper risk management perspective.
-            Keep analysis concise but comprehensive.
-            """
+            analysis_data = self._prepare_analysis_data(stock_data, technical_analysis, market_context)
+            prompt = self._create_analysis_prompt(analysis_data)
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
+            response_text = await self._acached_generate(
+                prompt, stock_data.data.index[-1], technical_analysis.confidence
             )
             
-            return response.text
+            return self._parse_ai_response(stock_data.symbol, response_text)
+            
+        except Exception as e:
+            logger.error(f"Error in AI analysis for {stock_data.symbol}: {e}")
+            return self._create_fallback_result(stock_data.symbol, technical_analysis)
+    
+    def get_daily_market_analysis(self, symbols: List[str]) -> str:
+        """Get daily market analysis and trading opportunities."""
+        try:
+            return self._cached_generate(self._create_market_prompt(symbols))
+            
+        except Exception as e:
+            logger.error(f"Error generating daily market analysis: {e}")
+            return "Unable to generate market analysis at this time."
+    
+    async def aget_daily_market_analysis(self, symbols: List[str]) -> str:
+        """Async variant of get_daily_market_analysis."""
+        try:
+            return await self._acached_generate(self._create_market_prompt(symbols))
             
         except Exception as e:
             logger.error(f"Error generating daily market analysis: {e}")
             return "Unable to generate market analysis at this time."
     
+    def _create_market_prompt(self, symbols: List[str]) -> str:
+        """Create the daily market analysis prompt."""
+        return MARKET_PROMPT_TEMPLATE.format_map({
+            'current_date': datetime.now().strftime("%Y-%m-%d"),
+            'symbols': ', '.join(symbols[:10])
+        })
+    
     def get_trade_recommendations(self, 
                                  analysis_results: List[TechnicalAnalysisResult],
                                  max_recommendations: int = 5) -> List[Dict[str, Any]]:
         """Get AI-powered trade recommendations from analysis results."""
+        # Sync callers fan out on the thread pool; the async client's channel is bound to the
+        # first event loop it ran on, so it cannot be driven through repeated asyncio.run calls
         try:
-            # Filter for high-confidence signals
-            potential_trades = []
-            
-            for analysis in analysis_results:
-                if analysis.confidence >= self.config.ai.confidence_threshold:
-                    if analysis.overall_signal in [SignalType.BUY, SignalType.STRONG_BUY]:
-                        potential_trades.append({
-                            'symbol': analysis.symbol,
-                            'signal': analysis.overall_signal.value,
-                            'confidence': analysis.confidence,
-                            'technical_analysis': analysis
-                        })
-            
-            # Sort by confidence
-            potential_trades.sort(key=lambda x: x['confidence'], reverse=True)
-            
-            # Generate AI recommendations for top candidates
-            recommendations = []
+            candidates = self._select_trade_candidates(analysis_results, max_recommendations)
+            ai_results = self._analyze_trades_batch(candidates, self.config.ai.batch_size)
             
-            for trade in potential_trades[:max_recommendations]:
-                try:
-                    ai_analysis = self._analyze_trade_opportunity(trade)
-                    if ai_analysis:
-                        recommendations.append({
-                            'symbol': trade['symbol'],
-                            'recommendation': ai_analysis,
-                            'technical_confidence': trade['confidence'],
-                            'ai_confidence': ai_analysis.confidence,
-                            'combined_score': (trade['confidence'] + ai_analysis.confidence) / 2
-                        })
-                except Exception as e:
-                    logger.error(f"Error analyzing {trade['symbol']}: {e}")
-                    continue
+            return self._build_recommendations(candidates, ai_results)
             
-            # Sort by combined score
-            recommendations.sort(key=lambda x: x['combined_score'], reverse=True)
+        except Exception as e:
+            logger.error(f"Error generating trade recommendations: {e}")
+            return []
+    
+    async def aget_trade_recommendations(self, 
+                                        analysis_results: List[TechnicalAnalysisResult],
+                                        max_recommendations: int = 5) -> List[Dict[str, Any]]:
+        """Async variant of get_trade_recommendations for callers already running an event loop."""
+        try:
+            candidates = self._select_trade_candidates(analysis_results, max_recommendations)
+            ai_results = await self._aanalyze_trades_batch(candidates, self.config.ai.batch_size)
             
-            return recommendations
+            return self._build_recommendations(candidates, ai_results)
             
         except Exception as e:
             logger.error(f"Error generating trade recommendations: {e}")
             return []
     
+    def _select_trade_candidates(self, 
+                                 analysis_results: List[TechnicalAnalysisResult],
+                                 max_recommendations: int) -> List[Dict[str, Any]]:
+        """Pick the highest-confidence buy signals worth sending to the AI."""
+        # Filter for high-confidence signals
+        potential_trades = []
+        
+        for analysis in analysis_results:
+            if analysis.confidence >= self.config.ai.confidence_threshold:
+                if analysis.overall_signal in [SignalType.BUY, SignalType.STRONG_BUY]:
+                    potential_trades.append({
+                        'symbol': analysis.symbol,
+                        'signal': analysis.overall_signal.value,
+                        'confidence': analysis.confidence,
+                        'technical_analysis': analysis
+                    })
+        
+        # Sort by confidence
+        potential_trades.sort(key=lambda x: x['confidence'], reverse=True)
+        
+        return potential_trades[:max_recommendations]
+    
+    def _build_recommendations(self, 
+                               candidates: List[Dict[str, Any]],
+                               ai_results: List[Optional[AIAnalysisResult]]) -> List[Dict[str, Any]]:
+        """Combine candidates with their AI results, best combined score first."""
+        recommendations = []
+        
+        for trade, ai_analysis in zip(candidates, ai_results):
+            if ai_analysis:
+                recommendations.append({
+                    'symbol': trade['symbol'],
+                    'recommendation': ai_analysis,
+                    'technical_confidence': trade['confidence'],
+                    'ai_confidence': ai_analysis.confidence,
+                    'combined_score': (trade['confidence'] + ai_analysis.confidence) / 2
+                })
+        
+        # Sort by combined score
+        recommendations.sort(key=lambda x: x['combined_score'], reverse=True)
+        
+        return recommendations
+    
     def _prepare_analysis_data(self, 
                               stock_data: StockData, 
                               technical_analysis: TechnicalAnalysisResult,
                               market_context: Optional[Dict]) -> Dict[str, Any]:
         """Prepare data for AI analysis."""
-        # Get recent price data
-        recent_data = stock_data.data.tail(20)
+        # Last 20 bars as one NumPy block: Close, High, Low, Volume
+        recent = stock_data.data[['Close', 'High', 'Low', 'Volume']].to_numpy(dtype=float)[-20:]
         
         # Calculate key metrics
-        current_price = recent_data['Close'].iloc[-1]
-        price_change = ((current_price - recent_data['Close'].iloc[-2]) / recent_data['Close'].iloc[-2]) * 100
-        volume_avg = recent_data['Volume'].mean()
-        current_volume = recent_data['Volume'].iloc[-1]
+        current_price = recent[-1, 0]
+        prev_close = recent[-2, 0]
+        price_change = ((current_price - prev_close) / prev_close) * 100
+        volume_avg = recent[:, 3].mean()
+        current_volume = recent[-1, 3]
         volume_ratio = current_volume / volume_avg
         
         # Price levels
-        high_20 = recent_data['High'].max()
-        low_20 = recent_data['Low'].min()
+        high_20 = recent[:, 1].max()
+        low_20 = recent[:, 2].min()
+        
+        def last(name: str) -> Optional[float]:
+            series = technical_analysis.indicators.get(name)
+            return float(series.iat[-1]) if series is not None and len(series) else None
         
         return {
             'symbol': stock_data.symbol,
@@ -206,9 +516,9 @@ class AIAnalyzer:
             'technical_signal': technical_analysis.overall_signal.value,
             'technical_confidence': technical_analysis.confidence,
             'key_indicators': {
-                'rsi': technical_analysis.indicators.get('RSI', pd.Series()).iloc[-1] if 'RSI' in technical_analysis.indicators else None,
-                'macd': technical_analysis.indicators.get('MACD', pd.Series()).iloc[-1] if 'MACD' in technical_analysis.indicators else None,
-                'bb_position': technical_analysis.indicators.get('BB_Position', pd.Series()).iloc[-1] if 'BB_Position' in technical_analysis.indicators else None
+                'rsi': last('RSI'),
+                'macd': last('MACD'),
+                'bb_position': last('BB_Position')
             },
             'key_levels': technical_analysis.key_levels,
             'risk_reward': technical_analysis.risk_reward,
@@ -217,94 +527,28 @@ class AIAnalyzer:
     
     def _create_analysis_prompt(self, data: Dict[str, Any]) -> str:
         """Create detailed analysis prompt for Gemini."""
-        return f"""
-        You are an expert swing trader and technical analyst specializing in Indian stock markets. 
-        Analyze the following stock data and provide a comprehensive trading recommendation.
-
-        Stock: {data['symbol']}
-        Current Price: ₹{data['current_price']:.2f}
-        1-Day Change: {data['price_change_1d']:.2f}%
-        Volume Ratio: {data['volume_ratio']:.2f}x average
-        20-Day Range: ₹{data['low_20d']:.2f} - ₹{data['high_20d']:.2f}
-
-        Technical Analysis Summary:
-        - Overall Signal: {data['technical_signal']}
-        - Confidence: {data['technical_confidence']:.2f}
-        - RSI: {data['key_indicators'].get('rsi', 'N/A')}
-        - MACD: {data['key_indicators'].get('macd', 'N/A')}
-        - Bollinger Position: {data['key_indicators'].get('bb_position', 'N/A')}
-
-        Key Levels:
-        - Support: ₹{data['key_levels'].get('support_1', 0):.2f}
-        - Resistance: ₹{data['key_levels'].get('resistance_1', 0):.2f}
-        - Stop Loss: ₹{data['risk_reward'].get('stop_loss', 0):.2f}
-        - Take Profit: ₹{data['risk_reward'].get('take_profit', 0):.2f}
-        - Risk/Reward Ratio: 1:{data['risk_reward'].get('risk_reward_ratio', 0):.2f}
-
-        Please provide your analysis in the following JSON format:
-        {{
-            "recommendation": "BUY/SELL/HOLD",
-            "confidence": 0.85,
-            "reasoning": "Detailed explanation of your recommendation",
-            "key_factors": ["Factor 1", "Factor 2", "Factor 3"],
-            "price_targets": {{
-                "entry": 1250.00,
-                "stop_loss": 1200.00,
-                "target_1": 1300.00,
-                "target_2": 1350.00
-            }},
-            "risk_assessment": "Low/Medium/High risk assessment",
-            "market_sentiment": "Bullish/Bearish/Neutral sentiment",
-            "trade_setup": {{
-                "timeframe": "1-3 days",
-                "setup_type": "Breakout/Pullback/Reversal",
-                "confidence_level": "High/Medium/Low"
-            }}
-        }}
-
-        Consider:
-        1. Current market conditions in Indian markets
-        2. Sector-specific factors
-        3. Technical setup quality
-        4. Risk management principles
-        5. Swing trading timeframe (1-3 days typical hold)
-
-        Be specific with price levels and provide clear reasoning for your recommendation.
-        """
+        return ANALYSIS_PROMPT_TEMPLATE.format_map({
+            **data,
+            'rsi': data['key_indicators'].get('rsi', 'N/A'),
+            'macd': data['key_indicators'].get('macd', 'N/A'),
+            'bb_position': data['key_indicators'].get('bb_position', 'N/A'),
+            'support_1': data['key_levels'].get('support_1', 0),
+            'resistance_1': data['key_levels'].get('resistance_1', 0),
+            'stop_loss': data['risk_reward'].get('stop_loss', 0),
+            'take_profit': data['risk_reward'].get('take_profit', 0),
+            'risk_reward_ratio': data['risk_reward'].get('risk_reward_ratio', 0)
+        })
     
     def _parse_ai_response(self, symbol: str, response_text: str) -> AIAnalysisResult:
         """Parse AI response and create structured result."""
         try:
             # Try to extract JSON from response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
+            match = JSON_OBJECT_RE.search(response_text)
             
-            if json_start != -1 and json_end != -1:
-                json_text = response_text[json_start:json_end]
-                parsed_data = json.loads(json_text)
+            if match:
+                parsed_data = orjson.loads(match.group())
                 
-                # Map recommendation to SignalType
-                rec_map = {
-                    'BUY': SignalType.BUY,
-                    'STRONG_BUY': SignalType.STRONG_BUY,
-                    'SELL': SignalType.SELL,
-                    'STRONG_SELL': SignalType.STRONG_SELL,
-                    'HOLD': SignalType.HOLD
-                }
-                
-                recommendation = rec_map.get(parsed_data.get('recommendation', 'HOLD'), SignalType.HOLD)
-                
-                return AIAnalysisResult(
-                    symbol=symbol,
-                    recommendation=recommendation,
-                    confidence=float(parsed_data.get('confidence', 0.5)),
-                    reasoning=parsed_data.get('reasoning', ''),
-                    key_factors=parsed_data.get('key_factors', []),
-                    price_targets=parsed_data.get('price_targets', {}),
-                    risk_assessment=parsed_data.get('risk_assessment', 'Medium'),
-                    market_sentiment=parsed_data.get('market_sentiment', 'Neutral'),
-                    trade_setup=parsed_data.get('trade_setup', {})
-                )
+                return self._build_ai_result(symbol, parsed_data)
             else:
                 # Fallback parsing if JSON is malformed
                 return self._parse_text_response(symbol, response_text)
@@ -313,89 +557,213 @@ class AIAnalyzer:
             logger.error(f"Error parsing AI response for {symbol}: {e}")
             return self._parse_text_response(symbol, response_text)
     
+    def _build_ai_result(self, symbol: str, parsed_data: Dict[str, Any]) -> AIAnalysisResult:
+        """Create a structured result from a parsed JSON analysis object."""
+        # Map recommendation to SignalType
+        rec_map = {
+            'BUY': SignalType.BUY,
+            'STRONG_BUY': SignalType.STRONG_BUY,
+            'SELL': SignalType.SELL,
+            'STRONG_SELL': SignalType.STRONG_SELL,
+            'HOLD': SignalType.HOLD
+        }
+        
+        recommendation = rec_map.get(parsed_data.get('recommendation', 'HOLD'), SignalType.HOLD)
+        
+        return AIAnalysisResult(
+            symbol=symbol,
+            recommendation=recommendation,
+            confidence=float(parsed_data.get('confidence', 0.5)),
+            reasoning=parsed_data.get('reasoning', ''),
+            key_factors=parsed_data.get('key_factors', []),
+            price_targets=parsed_data.get('price_targets', {}),
+            risk_assessment=parsed_data.get('risk_assessment', DEFAULT_RISK),
+            market_sentiment=parsed_data.get('market_sentiment', DEFAULT_SENTIMENT),
+            trade_setup=parsed_data.get('trade_setup', {})
+        )
+    
     def _parse_text_response(self, symbol: str, response_text: str) -> AIAnalysisResult:
         """Fallback text parsing when JSON parsing fails."""
-        # Simple keyword-based parsing
-        response_lower = response_text.lower()
-        
-        if 'strong buy' in response_lower or 'strongly recommend buying' in response_lower:
-            recommendation = SignalType.STRONG_BUY
-            confidence = 0.8
-        elif 'buy' in response_lower or 'bullish' in response_lower:
-            recommendation = SignalType.BUY
-            confidence = 0.6
-        elif 'strong sell' in response_lower or 'strongly recommend selling' in response_lower:
-            recommendation = SignalType.STRONG_SELL
-            confidence = 0.8
-        elif 'sell' in response_lower or 'bearish' in response_lower:
-            recommendation = SignalType.SELL
-            confidence = 0.6
-        else:
-            recommendation = SignalType.HOLD
-            confidence = 0.5
+        # Simple keyword-based parsing: one regex pass, then the highest-priority keyword group wins
+        found = {keyword.lower() for keyword in SIGNAL_KEYWORD_RE.findall(response_text)}
+        
+        recommendation, confidence = next(
+            ((signal, score) for keywords, signal, score in SIGNAL_KEYWORDS if not found.isdisjoint(keywords)),
+            (SignalType.HOLD, 0.5)
+        )
         
         return AIAnalysisResult(
             symbol=symbol,
             recommendation=recommendation,
             confidence=confidence,
             reasoning=response_text[:500],  # First 500 chars
-            key_factors=['AI analysis completed'],
-            price_targets={},
-            risk_assessment='Medium',
-            market_sentiment='Neutral'
+            key_factors=TEXT_PARSE_FACTORS,
+            price_targets=NO_PRICE_TARGETS,
+            risk_assessment=DEFAULT_RISK,
+            market_sentiment=DEFAULT_SENTIMENT
         )
     
     def _analyze_trade_opportunity(self, trade_data: Dict[str, Any]) -> Optional[AIAnalysisResult]:
         """Analyze a specific trade opportunity with AI."""
         try:
-            technical_analysis = trade_data['technical_analysis']
-            
-            prompt = f"""
-            Analyze this swing trading opportunity for {trade_data['symbol']}:
-            
-            Technical Signal: {trade_data['signal']} (Confidence: {trade_data['confidence']:.2f})
-            Current Price: ₹{technical_analysis.key_levels.get('current_price', 0):.2f}
-            Support: ₹{technical_analysis.key_levels.get('support_1', 0):.2f}
-            Resistance: ₹{technical_analysis.key_levels.get('resistance_1', 0):.2f}
-            R:R Ratio: 1:{technical_analysis.risk_reward.get('risk_reward_ratio', 0):.2f}
-            
-            Key Technical Signals:
-            {'; '.join([f"{s.indicator}: {s.signal_type.value}" for s in technical_analysis.signals[:3]])}
-            
-            Provide a concise analysis focusing on:
-            1. Trade viability for swing trading
-            2. Key risk factors
-            3. Optimal entry strategy
-            4. Expected holding period
+            response_text = self._cached_generate(
+                self._create_trade_prompt(trade_data), trade_data['technical_analysis'].confidence
+            )
             
-            Rate confidence 0-1 and provide specific price levels.
-            """
+            return self._parse_ai_response(trade_data['symbol'], response_text)
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
+        except Exception as e:
+            logger.error(f"Error analyzing trade opportunity: {e}")
+            return None
+    
+    async def _aanalyze_trade_opportunity(self, trade_data: Dict[str, Any]) -> Optional[AIAnalysisResult]:
+        """Async variant of _analyze_trade_opportunity."""
+        try:
+            response_text = await self._acached_generate(
+                self._create_trade_prompt(trade_data), trade_data['technical_analysis'].confidence
             )
             
-            return self._parse_ai_response(trade_data['symbol'], response.text)
+            return self._parse_ai_response(trade_data['symbol'], response_text)
             
         except Exception as e:
             logger.error(f"Error analyzing trade opportunity: {e}")
             return None
     
+    def _create_trade_prompt(self, trade_data: Dict[str, Any]) -> str:
+        """Create the prompt for a single trade opportunity."""
+        return TRADE_PROMPT_TEMPLATE.format_map(self._trade_prompt_fields(trade_data))
+    
+    @staticmethod
+    def _trade_prompt_fields(trade_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten a trade opportunity into the placeholders used by the trade prompts."""
+        technical_analysis = trade_data['technical_analysis']
+        
+        return {
+            'symbol': trade_data['symbol'],
+            'signal': trade_data['signal'],
+            'confidence': trade_data['confidence'],
+            'current_price': technical_analysis.key_levels.get('current_price', 0),
+            'support_1': technical_analysis.key_levels.get('support_1', 0),
+            'resistance_1': technical_analysis.key_levels.get('resistance_1', 0),
+            'risk_reward_ratio': technical_analysis.risk_reward.get('risk_reward_ratio', 0),
+            'signals': '; '.join([f"{s.indicator}: {s.signal_type.value}" for s in technical_analysis.signals[:3]])
+        }
+    
+    def _analyze_trades_batch(self, 
+                              trades: List[Dict[str, Any]], 
+                              batch_size: int = 5) -> List[Optional[AIAnalysisResult]]:
+        """
+        Analyze trade opportunities with one AI call per batch of trades.
+        
+        Trades missing from a batch response are analyzed individually.
+        
+        Returns:
+            Results aligned with trades (None where analysis failed)
+        """
+        batches = list(self._iter_batches(trades, batch_size))
+        
+        # Batches run concurrently on the shared pool; gaps are retried from this thread so
+        # pool workers never wait on each other
+        batch_results = list(self.executor.map(self._analyze_trade_batch, batches))
+        results = [result for batch in batch_results for result in batch]
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        retried = self.executor.map(self._analyze_trade_opportunity, [trades[i] for i in missing])
+        for i, result in zip(missing, retried):
+            results[i] = result
+        
+        return results
+    
+    def _analyze_trade_batch(self, batch: List[Dict[str, Any]]) -> List[Optional[AIAnalysisResult]]:
+        """Analyze a single batch of trades with one AI call (None for trades it missed)."""
+        try:
+            response_text = self._cached_generate(self._create_batch_prompt(batch))
+            return self._parse_batch_response(batch, response_text)
+        except Exception as e:
+            logger.error(f"Error analyzing trade batch: {e}")
+            return [None] * len(batch)
+    
+    async def _aanalyze_trades_batch(self, 
+                                     trades: List[Dict[str, Any]], 
+                                     batch_size: int = 5) -> List[Optional[AIAnalysisResult]]:
+        """Async variant of _analyze_trades_batch; batches are analyzed concurrently."""
+        batch_results = await asyncio.gather(
+            *(self._aanalyze_trade_batch(batch) for batch in self._iter_batches(trades, batch_size))
+        )
+        
+        return [result for batch in batch_results for result in batch]
+    
+    async def _aanalyze_trade_batch(self, batch: List[Dict[str, Any]]) -> List[Optional[AIAnalysisResult]]:
+        """Analyze a single batch of trades, falling back to per-trade calls for gaps."""
+        try:
+            response_text = await self._acached_generate(self._create_batch_prompt(batch))
+            results = self._parse_batch_response(batch, response_text)
+        except Exception as e:
+            logger.error(f"Error analyzing trade batch: {e}")
+            results = [None] * len(batch)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            retried = await asyncio.gather(
+                *(self._aanalyze_trade_opportunity(batch[i]) for i in missing)
+            )
+            for i, result in zip(missing, retried):
+                results[i] = result
+        
+        return results
+    
+    @staticmethod
+    def _iter_batches(trades: List[Dict[str, Any]], batch_size: int):
+        """Yield successive lists of at most batch_size trades."""
+        iterator = iter(trades)
+        while batch := list(islice(iterator, max(batch_size, 1))):
+            yield batch
+    
+    def _create_batch_prompt(self, trades: List[Dict[str, Any]]) -> str:
+        """Create one prompt covering several trade opportunities, each tagged with an index."""
+        prompt = BATCH_PROMPT_HEADER
+        
+        for i, trade in enumerate(trades):
+            prompt += BATCH_TRADE_TEMPLATE.format_map({'index': i, **self._trade_prompt_fields(trade)})
+        
+        return prompt + BATCH_PROMPT_FOOTER
+    
+    def _parse_batch_response(self, 
+                              trades: List[Dict[str, Any]], 
+                              response_text: str) -> List[Optional[AIAnalysisResult]]:
+        """Map an indexed JSON array response back onto the batch's trades."""
+        results: List[Optional[AIAnalysisResult]] = [None] * len(trades)
+        
+        try:
+            match = JSON_ARRAY_RE.search(response_text)
+            
+            if not match:
+                return results
+            
+            for item in orjson.loads(match.group()):
+                index = item.get('index') if isinstance(item, dict) else None
+                if isinstance(index, int) and 0 <= index < len(trades):
+                    results[index] = self._build_ai_result(trades[index]['symbol'], item)
+                    
+        except Exception as e:
+            logger.error(f"Error parsing batch AI response: {e}")
+        
+        return results
+    
     def _create_fallback_result(self, symbol: str, technical_analysis: TechnicalAnalysisResult) -> AIAnalysisResult:
         """Create fallback result when AI analysis fails."""
         return AIAnalysisResult(
             symbol=symbol,
             recommendation=technical_analysis.overall_signal,
             confidence=max(technical_analysis.confidence * 0.8, 0.3),  # Reduce confidence for fallback
-            reasoning="Technical analysis based recommendation (AI analysis unavailable)",
-            key_factors=["Technical indicators", "Price action", "Volume analysis"],
+            reasoning=FALLBACK_REASONING,
+            key_factors=FALLBACK_FACTORS,
             price_targets={
                 'stop_loss': technical_analysis.risk_reward.get('stop_loss', 0),
                 'take_profit': technical_analysis.risk_reward.get('take_profit', 0)
             },
-            risk_assessment="Medium",
-            market_sentiment="Neutral"
+            risk_assessment=DEFAULT_RISK,
+            market_sentiment=DEFAULT_SENTIMENT
         )
     
     def format_ai_analysis(self, analysis: AIAnalysisResult) -> str:
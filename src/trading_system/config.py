@@ -53,6 +53,10 @@ class AIConfig:
     temperature: float = 0.1
     max_tokens: int = 1000
     confidence_threshold: float = 0.7
+    batch_size: int = 5  # Trades per batched recommendation prompt
+    concurrency: int = 8  # Worker threads for sync fan-out of AI calls
+    cache_path: str = "data/ai_cache.db"  # Persistent Gemini response cache
+    cache_ttl: int = 3600  # Seconds before a cached response is re-requested
 
 
 @dataclass
@@ -71,7 +71,7 @@ class TechnicalAnalyzer:
             data = stock_data.data.copy()
             
             # Calculate all indicators
-            indicators = self._calculate_all_indicators(data)
+            indicators = self.calculate_indicators(data)
             
             # Generate signals from each indicator
             signals = self._generate_signals(data, indicators)
@@ -99,6 +99,19 @@ class TechnicalAnalyzer:
             logger.error(f"Error analyzing {stock_data.symbol}: {e}")
             raise
     
+    def calculate_indicators(self, data: pd.DataFrame) -> Dict[str, any]:
+        """
+        Calculate all technical indicators for an OHLCV frame.
+        
+        Args:
+            data: DataFrame with High, Low, Close and Volume columns
+        
+        Returns:
+            Dict of indicator Series keyed by name ('RSI', 'MACD', 'MACD_Signal',
+            'SMA_20', 'SMA_50', 'EMA_9', 'EMA_21', 'BB_Upper', 'BB_Middle', 'BB_Lower', ...)
+        """
+        return self._calculate_all_indicators(data)
+    
     def _calculate_all_indicators(self, data: pd.DataFrame) -> Dict[str, any]:
         """Calculate all technical indicators."""
         indicators = {}
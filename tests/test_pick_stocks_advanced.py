@@ -0,0 +1,61 @@
+"""
+Smoke tests for the advanced stock picker on synthetic price data.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pick_stocks_advanced import AdvancedStockPicker
+
+
+# Indicators calculate_signal_strength reads from TechnicalAnalyzer.calculate_indicators
+PICKER_INDICATORS = ('RSI', 'MACD', 'MACD_Signal', 'SMA_20', 'SMA_50', 'EMA_9', 'EMA_21',
+                     'BB_Upper', 'BB_Middle', 'BB_Lower')
+
+
+def _synthetic_ohlcv(days: int = 120, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 500 * np.exp(np.cumsum(rng.normal(0.001, 0.02, days)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, days)),
+        'High': close * (1 + rng.uniform(0, 0.02, days)),
+        'Low': close * (1 - rng.uniform(0, 0.02, days)),
+        'Close': close,
+        'Volume': rng.integers(100_000, 1_000_000, days).astype(float),
+    }, index=pd.bdate_range('2024-01-01', periods=days))
+
+
+@pytest.fixture(scope="module")
+def picker():
+    return AdvancedStockPicker()
+
+
+def test_indicators_cover_picker_inputs(picker):
+    indicators = picker.calculate_indicators(_synthetic_ohlcv())
+
+    assert set(PICKER_INDICATORS) <= set(indicators)
+
+
+def test_analyze_stock_on_synthetic_frame(picker):
+    data = _synthetic_ohlcv()
+
+    result = picker.analyze_stock('TEST.NS', data)
+
+    assert result is not None
+    assert 'error' not in result
+    assert result['symbol'] == 'TEST.NS'
+    assert result['name'] == 'TEST'
+    assert result['current_price'] == pytest.approx(data['Close'].iloc[-1])
+    assert 0 <= result['strength'] <= 100
+    assert result['direction'] in {'STRONG BUY', 'BUY', 'WEAK BUY', 'HOLD',
+                                   'WEAK SELL', 'SELL', 'STRONG SELL'}
+
+
+def test_analyze_stock_short_history_returns_none(picker):
+    assert picker.analyze_stock('TEST.NS', _synthetic_ohlcv(days=10)) is None
@@ -0,0 +1,32 @@
+"""
+Tests for the realistic trade analysis helpers.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from realistic_trade_analysis import RealisticTradeAnalyzer
+
+
+def test_trailing_mean_matches_rolling_mean():
+    values = np.arange(40, dtype=float)
+
+    expected = pd.Series(values).rolling(20).mean().to_numpy()
+
+    np.testing.assert_allclose(RealisticTradeAnalyzer._trailing_mean(values, 20), expected)
+
+
+def test_trailing_mean_recovers_after_nan_bar():
+    values = np.arange(40, dtype=float)
+    values[5] = np.nan
+
+    means = RealisticTradeAnalyzer._trailing_mean(values, 10)
+
+    # Only windows containing the NaN bar are undefined
+    assert np.isnan(means[5:15]).all()
+    np.testing.assert_allclose(means[-3:], [32.5, 33.5, 34.5])